@@ -1,12 +1,19 @@
 import tkinter as tk
+from datetime import datetime
 from tkinter import messagebox, ttk
+from UI.task_runner import TaskRunner
+from UI.virtual_tree import VirtualTreeview
+from utils.money import format_money
 
 class AdminGUI:
-    def __init__(self, root, admin_service, show_user_type_screen):
+    def __init__(self, root, admin_service, show_user_type_screen, task_runner=None):
         self.root = root
         self.admin_service = admin_service
         self.show_user_type_screen = show_user_type_screen
-        self.current_admin = None
+        self.session_token = None
+        self.name_filter = ""
+        # Service calls run off the main loop so the window stays responsive
+        self.tasks = task_runner or TaskRunner(root)
         
         self.create_login_frame()
         self.create_main_frame()
@@ -25,11 +32,14 @@ class AdminGUI:
         self.password_entry = ttk.Entry(self.login_frame, show="*")
         self.password_entry.grid(row=2, column=1, pady=5)
         
-        ttk.Button(self.login_frame, text="Login", 
-                  command=self.login).grid(row=3, column=0, columnspan=2, pady=10)
+        self.login_button = ttk.Button(self.login_frame, text="Login", 
+                                       command=self.login)
+        self.login_button.grid(row=3, column=0, columnspan=2, pady=10)
         
         ttk.Button(self.login_frame, text="Back", 
                   command=self.show_user_type_screen).grid(row=4, column=0, columnspan=2)
+        
+        self.add_progress_indicator(self.login_frame, row=5)
 
     def create_main_frame(self):
         self.main_frame = ttk.Frame(self.root, padding="20")
@@ -38,36 +48,72 @@ class AdminGUI:
         ttk.Label(self.main_frame, text="User Management", 
                  font=("Helvetica", 12, "bold")).grid(row=0, column=0, columnspan=2, pady=10)
         
-        self.users_tree = ttk.Treeview(self.main_frame, 
-                                     columns=("Account", "Name", "Balance"), 
-                                     show="headings")
+        # Bank-wide totals, kept up to date by every operation
+        self.summary_label = ttk.Label(self.main_frame, text="")
+        self.summary_label.grid(row=1, column=0, columnspan=2, pady=5)
+        
+        # Name filter, answered from the account index without a scan
+        search_frame = ttk.Frame(self.main_frame)
+        search_frame.grid(row=2, column=0, columnspan=2, pady=5)
+        ttk.Label(search_frame, text="Name starts with:").grid(row=0, column=0, padx=5)
+        self.search_entry = ttk.Entry(search_frame)
+        self.search_entry.grid(row=0, column=1, padx=5)
+        self.search_entry.bind("<Return>", lambda event: self.search_users())
+        ttk.Button(search_frame, text="Search", 
+                  command=self.search_users).grid(row=0, column=2, padx=5)
+        ttk.Button(search_frame, text="Clear", 
+                  command=self.clear_search).grid(row=0, column=3, padx=5)
+        
+        # Only the visible rows are fetched and rendered, off the main loop
+        self.users_view = VirtualTreeview(self.main_frame,
+                                          columns=("Account", "Name", "Balance"),
+                                          fetch=self.fetch_users,
+                                          count=self.count_users,
+                                          format_row=self.format_user,
+                                          tasks=self.tasks)
+        self.users_tree = self.users_view.tree
         self.users_tree.heading("Account", text="Account")
         self.users_tree.heading("Name", text="Name")
         self.users_tree.heading("Balance", text="Balance")
-        self.users_tree.grid(row=1, column=0, columnspan=2, pady=5)
+        self.users_view.grid(row=3, column=0, columnspan=2, pady=5)
         
-        ttk.Button(self.main_frame, text="Remove Selected User", 
-                  command=self.remove_user).grid(row=2, column=0, pady=5)
-        ttk.Button(self.main_frame, text="View Transactions", 
-                  command=self.view_transactions).grid(row=2, column=1, pady=5)
+        self.remove_button = ttk.Button(self.main_frame, text="Remove Selected User", 
+                                        command=self.remove_user)
+        self.remove_button.grid(row=4, column=0, pady=5)
+        self.view_button = ttk.Button(self.main_frame, text="View Transactions", 
+                                      command=self.view_transactions)
+        self.view_button.grid(row=4, column=1, pady=5)
         
         # Admin logs section
         ttk.Label(self.main_frame, text="Admin Logs", 
-                 font=("Helvetica", 12, "bold")).grid(row=3, column=0, columnspan=2, pady=10)
+                 font=("Helvetica", 12, "bold")).grid(row=5, column=0, columnspan=2, pady=10)
         
-        self.logs_tree = ttk.Treeview(self.main_frame, 
-                                    columns=("Admin", "Action", "Details", "Timestamp"), 
-                                    show="headings")
+        self.logs_view = VirtualTreeview(self.main_frame,
+                                         columns=("Admin", "Action", "Details", "Timestamp"),
+                                         fetch=self.admin_service.get_admin_log_range,
+                                         count=self.admin_service.count_admin_logs,
+                                         format_row=self.format_log,
+                                         newest_first=True,
+                                         tasks=self.tasks)
+        self.logs_tree = self.logs_view.tree
         self.logs_tree.heading("Admin", text="Admin")
         self.logs_tree.heading("Action", text="Action")
         self.logs_tree.heading("Details", text="Details")
         self.logs_tree.heading("Timestamp", text="Timestamp")
-        self.logs_tree.grid(row=4, column=0, columnspan=2, pady=5)
+        self.logs_view.grid(row=6, column=0, columnspan=2, pady=5)
         
         ttk.Button(self.main_frame, text="Refresh", 
-                  command=self.refresh_data).grid(row=5, column=0, pady=5)
-        ttk.Button(self.main_frame, text="Logout", 
-                  command=self.logout).grid(row=5, column=1, pady=5)
+                  command=self.refresh_data).grid(row=7, column=0, pady=5)
+        self.logout_button = ttk.Button(self.main_frame, text="Logout", 
+                                        command=self.logout)
+        self.logout_button.grid(row=7, column=1, pady=5)
+        
+        self.add_progress_indicator(self.main_frame, row=8)
+
+    def add_progress_indicator(self, frame, row):
+        progressbar = ttk.Progressbar(frame, mode="indeterminate")
+        progressbar.grid(row=row, column=0, columnspan=2, sticky="ew", pady=5)
+        self.tasks.add_indicator(progressbar)
 
     def show_login_frame(self):
         self.main_frame.grid_remove()
@@ -76,30 +122,40 @@ class AdminGUI:
     def show_main_frame(self):
         self.login_frame.grid_remove()
         self.main_frame.grid()
-        self.refresh_data()
+        self.users_view.reload()
+        self.logs_view.reload()
+        self.load_summary()
 
     def login(self):
         username = self.username_entry.get()
         password = self.password_entry.get()
         
-        admin = self.admin_service.login(username, password)
-        if admin:
-            self.current_admin = admin
+        self.tasks.run(self.admin_service.open_session, username, password,
+                       on_success=self.finish_login,
+                       on_error=self.show_task_error,
+                       busy=(self.login_button,))
+
+    def finish_login(self, token):
+        if token:
+            self.session_token = token
             self.show_main_frame()
         else:
             messagebox.showerror("Error", "Invalid username or password")
 
     def view_transactions(self):
-        selection = self.users_tree.selection()
-        if not selection:
+        user = self.users_view.selected_item()
+        if not user:
             messagebox.showwarning("Warning", "Please select a user to view transactions")
             return
         
-        # Get account number from selected item
-        account_number = str(self.users_tree.item(selection[0])['values'][0])
-        transactions = self.admin_service.get_user_transactions(account_number)
-        
-        if not transactions:
+        account_number = user[0]
+        self.tasks.run(self.admin_service.get_user_transaction_count, account_number,
+                       on_success=lambda count: self.show_transactions(account_number, count),
+                       on_error=self.show_task_error,
+                       busy=(self.view_button,))
+
+    def show_transactions(self, account_number, transaction_count):
+        if not transaction_count:
             messagebox.showinfo("Info", "No transactions found for this user")
             return
         
@@ -112,11 +168,31 @@ class AdminGUI:
         frame = ttk.Frame(trans_window, padding="10")
         frame.pack(fill=tk.BOTH, expand=True)
         
-        # Create treeview with scrollbar
-        tree = ttk.Treeview(frame, 
-                           columns=("Type", "Amount", "Date", "Balance"),
-                           show="headings",
-                           height=15)
+        # Fetch transactions by position as rows scroll into view
+        def fetch(start, count):
+            return self.admin_service.get_user_transaction_range(account_number, start, count)
+
+        def count():
+            return self.admin_service.get_user_transaction_count(account_number)
+
+        def format_row(trans):
+            return (
+                trans['type'],
+                format_money(trans['amount']),
+                trans['date'],
+                format_money(trans['balance'])
+            )
+        
+        # Create treeview with scrollbar, newest transactions first
+        view = VirtualTreeview(frame,
+                               columns=("Type", "Amount", "Date", "Balance"),
+                               fetch=fetch,
+                               count=count,
+                               format_row=format_row,
+                               height=15,
+                               newest_first=True,
+                               tasks=self.tasks)
+        tree = view.tree
         
         # Configure columns
         tree.heading("Type", text="Type")
@@ -130,68 +206,104 @@ class AdminGUI:
         tree.column("Date", width=200)
         tree.column("Balance", width=100)
         
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        
         # Grid layout
-        tree.grid(row=0, column=0, sticky="nsew")
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        view.grid(row=0, column=0, sticky="nsew")
         
         # Configure grid weights
         frame.grid_columnconfigure(0, weight=1)
         frame.grid_rowconfigure(0, weight=1)
         
-        # Populate transactions
-        for trans in transactions:
-            tree.insert("", "end", values=(
-                trans['type'],
-                f"${trans['amount']:.2f}",
-                trans['date'],
-                f"${trans['balance']:.2f}"
-            ))
+        view.reload()
 
     def remove_user(self):
-        selection = self.users_tree.selection()
-        if not selection:
+        user = self.users_view.selected_item()
+        if not user:
             messagebox.showwarning("Warning", "Please select a user to remove")
             return
         
-        account_number = str(self.users_tree.item(selection[0])['values'][0])
+        account_number = user[0]
+        admin = self.require_admin()
+        if not admin:
+            return
         
         if messagebox.askyesno("Confirm", "Are you sure you want to remove this user?"):
-            if self.admin_service.remove_user(self.current_admin.username, account_number):
-                messagebox.showinfo("Success", "User removed successfully")
-                self.refresh_data()
-            else:
-                messagebox.showerror("Error", "Failed to remove user")
+            self.tasks.run(self.admin_service.remove_user,
+                           admin.username, account_number,
+                           on_success=self.finish_remove_user,
+                           on_error=self.show_task_error,
+                           busy=(self.remove_button, self.view_button, self.logout_button))
+
+    def finish_remove_user(self, removed):
+        if removed:
+            messagebox.showinfo("Success", "User removed successfully")
+            self.refresh_data()
+        else:
+            messagebox.showerror("Error", "Failed to remove user")
 
     def refresh_data(self):
-        # Clear and reload users
-        for item in self.users_tree.get_children():
-            self.users_tree.delete(item)
-        
-        for account_number, account in self.admin_service.get_all_users().items():
-            self.users_tree.insert("", "end", values=(
-                account_number,
-                account.name,
-                f"${account.balance:.2f}"
-            ))
-        
-        # Clear and reload logs
-        for item in self.logs_tree.get_children():
-            self.logs_tree.delete(item)
-        
-        for log in self.admin_service.get_admin_logs():
-            self.logs_tree.insert("", "end", values=(
-                log.admin_username,
-                log.action,
-                log.details,
-                log.timestamp
-            ))
+        # Accounts may have been removed, so start the user list over;
+        # logs are only ever added and keep the rows already fetched
+        self.users_view.reload()
+        self.logs_view.refresh()
+        self.load_summary()
+
+    def load_summary(self):
+        self.tasks.run(self.admin_service.get_summary, 1,
+                       on_success=self.show_summary,
+                       on_error=self.show_task_error)
+
+    def show_summary(self, summary):
+        today = datetime.now().strftime("%Y-%m-%d")
+        flows = next((day for day in summary['daily'] if day['date'] == today),
+                     {'deposit': 0, 'withdrawal': 0})
+        self.summary_label.config(
+            text=f"Accounts: {summary['account_count']}    "
+                 f"Total balance: {format_money(summary['total_balance'])}    "
+                 f"Today: deposits {format_money(flows['deposit'])}, "
+                 f"withdrawals {format_money(flows['withdrawal'])}")
+
+    def fetch_users(self, start, count):
+        if self.name_filter:
+            return self.admin_service.get_users_by_name_prefix(self.name_filter, start, count)
+        return self.admin_service.get_users(start, count)
+
+    def count_users(self):
+        if self.name_filter:
+            return self.admin_service.count_users_by_name_prefix(self.name_filter)
+        return self.admin_service.count_users()
+
+    def search_users(self):
+        self.name_filter = self.search_entry.get().strip()
+        self.users_view.reload()
+
+    def clear_search(self):
+        self.search_entry.delete(0, tk.END)
+        self.search_users()
+
+    def format_user(self, user):
+        account_number, account = user
+        return (account_number, account.name, format_money(account.balance))
+
+    def format_log(self, log):
+        return (log.admin_username, log.action, log.details, log.timestamp)
+
+    def show_task_error(self, error):
+        messagebox.showerror("Error", f"The operation failed: {error}")
+
+    def require_admin(self):
+        # The session may have timed out while the screen was open
+        admin = self.admin_service.session_admin(self.session_token)
+        if not admin:
+            messagebox.showerror("Error", "Your session has ended. Please log in again")
+            self.logout()
+        return admin
 
     def logout(self):
-        self.current_admin = None
+        if self.session_token:
+            self.admin_service.close_session(self.session_token)
+            self.session_token = None
         self.username_entry.delete(0, tk.END)
         self.password_entry.delete(0, tk.END)
+        self.search_entry.delete(0, tk.END)
+        self.name_filter = ""
         self.show_user_type_screen()
\ No newline at end of file
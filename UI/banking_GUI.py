@@ -1,5 +1,8 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
+from UI.task_runner import TaskRunner
+from UI.virtual_tree import VirtualTreeview
+from utils.money import parse_amount, format_money
 
 class BankingGUI:
     """
@@ -12,10 +15,13 @@ class BankingGUI:
         root (tk.Tk): Main window of the application
         bank (BankingSystem): Reference to the banking system
         show_user_type_screen (function): Callback to return to type selection
-        current_account (BankAccount): Currently logged-in account
+        session_token (str): Session of the logged-in account, None when
+            logged out
+        transaction_view (VirtualTreeview): Transaction history, newest first
+        tasks (TaskRunner): Runs banking calls off the main loop
     """
 
-    def __init__(self, root, banking_system, show_user_type_screen):
+    def __init__(self, root, banking_system, show_user_type_screen, task_runner=None):
         """
         Initialize the banking GUI.
         
@@ -23,12 +29,15 @@ class BankingGUI:
             root (tk.Tk): Main window of the application
             banking_system (BankingSystem): Reference to the banking system
             show_user_type_screen (function): Callback to show type selection
+            task_runner (TaskRunner, optional): Runner shared with other
+                screens. Defaults to a new one
         """
 
         self.root = root
         self.bank = banking_system
         self.show_user_type_screen = show_user_type_screen
-        self.current_account = None
+        self.session_token = None
+        self.tasks = task_runner or TaskRunner(root)
         
         self.create_login_frame()
         self.create_register_frame()
@@ -53,13 +62,16 @@ class BankingGUI:
         self.login_password_entry.grid(row=2, column=1, pady=5)
         
         # Buttons
-        ttk.Button(self.login_frame, text="Login", 
-                  command=self.login).grid(row=3, column=0, pady=10)
+        self.login_button = ttk.Button(self.login_frame, text="Login", 
+                                       command=self.login)
+        self.login_button.grid(row=3, column=0, pady=10)
         ttk.Button(self.login_frame, text="Register", 
                   command=self.show_register_frame).grid(row=3, column=1, pady=10)
         
         ttk.Button(self.login_frame, text="Back", 
                   command=self.show_user_type_screen).grid(row=4, column=0, columnspan=2)
+        
+        self.add_progress_indicator(self.login_frame, row=5)
 
     def create_register_frame(self):
         """Create and configure the registration frame with all its widgets."""
@@ -76,10 +88,13 @@ class BankingGUI:
         self.register_password_entry = ttk.Entry(self.register_frame, show="*")
         self.register_password_entry.grid(row=2, column=1, pady=5)
         
-        ttk.Button(self.register_frame, text="Register", 
-                  command=self.register).grid(row=3, column=0, columnspan=2, pady=10)
+        self.register_button = ttk.Button(self.register_frame, text="Register", 
+                                          command=self.register)
+        self.register_button.grid(row=3, column=0, columnspan=2, pady=10)
         ttk.Button(self.register_frame, text="Back to Login", 
                   command=self.show_login_frame).grid(row=4, column=0, columnspan=2)
+        
+        self.add_progress_indicator(self.register_frame, row=5)
 
     def create_main_frame(self):
         """Create and configure the main frame with all its widgets."""
@@ -93,21 +108,29 @@ class BankingGUI:
         self.amount_entry = ttk.Entry(self.main_frame)
         self.amount_entry.grid(row=1, column=1, pady=5)
         
-        ttk.Button(self.main_frame, text="Deposit", 
-                  command=self.deposit).grid(row=2, column=0, pady=5, padx=5)
-        ttk.Button(self.main_frame, text="Withdraw", 
-                  command=self.withdraw).grid(row=2, column=1, pady=5, padx=5)
+        self.deposit_button = ttk.Button(self.main_frame, text="Deposit", 
+                                         command=self.deposit)
+        self.deposit_button.grid(row=2, column=0, pady=5, padx=5)
+        self.withdraw_button = ttk.Button(self.main_frame, text="Withdraw", 
+                                          command=self.withdraw)
+        self.withdraw_button.grid(row=2, column=1, pady=5, padx=5)
         
         # Transaction history
         ttk.Label(self.main_frame, text="Transaction History", 
                  font=("Helvetica", 11, "bold")).grid(row=3, column=0, columnspan=2, pady=5)
         
-        self.transaction_tree = ttk.Treeview(
-            self.main_frame, 
-            columns=("Type", "Amount", "Date", "Balance"), 
-            show="headings",
-            height=10
+        # Only the visible rows are fetched and rendered, off the main loop
+        self.transaction_view = VirtualTreeview(
+            self.main_frame,
+            columns=("Type", "Amount", "Date", "Balance"),
+            fetch=self.fetch_transactions,
+            count=self.count_transactions,
+            format_row=self.format_transaction,
+            height=10,
+            newest_first=True,
+            tasks=self.tasks
         )
+        self.transaction_tree = self.transaction_view.tree
         self.transaction_tree.heading("Type", text="Type")
         self.transaction_tree.heading("Amount", text="Amount")
         self.transaction_tree.heading("Date", text="Date")
@@ -119,15 +142,25 @@ class BankingGUI:
         self.transaction_tree.column("Date", width=150)
         self.transaction_tree.column("Balance", width=100)
         
-        self.transaction_tree.grid(row=4, column=0, columnspan=2, pady=10)
+        self.transaction_view.grid(row=4, column=0, columnspan=2, pady=10)
         
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(self.main_frame, orient="vertical", command=self.transaction_tree.yview)
-        scrollbar.grid(row=4, column=2, sticky="ns")
-        self.transaction_tree.configure(yscrollcommand=scrollbar.set)
+        self.logout_button = ttk.Button(self.main_frame, text="Logout", 
+                                        command=self.logout)
+        self.logout_button.grid(row=5, column=0, columnspan=2, pady=10)
         
-        ttk.Button(self.main_frame, text="Logout", 
-                  command=self.logout).grid(row=5, column=0, columnspan=2, pady=10)
+        self.add_progress_indicator(self.main_frame, row=6)
+
+    def add_progress_indicator(self, frame, row):
+        """
+        Add a progress bar shown while banking calls are in flight.
+        
+        Args:
+            frame (ttk.Frame): Frame to add the progress bar to
+            row (int): Grid row below the frame's other widgets
+        """
+        progressbar = ttk.Progressbar(frame, mode="indeterminate")
+        progressbar.grid(row=row, column=0, columnspan=2, sticky="ew", pady=5)
+        self.tasks.add_indicator(progressbar)
 
     def show_login_frame(self):
         """Show the login frame and hide the main frame."""
@@ -147,41 +180,114 @@ class BankingGUI:
         self.register_frame.grid_remove()
         self.main_frame.grid()
 
+    def current_account(self):
+        """
+        Get the account of the current session.
+        
+        Returns:
+            BankAccount: Logged-in account, None when logged out or the
+                session has ended
+        """
+        if not self.session_token:
+            return None
+        return self.bank.session_account(self.session_token)
+
+    def require_account(self):
+        """
+        Get the logged-in account, returning to the login screen when the
+        session has ended (timed out, or the account was removed).
+        
+        Returns:
+            BankAccount: Logged-in account, None if the session has ended
+        """
+        account = self.current_account()
+        if not account and self.session_token:
+            messagebox.showerror("Error", "Your session has ended. Please log in again")
+            self.logout()
+        return account
+
     def update_balance_label(self):
         """Update the balance label with the current balance."""
-        self.balance_label.config(
-            text=f"Current Balance: ${self.current_account.balance:.2f}")
+        account = self.require_account()
+        if account:
+            self.balance_label.config(
+                text=f"Current Balance: {format_money(account.balance)}")
 
     def update_transaction_history(self):
-        """Update the transaction history treeview with the current transactions."""
+        """Show the most recent transactions of the logged-in account."""
+        self.transaction_view.reload()
 
-        # Clear existing entries
-        for item in self.transaction_tree.get_children():
-            self.transaction_tree.delete(item)
+    def count_transactions(self):
+        """
+        Count the transactions of the logged-in account.
         
-        # Add all transactions
-        for transaction in self.current_account.transactions:
-            self.transaction_tree.insert("", "end", values=(
-                transaction['type'],
-                f"${transaction['amount']:.2f}",
-                transaction['date'],
-                f"${transaction['balance']:.2f}"
-            ))
+        Returns:
+            int: Number of transactions
+        """
+        account = self.current_account()
+        if not account:
+            return 0
+        return self.bank.get_transaction_count(account.account_number)
+
+    def fetch_transactions(self, start, count):
+        """
+        Fetch transactions of the logged-in account by position.
+        
+        Args:
+            start (int): Position of the first transaction
+            count (int): Maximum number of transactions
+            
+        Returns:
+            list: Transactions, oldest first
+        """
+        account = self.current_account()
+        if not account:
+            return []
+        return self.bank.get_transaction_range(account.account_number, start, count)
+
+    def format_transaction(self, transaction):
+        """
+        Convert a transaction into treeview values.
+        
+        Args:
+            transaction (dict): Transaction to show
+            
+        Returns:
+            tuple: Type, amount, date and balance
+        """
+        return (
+            transaction['type'],
+            format_money(transaction['amount']),
+            transaction['date'],
+            format_money(transaction['balance'])
+        )
 
     def login(self):
         """
         Handle the login process.
         
-        Validates user credentials and logs them into the system if correct.
+        Validates user credentials and starts a session if correct.
         Shows appropriate error messages for invalid credentials.
         """
 
         account_number = self.login_account_entry.get()
         password = self.login_password_entry.get()
         
-        account = self.bank.login(account_number, password)
-        if account:
-            self.current_account = account
+        self.tasks.run(self.bank.open_session, account_number, password,
+                       on_success=self.finish_login,
+                       on_error=self.show_task_error,
+                       busy=(self.login_button,))
+
+    def finish_login(self, token):
+        """
+        Complete the login once the credentials have been checked.
+        
+        Args:
+            token (str): Session token, None if the credentials were invalid
+        """
+
+        if token:
+            self.session_token = token
             self.update_balance_label()
             self.update_transaction_history()
             self.show_main_frame()
@@ -200,15 +306,27 @@ class BankingGUI:
         password = self.register_password_entry.get()
         
         if name and password:
-            account_number = self.bank.create_account(name, password)
-            messagebox.showinfo(
-                "Success", 
-                f"Account created successfully!\nYour account number is: {account_number}"
-            )
-            self.show_login_frame()
+            self.tasks.run(self.bank.create_account, name, password,
+                           on_success=self.finish_register,
+                           on_error=self.show_task_error,
+                           busy=(self.register_button,))
         else:
             messagebox.showerror("Error", "Please fill in all fields")
 
+    def finish_register(self, account_number):
+        """
+        Show the number of a newly created account.
+        
+        Args:
+            account_number (str): New account number
+        """
+
+        messagebox.showinfo(
+            "Success", 
+            f"Account created successfully!\nYour account number is: {account_number}"
+        )
+        self.show_login_frame()
+
     def deposit(self):
         """
         Handle the deposit process.
@@ -218,17 +336,23 @@ class BankingGUI:
         """
 
         try:
-            amount = float(self.amount_entry.get())
-            if amount <= 0:
-                raise ValueError
-            
-            if self.bank.deposit(self.current_account.account_number, amount):
-                self.update_balance_label()
-                self.update_transaction_history()
-                self.amount_entry.delete(0, tk.END)
-                messagebox.showinfo("Success", f"${amount:.2f} deposited successfully")
+            amount = parse_amount(self.amount_entry.get())
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid positive amount")
+            return
+        account = self.require_account()
+        if not account:
+            return
+
+        def finish(done):
+            if done and self.session_token:
+                self.finish_transaction()
+                messagebox.showinfo("Success", f"{format_money(amount)} deposited successfully")
+
+        self.tasks.run(self.bank.deposit, account.account_number, amount,
+                       on_success=finish,
+                       on_error=self.show_task_error,
+                       busy=self.account_buttons())
 
     def withdraw(self):
         """
@@ -240,28 +364,62 @@ class BankingGUI:
         """
 
         try:
-            amount = float(self.amount_entry.get())
-            if amount <= 0:
-                raise ValueError
-            
-            if self.bank.withdraw(self.current_account.account_number, amount):
-                self.update_balance_label()
-                self.update_transaction_history()
-                self.amount_entry.delete(0, tk.END)
-                messagebox.showinfo("Success", f"${amount:.2f} withdrawn successfully")
-            else:
-                messagebox.showerror("Error", "Insufficient balance")
+            amount = parse_amount(self.amount_entry.get())
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid positive amount")
+            return
+        account = self.require_account()
+        if not account:
+            return
+
+        def finish(done):
+            if not self.session_token:
+                return
+            if done:
+                self.finish_transaction()
+                messagebox.showinfo("Success", f"{format_money(amount)} withdrawn successfully")
+            else:
+                messagebox.showerror("Error", "Insufficient balance")
+
+        self.tasks.run(self.bank.withdraw, account.account_number, amount,
+                       on_success=finish,
+                       on_error=self.show_task_error,
+                       busy=self.account_buttons())
+
+    def finish_transaction(self):
+        """Show the new balance and transaction after a deposit or withdrawal."""
+        self.update_balance_label()
+        self.transaction_view.refresh()
+        self.amount_entry.delete(0, tk.END)
+
+    def account_buttons(self):
+        """
+        Get the buttons disabled while an account operation runs.
+        
+        Returns:
+            tuple: Deposit, withdraw and logout buttons
+        """
+        return (self.deposit_button, self.withdraw_button, self.logout_button)
+
+    def show_task_error(self, error):
+        """
+        Report a banking call that failed unexpectedly.
+        
+        Args:
+            error (Exception): Exception raised by the call
+        """
+        messagebox.showerror("Error", f"The operation failed: {error}")
 
     def logout(self):
         """
         Handle the logout process.
         
-        Clears current account information and returns to the login screen.
+        Ends the session and returns to the login screen.
         """
         
-        self.current_account = None
+        if self.session_token:
+            self.bank.close_session(self.session_token)
+            self.session_token = None
         self.login_account_entry.delete(0, tk.END)
         self.login_password_entry.delete(0, tk.END)
         self.show_user_type_screen()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import time
+from collections import deque
+from utils.constants import FRAME_PROBE_INTERVAL, FRAME_PROBE_SAMPLES
+
+class FrameLatencyProbe:
+    """
+    Measures how responsive the Tk main loop is.
+
+    A callback is scheduled every interval milliseconds and records how
+    much later than requested it actually ran. While the main loop is
+    blocked, for example by a slow handler, callbacks run late, so the
+    lateness is the delay a user would see before the window reacts.
+
+    Attributes:
+        root (tk.Tk): Main window of the application
+        interval (int): Milliseconds between callbacks
+        samples (deque): Most recent lateness values in milliseconds
+    """
+
+    def __init__(self, root, interval=FRAME_PROBE_INTERVAL, max_samples=FRAME_PROBE_SAMPLES):
+        """
+        Initialize the probe.
+
+        Args:
+            root (tk.Tk): Main window of the application
+            interval (int, optional): Milliseconds between callbacks
+            max_samples (int, optional): Number of samples kept
+        """
+        self.root = root
+        self.interval = interval
+        self.samples = deque(maxlen=max_samples)
+        self.expected = None
+        self.after_id = None
+
+    def start(self):
+        """Start scheduling probe callbacks."""
+        self.expected = time.perf_counter() + self.interval / 1000
+        self.after_id = self.root.after(self.interval, self.tick)
+
+    def tick(self):
+        """Record the lateness of this callback and schedule the next one."""
+        now = time.perf_counter()
+        self.samples.append(max(0.0, (now - self.expected) * 1000))
+        self.expected = now + self.interval / 1000
+        self.after_id = self.root.after(self.interval, self.tick)
+
+    def stop(self):
+        """Stop scheduling probe callbacks."""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def summary(self):
+        """
+        Summarize the recorded lateness.
+
+        Returns:
+            dict: Number of samples and the median, 99th percentile and
+                maximum lateness in milliseconds
+        """
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {'samples': 0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+        return {
+            'samples': len(ordered),
+            'p50': ordered[len(ordered) // 2],
+            'p99': ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)],
+            'max': ordered[-1]
+        }
\ No newline at end of file
@@ -0,0 +1,150 @@
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from utils.constants import GUI_WORKER_THREADS, TASK_POLL_INTERVAL
+
+class TaskRunner:
+    """
+    Runs service calls on worker threads so the Tk main loop never waits.
+
+    Tk widgets may only be used from the main loop thread. Finished calls
+    are therefore queued by the workers and picked up by a callback the
+    main loop runs with root.after, which then calls the completion
+    handler on the main loop thread. While calls are in flight the given
+    buttons are disabled, the registered progress indicators run and the
+    mouse cursor shows that the application is busy.
+
+    Attributes:
+        root (tk.Tk): Main window of the application
+        executor (ThreadPoolExecutor): Worker threads
+        results (queue.Queue): Finished calls waiting for the main loop
+        poll_interval (int): Milliseconds between checks for finished calls
+        in_flight (int): Number of calls not yet completed
+        indicators (list): Progress bars shown while calls are in flight
+    """
+
+    def __init__(self, root, max_workers=GUI_WORKER_THREADS,
+                 poll_interval=TASK_POLL_INTERVAL):
+        """
+        Initialize the task runner.
+
+        Args:
+            root (tk.Tk): Main window of the application
+            max_workers (int, optional): Number of worker threads
+            poll_interval (int, optional): Milliseconds between checks for
+                finished calls
+        """
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="gui-task")
+        self.results = queue.Queue()
+        self.poll_interval = poll_interval
+        self.in_flight = 0
+        self.indicators = []
+        self.polling = False
+
+    def add_indicator(self, progressbar):
+        """
+        Register a progress bar to show while calls are in flight.
+
+        The progress bar must already be placed with grid; it is hidden
+        until a call starts.
+
+        Args:
+            progressbar (ttk.Progressbar): Indeterminate progress bar
+        """
+        self.indicators.append(progressbar)
+        if not self.in_flight:
+            progressbar.grid_remove()
+
+    def run(self, func, *args, on_success=None, on_error=None, busy=()):
+        """
+        Run a call on a worker thread.
+
+        Args:
+            func (function): Service method to call
+            *args: Arguments for the method
+            on_success (function, optional): Called on the main loop
+                thread with the result
+            on_error (function, optional): Called on the main loop thread
+                with the exception raised by the call
+            busy (tuple, optional): Buttons disabled until the call completes
+
+        Returns:
+            Future: Completion of the call
+        """
+        for widget in busy:
+            widget.state(["disabled"])
+        self.in_flight += 1
+        if self.in_flight == 1:
+            self.set_busy(True)
+
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(
+            lambda done: self.results.put((done, on_success, on_error, busy)))
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_interval, self.poll)
+        return future
+
+    def poll(self):
+        """Complete finished calls on the main loop thread."""
+        while True:
+            try:
+                future, on_success, on_error, busy = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.finish(future, on_success, on_error, busy)
+
+        if self.in_flight:
+            self.root.after(self.poll_interval, self.poll)
+        else:
+            self.polling = False
+
+    def finish(self, future, on_success, on_error, busy):
+        """
+        Re-enable buttons and hand a finished call to its handler.
+
+        Args:
+            future (Future): Finished call
+            on_success (function): Handler for the result, may be None
+            on_error (function): Handler for the exception, may be None
+            busy (tuple): Buttons disabled for the call
+        """
+        self.in_flight -= 1
+        for widget in busy:
+            try:
+                widget.state(["!disabled"])
+            except tk.TclError:
+                # The widget's window was closed while the call ran
+                pass
+        if not self.in_flight:
+            self.set_busy(False)
+
+        error = future.exception()
+        if error:
+            print(f"Error running task: {error}")
+            if on_error:
+                on_error(error)
+        elif on_success:
+            on_success(future.result())
+
+    def set_busy(self, busy):
+        """
+        Show or hide the in-flight indicators.
+
+        Args:
+            busy (bool): Whether calls are in flight
+        """
+        self.root.config(cursor="watch" if busy else "")
+        for progressbar in self.indicators:
+            if busy:
+                progressbar.grid()
+                progressbar.start(10)
+            else:
+                progressbar.stop()
+                progressbar.grid_remove()
+
+    def shutdown(self):
+        """Wait for running calls to finish and stop the worker threads."""
+        self.executor.shutdown(wait=True)
\ No newline at end of file
@@ -0,0 +1,395 @@
+from tkinter import ttk
+from utils.constants import TREE_FETCH_SIZE
+
+class RowCache:
+    """
+    Lazily fetched rows of a list that only grows at its end.
+
+    Rows are addressed by their position in the underlying list and
+    fetched in blocks of fetch_size the first time one of them is needed.
+    When the list grows, only the last, partially filled block is dropped,
+    so rows already fetched are never fetched again.
+
+    Attributes:
+        fetch (function): Called with (start, count), returns the items at
+            positions start to start + count - 1
+        count (function): Returns the current number of items
+        fetch_size (int): Items fetched at a time
+        total (int): Number of items when last counted
+        blocks (dict): Block number to list of fetched items
+    """
+
+    def __init__(self, fetch, count, fetch_size=TREE_FETCH_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            fetch (function): Returns the items of a position range
+            count (function): Returns the current number of items
+            fetch_size (int, optional): Items fetched at a time
+        """
+        self.fetch = fetch
+        self.count = count
+        self.fetch_size = fetch_size
+        self.total = 0
+        self.blocks = {}
+
+    def reload(self, total=None):
+        """
+        Drop every fetched item and count the items again.
+
+        Args:
+            total (int, optional): Current number of items, when the
+                caller has counted them already
+        """
+        self.blocks = {}
+        self.total = self.count() if total is None else total
+
+    def refresh(self, total=None):
+        """
+        Pick up items added since the last count.
+
+        Args:
+            total (int, optional): Current number of items, when the
+                caller has counted them already
+
+        Returns:
+            int: Number of items added
+        """
+        previous = self.total
+        self.total = self.count() if total is None else total
+        if self.total < previous:
+            self.reload(self.total)
+            return 0
+        if previous % self.fetch_size:
+            self.blocks.pop(previous // self.fetch_size, None)
+        return self.total - previous
+
+    def get(self, position):
+        """
+        Get the item at a position, fetching its block if needed.
+
+        Args:
+            position (int): Position in the underlying list
+
+        Returns:
+            The item, None if it no longer exists
+        """
+        block, offset = divmod(position, self.fetch_size)
+        if block not in self.blocks:
+            self.blocks[block] = self.fetch(block * self.fetch_size, self.fetch_size)
+        items = self.blocks[block]
+        return items[offset] if offset < len(items) else None
+
+    def has(self, position):
+        """
+        Check whether the block holding a position has been fetched.
+
+        Args:
+            position (int): Position in the underlying list
+
+        Returns:
+            bool: True if get will not call fetch
+        """
+        return position // self.fetch_size in self.blocks
+
+class VirtualTreeview:
+    """
+    Treeview that only renders the rows currently in view.
+
+    The treeview holds at most height items, which are reused as the view
+    scrolls: scrolling fetches the newly visible rows through a RowCache and
+    updates only the items whose values changed, so the cost of showing or
+    scrolling a list does not depend on its length.
+
+    Given a TaskRunner, counting and fetching run on its worker threads and
+    the main loop never waits for them: rows not fetched yet show empty
+    until their block arrives, and results requested before the latest
+    reload or refresh are dropped.
+
+    Attributes:
+        frame (ttk.Frame): Frame holding the treeview and its scrollbar
+        tree (ttk.Treeview): Underlying treeview, for headings and columns
+        scrollbar (ttk.Scrollbar): Vertical scrollbar
+        rows (RowCache): Fetched rows
+        format_row (function): Converts an item into treeview values
+        height (int): Number of visible rows
+        newest_first (bool): Show the last item of the list at the top
+        top (int): Index of the first visible row
+        selected (int): Index of the selected row, None if none
+        shown (dict): Treeview item to the values it currently shows
+        tasks (TaskRunner): Runs counts and fetches off the main loop, None
+            to run them on it
+        generation (int): Incremented whenever fetched rows are dropped
+        pending (set): Blocks being fetched for the current generation
+        counting (int): Number of the latest count requested
+        reload_pending (bool): A reload waits for its count
+    """
+
+    def __init__(self, parent, columns, fetch, count, format_row, height=10,
+                 newest_first=False, fetch_size=TREE_FETCH_SIZE, tasks=None):
+        """
+        Create the treeview.
+
+        Args:
+            parent (tk.Widget): Parent widget
+            columns (tuple): Column identifiers
+            fetch (function): Called with (start, count), returns the items
+                at those positions of the list, oldest first
+            count (function): Returns the current number of items
+            format_row (function): Converts an item into treeview values
+            height (int, optional): Number of visible rows
+            newest_first (bool, optional): Show the last item at the top
+            fetch_size (int, optional): Items fetched at a time
+            tasks (TaskRunner, optional): Runs counts and fetches on worker
+                threads
+        """
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings",
+                                 height=height, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.scroll)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.frame.grid_rowconfigure(0, weight=1)
+
+        self.rows = RowCache(fetch, count, fetch_size)
+        self.format_row = format_row
+        self.height = height
+        self.newest_first = newest_first
+        self.top = 0
+        self.selected = None
+        self.shown = {}
+        self.tasks = tasks
+        self.generation = 0
+        self.pending = set()
+        self.counting = 0
+        self.reload_pending = False
+
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.height))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.height))
+
+    def grid(self, **kwargs):
+        """Place the treeview and its scrollbar with the grid manager."""
+        self.frame.grid(**kwargs)
+
+    def reload(self):
+        """Show the start of the list, fetching everything again."""
+        if self.tasks:
+            self.reload_pending = True
+            self.request_count()
+        else:
+            self.counted(self.counting, self.rows.count(), reload=True)
+
+    def refresh(self):
+        """
+        Show items added since the last refresh and redraw visible rows.
+
+        Rows already fetched are kept. In newest-first order a view scrolled
+        away from the top keeps showing the same rows; at the top the new
+        rows come into view.
+        """
+        if self.tasks:
+            self.request_count()
+        else:
+            self.counted(self.counting, self.rows.count())
+
+    def request_count(self):
+        """Count the items on a worker thread, superseding earlier counts."""
+        self.counting += 1
+        request = self.counting
+        self.tasks.run(self.rows.count,
+                       on_success=lambda total: self.counted(request, total,
+                                                             self.reload_pending))
+
+    def counted(self, request, total, reload=False):
+        """
+        Show the list once its items have been counted.
+
+        Args:
+            request (int): Number of the count, ignored unless the latest
+            total (int): Number of items
+            reload (bool, optional): Start the list over instead of picking
+                up added items
+        """
+        if request != self.counting or not self.tree.winfo_exists():
+            return
+        self.generation += 1
+        self.pending = set()
+        if reload:
+            self.reload_pending = False
+            self.rows.reload(total)
+            self.top = 0
+            self.selected = None
+            self.render()
+            return
+        added = self.rows.refresh(total)
+        if self.newest_first and added:
+            if self.top:
+                self.top += added
+            if self.selected is not None:
+                self.selected += added
+        self.render()
+
+    def position(self, index):
+        """
+        Convert a row index to a position in the list.
+
+        Args:
+            index (int): Row index, 0 being the top row
+
+        Returns:
+            int: Position in the list
+        """
+        return self.rows.total - 1 - index if self.newest_first else index
+
+    def selected_item(self):
+        """
+        Get the item of the selected row.
+
+        Returns:
+            The selected item, None if no row is selected
+        """
+        if self.selected is None or self.selected >= self.rows.total:
+            return None
+        return self.row(self.position(self.selected))
+
+    def row(self, position):
+        """
+        Get the item at a position, fetching its block if needed.
+
+        With a task runner a block that has not been fetched is requested
+        in the background and the view is rendered again once it arrives.
+
+        Args:
+            position (int): Position in the list
+
+        Returns:
+            The item, None if it no longer exists or is still being fetched
+        """
+        if not self.tasks or self.rows.has(position):
+            return self.rows.get(position)
+        block = position // self.rows.fetch_size
+        if block not in self.pending:
+            self.pending.add(block)
+            generation = self.generation
+            self.tasks.run(self.rows.fetch, block * self.rows.fetch_size, self.rows.fetch_size,
+                           on_success=lambda items: self.fetched(generation, block, items),
+                           on_error=lambda error: self.pending.discard(block))
+        return None
+
+    def fetched(self, generation, block, items):
+        """
+        Keep a block fetched in the background and show its rows.
+
+        Args:
+            generation (int): Generation the block was requested in
+            block (int): Block number
+            items (list): Fetched items
+        """
+        if generation != self.generation or not self.tree.winfo_exists():
+            return
+        self.pending.discard(block)
+        self.rows.blocks[block] = items
+        self.render()
+
+    def render(self):
+        """Update the treeview items to show the rows currently in view."""
+        total = self.rows.total
+        self.top = max(0, min(self.top, total - self.height))
+        visible = min(self.height, total)
+
+        items = self.tree.get_children()
+        for item in items[visible:]:
+            self.tree.delete(item)
+            self.shown.pop(item, None)
+        items = list(items[:visible])
+        while len(items) < visible:
+            items.append(self.tree.insert("", "end"))
+
+        for offset, item in enumerate(items):
+            row = self.row(self.position(self.top + offset))
+            values = self.format_row(row) if row is not None else ()
+            if self.shown.get(item) != values:
+                self.tree.item(item, values=values)
+                self.shown[item] = values
+
+        selected = None
+        if self.selected is not None and 0 <= self.selected - self.top < visible:
+            selected = items[self.selected - self.top]
+        if selected:
+            if self.tree.selection() != (selected,):
+                self.tree.selection_set(selected)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if total:
+            self.scrollbar.set(self.top / total, (self.top + visible) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, *args):
+        """
+        Handle a scrollbar command.
+
+        Args:
+            *args: ('moveto', fraction) or ('scroll', number, 'units' or 'pages')
+        """
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self.rows.total)
+            self.render()
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.scroll_by(step * self.height if args[2] == "pages" else step)
+
+    def scroll_by(self, rows):
+        """
+        Scroll the view by a number of rows.
+
+        Args:
+            rows (int): Rows to scroll, negative to scroll up
+
+        Returns:
+            str: "break", so Tk skips its default handling of the event
+        """
+        self.top += rows
+        self.render()
+        return "break"
+
+    def on_mousewheel(self, event):
+        """Scroll three rows per mouse wheel notch."""
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        return self.scroll_by(-3 * notches)
+
+    def on_select(self, event):
+        """Remember the selected row by its index in the whole list."""
+        selection = self.tree.selection()
+        if selection and selection[0] in self.tree.get_children():
+            self.selected = self.top + self.tree.index(selection[0])
+
+    def move_selection(self, rows):
+        """
+        Move the selection, scrolling it into view when needed.
+
+        Args:
+            rows (int): Rows to move, negative to move up
+
+        Returns:
+            str: "break", so Tk skips its default handling of the event
+        """
+        if not self.rows.total:
+            return "break"
+        current = self.selected if self.selected is not None else self.top - rows
+        self.selected = max(0, min(current + rows, self.rows.total - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.height:
+            self.top = self.selected - self.height + 1
+        self.render()
+        return "break"
\ No newline at end of file
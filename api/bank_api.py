@@ -0,0 +1,542 @@
+import base64
+import binascii
+import re
+from http import HTTPStatus
+from api.http_server import HttpError
+from models.transaction_store import parse_date_bound
+from utils.constants import (
+    TRANSACTION_PAGE_SIZE, TREE_FETCH_SIZE, ADMIN_LOG_PAGE_SIZE, SUMMARY_DAYS
+)
+from utils.money import parse_amount, format_amount
+
+# Largest page a client may request from list endpoints
+MAX_PAGE_SIZE = 1000
+
+# Query parameters that turn a history request into a filtered search
+QUERY_PARAMS = ('start', 'end', 'type', 'min_amount', 'max_amount')
+
+# Bucket lengths in seconds accepted by the analytics endpoint
+ANALYTICS_BUCKETS = {'hour': 3600, 'day': 86400, 'week': 7 * 86400}
+
+# Challenge sent with 401 responses
+AUTHENTICATE_HEADERS = {'WWW-Authenticate': 'Bearer realm="bank", Basic realm="bank"'}
+
+# (method, path pattern, handler method name), matched in order
+ROUTES = [
+    ('POST', r'/accounts', 'create_account'),
+    ('POST', r'/login', 'login'),
+    ('POST', r'/logout', 'logout'),
+    ('GET', r'/accounts/(?P<account_number>[^/]+)', 'get_account'),
+    ('POST', r'/accounts/(?P<account_number>[^/]+)/deposit', 'deposit'),
+    ('POST', r'/accounts/(?P<account_number>[^/]+)/withdraw', 'withdraw'),
+    ('GET', r'/accounts/(?P<account_number>[^/]+)/transactions', 'get_transactions'),
+    ('POST', r'/admin/login', 'admin_login'),
+    ('GET', r'/admin/users', 'get_users'),
+    ('DELETE', r'/admin/users/(?P<account_number>[^/]+)', 'remove_user'),
+    ('GET', r'/admin/users/(?P<account_number>[^/]+)/transactions', 'get_user_transactions'),
+    ('GET', r'/admin/logs', 'get_admin_logs'),
+    ('GET', r'/admin/analytics', 'get_analytics'),
+    ('GET', r'/admin/summary', 'get_summary'),
+]
+
+def transaction_to_json(transaction):
+    """
+    Convert a transaction to its API representation.
+
+    Args:
+        transaction (dict): Transaction with amounts in cents
+
+    Returns:
+        dict: Transaction with amounts as decimal strings
+    """
+    return dict(
+        transaction,
+        amount=format_amount(transaction['amount']),
+        balance=format_amount(transaction['balance'])
+    )
+
+def account_to_json(account):
+    """
+    Convert an account header to its API representation.
+
+    Args:
+        account (BankAccount): Account to convert
+
+    Returns:
+        dict: Account number, name and balance as a decimal string
+    """
+    return {
+        'account_number': account.account_number,
+        'name': account.name,
+        'balance': format_amount(account.balance)
+    }
+
+def log_to_json(log):
+    """
+    Convert an admin log to its API representation.
+
+    Args:
+        log (AdminLog): Log entry to convert
+
+    Returns:
+        dict: Log entry fields
+    """
+    return log.to_dict()
+
+class BankApi:
+    """
+    JSON API over BankingSystem and AdminService.
+
+    Clients authenticate with a Bearer session token returned by
+    POST /login or POST /admin/login, which is checked without hashing the
+    password again, or with HTTP Basic credentials on every request: the
+    account number and password for account endpoints, and the admin
+    username and password for /admin endpoints. Amounts are exchanged as
+    decimal strings such as "12.50" so no precision is lost.
+
+    Attributes:
+        bank (BankingSystem): Banking system serving account requests
+        admin_service (AdminService): Service serving admin requests
+        routes (list): (method, compiled pattern, handler) triples
+    """
+
+    def __init__(self, banking_system, admin_service):
+        """
+        Initialize the API.
+
+        Args:
+            banking_system (BankingSystem): Banking system to expose
+            admin_service (AdminService): Admin service to expose
+        """
+        self.bank = banking_system
+        self.admin_service = admin_service
+        self.routes = [
+            (method, re.compile(pattern + '$'), getattr(self, name))
+            for method, pattern, name in ROUTES
+        ]
+
+    def handle(self, request):
+        """
+        Route a request to its handler.
+
+        Args:
+            request (Request): Request to handle
+
+        Returns:
+            tuple: HTTP status and JSON-serializable payload
+
+        Raises:
+            HttpError: If no route matches or the handler rejects the request
+        """
+        path_matched = False
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if match:
+                if method == request.method:
+                    return handler(request, **match.groupdict())
+                path_matched = True
+        if path_matched:
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed")
+        raise HttpError(HTTPStatus.NOT_FOUND, "Not found")
+
+    def bearer_token(self, request):
+        """
+        Read a Bearer session token from a request.
+
+        Args:
+            request (Request): Request to read
+
+        Returns:
+            str: Session token, None if the request uses another scheme
+        """
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        return token.strip() if scheme.lower() == 'bearer' else None
+
+    def credentials(self, request):
+        """
+        Read HTTP Basic credentials from a request.
+
+        Args:
+            request (Request): Request to read
+
+        Returns:
+            tuple: User name and password
+
+        Raises:
+            HttpError: If the request carries no valid Basic credentials
+        """
+        scheme, _, encoded = request.headers.get('authorization', '').partition(' ')
+        if scheme.lower() == 'basic':
+            try:
+                username, separator, password = (
+                    base64.b64decode(encoded, validate=True).decode('utf-8').partition(':'))
+            except (binascii.Error, UnicodeDecodeError):
+                separator = None
+            if separator:
+                return username, password
+        raise HttpError(HTTPStatus.UNAUTHORIZED, "Authentication required",
+                        AUTHENTICATE_HEADERS)
+
+    def authenticate_account(self, request, account_number):
+        """
+        Check that a request is made by the owner of an account.
+
+        Args:
+            request (Request): Request to check
+            account_number (str): Account the request refers to
+
+        Returns:
+            BankAccount: Authenticated account
+
+        Raises:
+            HttpError: If the credentials are missing, invalid or belong to
+                another account
+        """
+        token = self.bearer_token(request)
+        if token is not None:
+            account = self.bank.session_account(token)
+            if not account:
+                raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid or expired session",
+                                AUTHENTICATE_HEADERS)
+        else:
+            account = self.bank.login(*self.credentials(request))
+            if not account:
+                raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid account number or password",
+                                AUTHENTICATE_HEADERS)
+        if account.account_number != account_number:
+            raise HttpError(HTTPStatus.FORBIDDEN, "Access to this account is not allowed")
+        return account
+
+    def authenticate_admin(self, request):
+        """
+        Check that a request is made by an administrator.
+
+        Args:
+            request (Request): Request to check
+
+        Returns:
+            Admin: Authenticated administrator
+
+        Raises:
+            HttpError: If the credentials are missing or invalid
+        """
+        token = self.bearer_token(request)
+        if token is not None:
+            admin = self.admin_service.session_admin(token)
+            if not admin:
+                raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid or expired session",
+                                AUTHENTICATE_HEADERS)
+            return admin
+        admin = self.admin_service.verify_admin(*self.credentials(request))
+        if not admin:
+            raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid username or password",
+                            AUTHENTICATE_HEADERS)
+        return admin
+
+    def create_account(self, request):
+        """POST /accounts {"name", "password"}: create an account."""
+        data = request.json()
+        name, password = data.get('name'), data.get('password')
+        if not isinstance(name, str) or not isinstance(password, str) or not name or not password:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "name and password are required")
+        account_number = self.bank.create_account(name, password)
+        return HTTPStatus.CREATED, {'account_number': account_number}
+
+    def login(self, request):
+        """POST /login {"account_number", "password"}: start a client session."""
+        data = request.json()
+        token = self.bank.open_session(str(data.get('account_number', '')),
+                                       str(data.get('password', '')))
+        account = self.bank.session_account(token) if token else None
+        if not account:
+            raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid account number or password")
+        return HTTPStatus.OK, dict(account_to_json(account), token=token)
+
+    def logout(self, request):
+        """POST /logout: end the client or admin session of the Bearer token."""
+        token = self.bearer_token(request)
+        if token is None or not self.bank.sessions.revoke(token):
+            raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid or expired session",
+                            AUTHENTICATE_HEADERS)
+        return HTTPStatus.OK, {'logged_out': True}
+
+    def get_account(self, request, account_number):
+        """GET /accounts/<number>: account number, name and balance."""
+        account = self.authenticate_account(request, account_number)
+        return HTTPStatus.OK, account_to_json(account)
+
+    def deposit(self, request, account_number):
+        """POST /accounts/<number>/deposit {"amount"}: deposit money."""
+        account = self.authenticate_account(request, account_number)
+        try:
+            deposited = self.bank.deposit(account_number, amount_from_request(request))
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+        if not deposited:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Account not found")
+        return HTTPStatus.OK, account_to_json(account)
+
+    def withdraw(self, request, account_number):
+        """POST /accounts/<number>/withdraw {"amount"}: withdraw money."""
+        account = self.authenticate_account(request, account_number)
+        try:
+            withdrawn = self.bank.withdraw(account_number, amount_from_request(request))
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+        if not withdrawn:
+            raise HttpError(HTTPStatus.CONFLICT, "Insufficient balance")
+        return HTTPStatus.OK, account_to_json(account)
+
+    def get_transactions(self, request, account_number):
+        """GET /accounts/<number>/transactions?cursor=&limit=: history page, newest first."""
+        self.authenticate_account(request, account_number)
+        if any(name in request.query for name in QUERY_PARAMS):
+            return self.search_transactions(request, account_number)
+        page, cursor = self.bank.get_transaction_page(
+            account_number,
+            int_param(request, 'cursor', None),
+            int_param(request, 'limit', TRANSACTION_PAGE_SIZE, MAX_PAGE_SIZE)
+        )
+        return HTTPStatus.OK, {
+            'transactions': [transaction_to_json(transaction) for transaction in page],
+            'next_cursor': cursor
+        }
+
+    def admin_login(self, request):
+        """POST /admin/login {"username", "password"}: start an admin session."""
+        data = request.json()
+        username = str(data.get('username', ''))
+        token = self.admin_service.open_session(username, str(data.get('password', '')))
+        if not token:
+            raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid username or password")
+        return HTTPStatus.OK, {'username': username, 'token': token}
+
+    def get_users(self, request):
+        """
+        GET /admin/users?start=&count=: accounts in creation order.
+
+        Filters use the account indexes: name=<text> finds names containing
+        the text, prefix=<text> names starting with it, min_balance= and
+        max_balance= a balance range ordered by balance, and top=<n> the
+        largest balances.
+        """
+        self.authenticate_admin(request)
+        start = int_param(request, 'start', 0)
+        count = int_param(request, 'count', TREE_FETCH_SIZE, MAX_PAGE_SIZE)
+        query = request.query
+        service = self.admin_service
+        if 'top' in query:
+            users = service.get_top_users(int_param(request, 'top', 0, MAX_PAGE_SIZE))
+            total = len(users)
+        elif 'name' in query:
+            users = service.search_users(query['name'], count)
+            total = len(users)
+        elif 'prefix' in query:
+            users = service.get_users_by_name_prefix(query['prefix'], start, count)
+            total = service.count_users_by_name_prefix(query['prefix'])
+        elif 'min_balance' in query or 'max_balance' in query:
+            minimum = amount_param(request, 'min_balance')
+            maximum = amount_param(request, 'max_balance')
+            users = service.get_users_by_balance(minimum, maximum, start, count)
+            total = service.count_users_by_balance(minimum, maximum)
+        else:
+            users = service.get_users(start, count)
+            total = service.count_users()
+        return HTTPStatus.OK, {
+            'total': total,
+            'users': [account_to_json(account) for _, account in users]
+        }
+
+    def remove_user(self, request, account_number):
+        """DELETE /admin/users/<number>: remove an account."""
+        admin = self.authenticate_admin(request)
+        if not self.admin_service.remove_user(admin.username, account_number):
+            raise HttpError(HTTPStatus.NOT_FOUND, "Account not found")
+        return HTTPStatus.OK, {'removed': account_number}
+
+    def get_user_transactions(self, request, account_number):
+        """GET /admin/users/<number>/transactions?cursor=&limit=: history page."""
+        self.authenticate_admin(request)
+        if any(name in request.query for name in QUERY_PARAMS):
+            return self.search_transactions(request, account_number)
+        page, cursor = self.admin_service.get_user_transactions(
+            account_number,
+            int_param(request, 'cursor', None),
+            int_param(request, 'limit', TRANSACTION_PAGE_SIZE, MAX_PAGE_SIZE)
+        )
+        return HTTPStatus.OK, {
+            'transactions': [transaction_to_json(transaction) for transaction in page],
+            'next_cursor': cursor
+        }
+
+    def search_transactions(self, request, account_number):
+        """
+        Answer a history request with filters, newest matches first.
+
+        Query parameters: start= and end= as "YYYY-MM-DD" or
+        "YYYY-MM-DD HH:MM:SS", type= as a comma-separated list of types,
+        min_amount= and max_amount= as amounts such as "12.50", and limit=.
+
+        Args:
+            request (Request): Request to answer
+            account_number (str): Account to search
+
+        Returns:
+            tuple: Status and payload with the matching transactions
+        """
+        query = request.query
+        types = query['type'].split(',') if 'type' in query else None
+        min_amount = amount_param(request, 'min_amount')
+        max_amount = amount_param(request, 'max_amount')
+        limit = int_param(request, 'limit', TRANSACTION_PAGE_SIZE, MAX_PAGE_SIZE)
+        try:
+            transactions = self.bank.query_transactions(
+                account_number, query.get('start'), query.get('end'), types,
+                min_amount, max_amount, limit)
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+        return HTTPStatus.OK, {
+            'transactions': [transaction_to_json(transaction) for transaction in transactions]
+        }
+
+    def get_admin_logs(self, request):
+        """GET /admin/logs?admin=&action=&start=&end=&limit=: newest matching logs."""
+        self.authenticate_admin(request)
+        logs = self.admin_service.get_admin_logs(
+            request.query.get('admin'),
+            request.query.get('action'),
+            request.query.get('start'),
+            request.query.get('end'),
+            int_param(request, 'limit', ADMIN_LOG_PAGE_SIZE, MAX_PAGE_SIZE)
+        )
+        return HTTPStatus.OK, {'logs': [log_to_json(log) for log in logs]}
+
+    def get_analytics(self, request):
+        """
+        GET /admin/analytics?start=&end=&bucket=: bank-wide aggregates.
+
+        Reports the count and total of each transaction type, the volume of
+        each type per hour, day or week (day by default), the distribution
+        of deposit and withdrawal amounts and the average account balance.
+        start= and end= limit the transactions as "YYYY-MM-DD" or
+        "YYYY-MM-DD HH:MM:SS".
+        """
+        self.authenticate_admin(request)
+        query = request.query
+        bucket = query.get('bucket', 'day')
+        if bucket not in ANALYTICS_BUCKETS:
+            raise HttpError(HTTPStatus.BAD_REQUEST,
+                            f"bucket must be one of {', '.join(ANALYTICS_BUCKETS)}")
+        try:
+            start = parse_date_bound(query['start']) if 'start' in query else None
+            end = parse_date_bound(query['end'], end=True) if 'end' in query else None
+            analytics = self.bank.get_analytics()
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+        except RuntimeError as e:
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+
+        def totals_to_json(totals):
+            return {tx_type: {'count': total['count'], 'total': format_amount(total['total'])}
+                    for tx_type, total in totals.items()}
+
+        return HTTPStatus.OK, {
+            'totals': totals_to_json(analytics.totals_by_type(start, end)),
+            'average_balance': format_amount(round(analytics.average_balance())),
+            'volumes': [
+                {'start': period.pop('start'), **totals_to_json(period)}
+                for period in analytics.volume_by_period(ANALYTICS_BUCKETS[bucket], start, end)
+            ],
+            'distributions': {
+                tx_type: [
+                    {'low': format_amount(low), 'high': format_amount(high), 'count': count}
+                    for low, high, count in analytics.amount_distribution(
+                        tx_type, start=start, end=end)
+                ]
+                for tx_type in ('deposit', 'withdrawal')
+            }
+        }
+
+    def get_summary(self, request):
+        """
+        GET /admin/summary?days=: bank-wide totals kept up to date by every
+        operation, so answering does not scan accounts or logs.
+        """
+        self.authenticate_admin(request)
+        summary = self.admin_service.get_summary(
+            int_param(request, 'days', SUMMARY_DAYS, MAX_PAGE_SIZE))
+        return HTTPStatus.OK, {
+            'total_balance': format_amount(summary['total_balance']),
+            'account_count': summary['account_count'],
+            'daily': [
+                {'date': day['date'], 'deposit': format_amount(day['deposit']),
+                 'withdrawal': format_amount(day['withdrawal'])}
+                for day in summary['daily']
+            ],
+            'admin_actions': summary['admin_actions']
+        }
+
+def amount_from_request(request):
+    """
+    Read the amount of a deposit or withdrawal request.
+
+    Args:
+        request (Request): Request with an 'amount' field such as "12.50"
+
+    Returns:
+        int: Amount in cents
+
+    Raises:
+        HttpError: If the amount is missing or not a positive amount
+    """
+    try:
+        return parse_amount(str(request.json()['amount']))
+    except (KeyError, ValueError):
+        raise HttpError(HTTPStatus.BAD_REQUEST,
+                        "amount must be a positive amount such as \"12.50\"")
+
+def amount_param(request, name):
+    """
+    Read a non-negative dollar amount query parameter.
+
+    Args:
+        request (Request): Request to read
+        name (str): Parameter name
+
+    Returns:
+        int: Amount in cents, None when the parameter is absent
+
+    Raises:
+        HttpError: If the parameter is not an amount such as "12.50"
+    """
+    value = request.query.get(name)
+    if value is None:
+        return None
+    try:
+        return parse_amount(value, allow_zero=True)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"{name} must be an amount such as \"12.50\"")
+
+def int_param(request, name, default, maximum=None):
+    """
+    Read a non-negative integer query parameter.
+
+    Args:
+        request (Request): Request to read
+        name (str): Parameter name
+        default: Value when the parameter is absent
+        maximum (int, optional): Largest accepted value
+
+    Returns:
+        int: Parameter value, capped at maximum
+
+    Raises:
+        HttpError: If the parameter is not a non-negative integer
+    """
+    value = request.query.get(name)
+    if value is None:
+        return default
+    if not (value.isascii() and value.isdigit()):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"{name} must be a non-negative integer")
+    value = int(value)
+    return min(value, maximum) if maximum is not None else value
\ No newline at end of file
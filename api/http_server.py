@@ -0,0 +1,374 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+from utils.constants import (
+    API_WORKER_THREADS, API_MAX_PENDING, API_IDLE_TIMEOUT, API_MAX_PIPELINE,
+    API_MAX_HEADER_SIZE, API_MAX_BODY_SIZE
+)
+
+# Request methods without side effects, which may be handled in parallel
+SAFE_METHODS = ('GET', 'HEAD')
+
+class HttpError(Exception):
+    """
+    Error reported to the client as an HTTP error response.
+
+    Attributes:
+        status (int): HTTP status code
+        message (str): Error description sent in the response body
+        headers (dict): Extra response headers
+    """
+
+    def __init__(self, status, message, headers=None):
+        """
+        Initialize the error.
+
+        Args:
+            status (int): HTTP status code
+            message (str): Error description
+            headers (dict, optional): Extra response headers
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+class Request:
+    """
+    A parsed HTTP request.
+
+    Attributes:
+        method (str): Request method, upper case
+        path (str): Request path without the query string
+        query (dict): Query string parameters
+        headers (dict): Header names in lower case to values
+        body (bytes): Request body
+        version (str): HTTP version, such as 'HTTP/1.1'
+    """
+
+    def __init__(self, method, target, version, headers, body):
+        """
+        Initialize the request.
+
+        Args:
+            method (str): Request method
+            target (str): Request target with optional query string
+            version (str): HTTP version
+            headers (dict): Header names in lower case to values
+            body (bytes): Request body
+        """
+        url = urlsplit(target)
+        self.method = method.upper()
+        self.path = url.path
+        self.query = dict(parse_qsl(url.query))
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        """
+        Decode the body as a JSON object.
+
+        Returns:
+            dict: Decoded body, empty if there is no body
+
+        Raises:
+            HttpError: If the body is not a JSON object
+        """
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return data
+
+    def keep_alive(self):
+        """
+        Check whether the client wants the connection kept open.
+
+        Returns:
+            bool: True for HTTP/1.1 unless 'Connection: close' was sent, and
+                for HTTP/1.0 only with 'Connection: keep-alive'
+        """
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+class HttpServer:
+    """
+    Minimal asyncio HTTP/1.1 server for JSON APIs.
+
+    Connections are kept open between requests. Requests a client sends
+    without waiting for earlier responses (pipelining) are read up to
+    max_pipeline ahead and handled concurrently, and their responses are
+    written in request order. Only consecutive GET and HEAD requests
+    overlap: any other request starts once every earlier one has finished,
+    and later requests wait for it, so a client sees its writes in the
+    order it sent them. Handlers are blocking functions and run on a
+    bounded thread pool, so the event loop only parses requests and writes
+    responses. At most max_pending handler calls are queued or running at
+    a time; further requests wait before being handed to the pool.
+
+    Attributes:
+        handler (function): Called with a Request on a worker thread,
+            returns (status, JSON-serializable payload)
+        host (str): Interface to listen on
+        port (int): Port to listen on
+        executor (ThreadPoolExecutor): Threads running the handler
+        pending (asyncio.Semaphore): Limits queued and running handler calls
+        max_pipeline (int): Requests of one connection read ahead of their
+            responses
+        idle_timeout (float): Seconds an idle connection is kept open
+        server (asyncio.Server): Listening server once started
+    """
+
+    def __init__(self, handler, host, port, workers=API_WORKER_THREADS,
+                 max_pending=API_MAX_PENDING, idle_timeout=API_IDLE_TIMEOUT,
+                 max_pipeline=API_MAX_PIPELINE):
+        """
+        Initialize the server.
+
+        Args:
+            handler (function): Request handler
+            host (str): Interface to listen on
+            port (int): Port to listen on
+            workers (int, optional): Threads running the handler
+            max_pending (int, optional): Handler calls queued or running
+                at a time
+            idle_timeout (float, optional): Seconds an idle connection is
+                kept open
+            max_pipeline (int, optional): Requests of one connection read
+                ahead of their responses
+        """
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self.max_pending = max_pending
+        self.pending = None
+        self.idle_timeout = idle_timeout
+        self.max_pipeline = max(1, max_pipeline)
+        self.server = None
+
+    async def start(self):
+        """Start listening for connections."""
+        self.pending = asyncio.Semaphore(self.max_pending)
+        self.server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=API_MAX_HEADER_SIZE)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Start the server if needed and serve until cancelled."""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        """Stop accepting connections and wait for running handlers."""
+        if self.server is not None:
+            self.server.close()
+        self.executor.shutdown(wait=True)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve requests on one connection until it is closed.
+
+        Args:
+            reader (asyncio.StreamReader): Incoming stream
+            writer (asyncio.StreamWriter): Outgoing stream
+        """
+        responses = asyncio.Queue(self.max_pipeline)
+        sender = asyncio.create_task(self.send_responses(responses, writer))
+        last_write = None
+        reads = []
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader), self.idle_timeout)
+                except HttpError as e:
+                    error = asyncio.get_running_loop().create_future()
+                    error.set_result(self.error_response(e, keep_alive=False))
+                    await responses.put(error)
+                    break
+                if request is None:
+                    break
+                keep_alive = request.keep_alive()
+                if request.method in SAFE_METHODS:
+                    task = asyncio.create_task(
+                        self.dispatch_after([last_write], request, keep_alive))
+                    reads.append(task)
+                else:
+                    task = last_write = asyncio.create_task(
+                        self.dispatch_after([last_write] + reads, request, keep_alive))
+                    reads = []
+                # Only waits when max_pipeline responses are outstanding
+                await responses.put(task)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            await responses.put(None)
+            await sender
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def send_responses(self, responses, writer):
+        """
+        Write the responses of one connection in request order.
+
+        Once the client stops accepting data the remaining responses are
+        still awaited, so every handler call is accounted for, but dropped.
+
+        Args:
+            responses (asyncio.Queue): Futures of the responses, ended by None
+            writer (asyncio.StreamWriter): Outgoing stream
+        """
+        connected = True
+        while True:
+            response = await responses.get()
+            if response is None:
+                return
+            response = await response
+            if connected:
+                try:
+                    writer.write(response)
+                    # Only waits when the client is not reading its responses
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+
+    async def read_request(self, reader):
+        """
+        Read and parse the next request from a connection.
+
+        Args:
+            reader (asyncio.StreamReader): Incoming stream
+
+        Returns:
+            Request: Parsed request, None when the client closed the
+                connection between requests
+
+        Raises:
+            HttpError: If the request is malformed or too large
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise
+        except asyncio.LimitOverrunError:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request header too large")
+
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        if 'transfer-encoding' in headers:
+            raise HttpError(HTTPStatus.NOT_IMPLEMENTED, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length < 0:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > API_MAX_BODY_SIZE:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return Request(method, target, version, headers, body)
+
+    async def dispatch_after(self, earlier, request, keep_alive):
+        """
+        Run the handler for a request once earlier requests have finished.
+
+        Args:
+            earlier (list): Tasks of the requests to wait for, or None
+            request (Request): Request to handle
+            keep_alive (bool): Whether the connection stays open
+
+        Returns:
+            bytes: Complete HTTP response
+        """
+        earlier = [task for task in earlier if task is not None]
+        if earlier:
+            await asyncio.wait(earlier)
+        return await self.dispatch(request, keep_alive)
+
+    async def dispatch(self, request, keep_alive):
+        """
+        Run the handler for a request on the worker pool.
+
+        Args:
+            request (Request): Request to handle
+            keep_alive (bool): Whether the connection stays open
+
+        Returns:
+            bytes: Complete HTTP response
+        """
+        async with self.pending:
+            loop = asyncio.get_running_loop()
+            try:
+                status, payload = await loop.run_in_executor(self.executor, self.handler, request)
+            except HttpError as e:
+                return self.error_response(e, keep_alive)
+            except Exception as e:
+                print(f"Error handling request {request.method} {request.path}: {e}")
+                return self.error_response(
+                    HttpError(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error"),
+                    keep_alive)
+        return self.response(status, payload, keep_alive)
+
+    def error_response(self, error, keep_alive):
+        """
+        Build the response for an HttpError.
+
+        Args:
+            error (HttpError): Error to report
+            keep_alive (bool): Whether the connection stays open
+
+        Returns:
+            bytes: Complete HTTP response
+        """
+        return self.response(error.status, {'error': error.message}, keep_alive, error.headers)
+
+    def response(self, status, payload, keep_alive, headers=None):
+        """
+        Build a JSON response.
+
+        Args:
+            status (int): HTTP status code
+            payload: JSON-serializable response body
+            keep_alive (bool): Whether the connection stays open
+            headers (dict, optional): Extra response headers
+
+        Returns:
+            bytes: Complete HTTP response
+        """
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        status = HTTPStatus(status)
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Check and time account number allocation.
+
+Verifies that numbers of removed accounts are never reissued, including
+after a restart, that concurrent account creation never hands out the
+same number twice, and that data saved before the high-water mark existed
+continues after its highest account. Finally times allocation with many
+existing accounts to show it does not depend on the account count.
+
+Usage:
+    python -m benchmarks.account_allocation [threads] [accounts per thread]
+"""
+import sys
+import tempfile
+import threading
+import time
+from benchmarks.concurrency_stress import make_storage
+from services.account_numbers import AccountNumberAllocator, luhn_check_digit
+from services.banking_system import BankingSystem
+
+def check_removal(backend):
+    """
+    Check that removed account numbers are not reissued.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+
+    Returns:
+        bool: True if the check passed
+    """
+    directory = tempfile.mkdtemp()
+    bank = BankingSystem(make_storage(backend, directory))
+    issued = [bank.create_account(f"user{i}", "secret") for i in range(3)]
+    bank.remove_account(issued[1])
+    bank.remove_account(issued[2])
+    issued.append(bank.create_account("user3", "secret"))
+    bank.close()
+
+    reopened = BankingSystem(make_storage(backend, directory))
+    reopened.remove_account(issued[3])
+    issued.append(reopened.create_account("user4", "secret"))
+    reopened.close()
+    return len(set(issued)) == len(issued)
+
+def check_concurrent(backend, threads, count, block_size, check_digit):
+    """
+    Check that concurrent creation issues distinct, persisted numbers.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+        threads (int): Number of creating threads
+        count (int): Accounts created per thread
+        block_size (int): Numbers reserved per metadata write
+        check_digit (bool): Append a Luhn check digit
+
+    Returns:
+        bool: True if the check passed
+    """
+    directory = tempfile.mkdtemp()
+    bank = BankingSystem(make_storage(backend, directory), background_persistence=True)
+    bank.account_numbers = AccountNumberAllocator(
+        bank.storage, bank.persist, bank.accounts, block_size, check_digit)
+    created = [[] for _ in range(threads)]
+
+    def worker(index):
+        for i in range(count):
+            created[index].append(bank.create_account(f"user{index}-{i}", "secret"))
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    issued = [number for numbers in created for number in numbers]
+    bank.close()
+
+    reopened = BankingSystem(make_storage(backend, directory))
+    next_number = reopened.create_account("after restart", "secret")
+    reopened.close()
+    valid = not check_digit or all(
+        luhn_check_digit(number[:-1]) == number[-1] for number in issued)
+    return (valid and len(set(issued)) == threads * count
+            and set(issued) <= set(reopened.accounts) and next_number not in issued)
+
+def check_upgrade(backend):
+    """
+    Check that data without a high-water mark continues after its accounts.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+
+    Returns:
+        bool: True if the check passed
+    """
+    bank = BankingSystem(make_storage(backend, tempfile.mkdtemp()))
+    legacy_accounts = dict.fromkeys(('1000', '1001', '1007'))
+    allocator = AccountNumberAllocator(bank.storage, bank.persist, legacy_accounts)
+    number = allocator.allocate(legacy_accounts)
+    bank.close()
+    return number == '1008'
+
+def time_allocation(existing, count):
+    """
+    Time allocation with many existing accounts.
+
+    Args:
+        existing (int): Number of existing accounts
+        count (int): Numbers to allocate
+
+    Returns:
+        float: Allocations per second
+    """
+    accounts = {str(1000 + i): None for i in range(existing)}
+    bank = BankingSystem(make_storage('sqlite', tempfile.mkdtemp()))
+    allocator = AccountNumberAllocator(bank.storage, bank.persist, accounts, block_size=1000)
+    started = time.perf_counter()
+    for _ in range(count):
+        allocator.allocate(accounts)
+    rate = count / (time.perf_counter() - started)
+    bank.close()
+    return rate
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    results = []
+    for backend in ('json', 'sqlite'):
+        checks = {
+            'removal': check_removal(backend),
+            'concurrent': check_concurrent(backend, threads, count, 1, False),
+            'concurrent blocks': check_concurrent(backend, threads, count, 16, True),
+            'upgrade': check_upgrade(backend),
+        }
+        for name, passed in checks.items():
+            print(f"{backend:6} {name:18} {'OK' if passed else 'FAILED'}")
+        results.extend(checks.values())
+
+    for existing in (1000, 1000000):
+        print(f"{existing:8} existing accounts: "
+              f"{time_allocation(existing, 100000):10.0f} allocations/s")
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Indexed account lookups against a linear scan.
+
+A synthetic population of accounts is indexed with AccountIndex, then
+name prefix, name substring, balance range and top balance queries are
+answered both from the index and by scanning every account, as listing
+all users did before. Reports the average time per query for both, the
+cost of the incremental balance update done by every deposit and
+withdrawal, and checks that both methods return the same accounts.
+
+Usage:
+    python -m benchmarks.account_index [accounts] [queries]
+"""
+import heapq
+import random
+import sys
+import time
+from collections import namedtuple
+from services.account_index import AccountIndex, fold_name
+
+# Only the fields the index reads, so a million accounts fit in memory
+Account = namedtuple('Account', 'account_number name balance')
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Daniel", "Lisa", "Matthew", "Nancy",
+    "Anthony", "Betty", "Mark", "Sandra", "Steven", "Ashley", "Andrew", "Emily",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson",
+    "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker",
+    "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+)
+
+def make_accounts(count, rng):
+    """
+    Generate synthetic accounts.
+
+    Args:
+        count (int): Number of accounts
+        rng (random.Random): Random source
+
+    Returns:
+        list: Account tuples
+    """
+    return [
+        Account(str(1000 + i),
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.randrange(10000):04d}",
+                rng.randrange(10_000_000))
+        for i in range(count)
+    ]
+
+def timed(queries, answer):
+    """
+    Answer a list of queries and measure the average time per query.
+
+    Args:
+        queries (list): Query arguments
+        answer (function): Called with each query's arguments
+
+    Returns:
+        tuple: Average seconds per query and the list of answers
+    """
+    started = time.perf_counter()
+    answers = [answer(*query) for query in queries]
+    return (time.perf_counter() - started) / len(queries), answers
+
+def compare(name, queries, indexed, scan):
+    """
+    Time a kind of query with the index and with a scan and report both.
+
+    Args:
+        name (str): Query description
+        queries (list): Query arguments
+        indexed (function): Answers a query from the index
+        scan (function): Answers a query by scanning all accounts
+
+    Returns:
+        bool: True if both methods gave the same answers
+    """
+    index_time, index_answers = timed(queries, indexed)
+    scan_time, scan_answers = timed(queries, scan)
+    same = index_answers == scan_answers
+    print(f"{name:<16} index {index_time * 1e6:9.1f} us   scan {scan_time * 1e6:11.1f} us"
+          f"   {scan_time / index_time:8.0f}x   {'OK' if same else 'MISMATCH'}")
+    return same
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    limit = 100
+    rng = random.Random(42)
+
+    accounts = make_accounts(account_count, rng)
+    started = time.perf_counter()
+    index = AccountIndex(accounts)
+    print(f"{account_count} accounts indexed in {time.perf_counter() - started:.2f} s")
+
+    def scan_names(matches):
+        return [number for _, number in heapq.nsmallest(limit, (
+            (fold_name(account.name), account.account_number)
+            for account in accounts if matches(fold_name(account.name))
+        ))]
+
+    def scan_balances(minimum, maximum):
+        return [number for _, number in heapq.nsmallest(limit, (
+            (account.balance, account.account_number)
+            for account in accounts if minimum <= account.balance <= maximum
+        ))]
+
+    prefixes = [(rng.choice(FIRST_NAMES)[:3] + rng.choice("aeiorn"),) for _ in range(query_count)]
+    fragments = [(rng.choice(LAST_NAMES)[1:5],) for _ in range(query_count)]
+    ranges = []
+    for _ in range(query_count):
+        low = rng.randrange(10_000_000)
+        ranges.append((low, low + rng.randrange(1, 10_000)))
+    tops = [(10,)] * query_count
+
+    results = [
+        compare("name prefix", prefixes,
+                lambda prefix: index.find_by_name_prefix(prefix, 0, limit),
+                lambda prefix: scan_names(lambda name: name.startswith(prefix.casefold()))),
+        compare("name substring", fragments,
+                lambda text: index.search_names(text, limit),
+                lambda text: scan_names(lambda name: text.casefold() in name)),
+        compare("balance range", ranges,
+                lambda low, high: index.find_by_balance(low, high, 0, limit),
+                scan_balances),
+        compare("top 10 balances", tops,
+                index.top_balances,
+                lambda count: [number for _, number in heapq.nlargest(
+                    count, ((account.balance, account.account_number) for account in accounts))]),
+    ]
+
+    updates = 100_000
+    changed = [account._replace(balance=rng.randrange(10_000_000))
+               for account in rng.sample(accounts, min(updates, account_count))]
+    started = time.perf_counter()
+    for account in changed:
+        index.update_balance(account)
+    elapsed = time.perf_counter() - started
+    print(f"balance update   {elapsed / len(changed) * 1e6:9.1f} us per deposit or withdrawal")
+
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
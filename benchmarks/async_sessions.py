@@ -0,0 +1,106 @@
+"""
+Many concurrent sessions on AsyncBankingSystem.
+
+Thousands of coroutines, each standing for one client session, log in and
+make deposits and withdrawals on a shared set of accounts through the
+asyncio facade. The run reports throughput and the average number of
+operations folded into each group commit, then reconciles every running
+balance and reloads the data to check that storage matches memory.
+
+Usage:
+    python -m benchmarks.async_sessions [sessions] [operations per session]
+"""
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from benchmarks.concurrency_stress import make_storage, snapshot
+from services.async_banking_system import AsyncBankingSystem
+from services.banking_system import BankingSystem
+from services.reconciliation import reconcile_ledger
+
+ACCOUNT_COUNT = 64
+
+async def session(bank, account_numbers, operations, seed):
+    """
+    Run one client session.
+
+    Args:
+        bank (AsyncBankingSystem): Facade to use
+        account_numbers (list): Accounts to pick from
+        operations (int): Number of deposits and withdrawals
+        seed (int): Random seed
+
+    Returns:
+        int: Number of successful operations
+    """
+    rng = random.Random(seed)
+    account_number = rng.choice(account_numbers)
+    if not await bank.login(account_number, "secret"):
+        return 0
+    done = 0
+    for _ in range(operations):
+        amount = rng.randint(1, 10000)
+        if rng.random() < 0.5:
+            done += await bank.deposit(account_number, amount)
+        else:
+            done += await bank.withdraw(account_number, amount)
+    await bank.get_transaction_page(account_number)
+    return done
+
+async def run_sessions(backend, background, sessions, operations):
+    """
+    Run the sessions against one configuration and verify the result.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+        background (bool): Use the background persistence thread
+        sessions (int): Number of concurrent sessions
+        operations (int): Operations per session
+
+    Returns:
+        bool: True if all checks passed
+    """
+    directory = tempfile.mkdtemp()
+    system = BankingSystem(make_storage(backend, directory), background)
+    bank = AsyncBankingSystem(system)
+    await bank.start()
+    account_numbers = await asyncio.gather(*(
+        bank.create_account(f"user{i}", "secret") for i in range(ACCOUNT_COUNT)))
+
+    started = time.perf_counter()
+    commits = bank.commits
+    done = await asyncio.gather(*(
+        session(bank, account_numbers, operations, seed) for seed in range(sessions)))
+    elapsed = time.perf_counter() - started
+    commits = bank.commits - commits
+    await bank.close()
+
+    in_memory = snapshot(system.accounts)
+    mismatches = reconcile_ledger(system.accounts)
+    recorded = sum(len(history) for _, history in in_memory.values())
+    system.close()
+    reloaded = BankingSystem(make_storage(backend, directory))
+    persisted = snapshot(reloaded.accounts)
+    reloaded.close()
+
+    passed = not mismatches and recorded == sum(done) and persisted == in_memory
+    mode = "background" if background else "inline"
+    print(f"{backend:6} {mode:10} {sum(done):7} transactions {sum(done) / elapsed:10.0f} ops/s "
+          f"{sessions * operations / max(commits, 1):7.1f} ops/commit  "
+          f"{'OK' if passed else 'FAILED'}")
+    return passed
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    results = [
+        asyncio.run(run_sessions(backend, background, sessions, operations))
+        for backend in ('json', 'sqlite')
+        for background in (False, True)
+    ]
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Check and time the append-only admin audit log.
+
+Appends synthetic admin logs spread over several months into small
+rotating segments, compares query results against a plain filter over all
+logs, checks that a torn final line is cut off on reopen, and times
+appends and narrow time range queries against a full read.
+
+Usage:
+    python -m benchmarks.audit_log [logs]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from models.admin_log import AdminLog
+from storage.audit_log import AuditLog
+
+ADMINS = ('alice', 'bob', 'carol')
+ACTIONS = ('Login', 'Remove User', 'View Transactions')
+
+def generate(count, seed=3):
+    """
+    Generate chronological admin logs.
+
+    Args:
+        count (int): Number of logs
+        seed (int, optional): Random seed
+
+    Returns:
+        list: AdminLog entries in chronological order
+    """
+    rng = random.Random(seed)
+    moment = datetime(2024, 1, 1)
+    logs = []
+    for i in range(count):
+        moment += timedelta(seconds=rng.randint(0, 600))
+        logs.append(AdminLog(rng.choice(ADMINS), rng.choice(ACTIONS), f"detail {i}",
+                             moment.strftime("%Y-%m-%d %H:%M:%S")))
+    return logs
+
+def matches(log, admin_username, action, start, end):
+    """
+    Check a log against query conditions without using the audit log.
+
+    Returns:
+        bool: True if the log meets every given condition
+    """
+    return ((admin_username is None or log.admin_username == admin_username)
+            and (action is None or log.action == action)
+            and (start is None or log.timestamp >= start)
+            and (end is None or log.timestamp <= end))
+
+def check_queries(audit_log, logs, rng, rounds=200):
+    """
+    Compare random queries with a plain filter over all logs.
+
+    Args:
+        audit_log (AuditLog): Audit log holding the logs
+        logs (list): AdminLog entries in chronological order
+        rng (random.Random): Source of the query conditions
+        rounds (int, optional): Number of queries
+
+    Returns:
+        bool: True if every query returned the expected logs
+    """
+    for _ in range(rounds):
+        first, last = sorted(rng.sample(range(len(logs)), 2))
+        admin_username = rng.choice(ADMINS + (None,))
+        action = rng.choice(ACTIONS + (None,))
+        start = rng.choice((logs[first].timestamp, None))
+        end = rng.choice((logs[last].timestamp, None))
+        limit = rng.choice((None, 1, 50))
+        expected = [log.to_dict() for log in logs
+                    if matches(log, admin_username, action, start, end)]
+        if limit is not None:
+            expected = expected[-limit:]
+        found = audit_log.query(admin_username, action, start, end, limit)
+        if [log.to_dict() for log in found] != expected:
+            return False
+    return True
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    directory = os.path.join(tempfile.mkdtemp(), 'admin_logs')
+    logs = generate(count)
+    audit_log = AuditLog(directory, max_bytes=256 * 1024, max_age=14 * 24 * 60 * 60)
+
+    started = time.perf_counter()
+    for log in logs[:1000]:
+        audit_log.append(log)
+    append_rate = 1000 / (time.perf_counter() - started)
+    audit_log.append_many(logs[1000:])
+    audit_log.close()
+
+    with open(audit_log.segments[-1].path, 'ab') as file:
+        file.write(b'{"admin_username": "torn')
+    reopened = AuditLog(directory, max_bytes=256 * 1024, max_age=14 * 24 * 60 * 60)
+    torn_ok = sum(segment.count for segment in reopened.segments) == count
+    reopened.append(AdminLog('alice', 'Login', 'after reopen', logs[-1].timestamp))
+    logs.append(reopened.query(limit=1)[0])
+    queries_ok = check_queries(reopened, logs, random.Random(5))
+
+    started = time.perf_counter()
+    everything = reopened.query()
+    full_time = time.perf_counter() - started
+    middle = logs[len(logs) // 2].timestamp
+    started = time.perf_counter()
+    for _ in range(100):
+        reopened.query(start=middle, end=middle[:10] + " 23:59:59")
+    range_time = (time.perf_counter() - started) / 100
+    reopened.close()
+
+    print(f"segments: {len(reopened.segments)}, logs: {len(everything)}")
+    print(f"appends (fsync each): {append_rate:10.0f} logs/s")
+    print(f"full read:            {full_time * 1000:10.2f} ms")
+    print(f"one-day range query:  {range_time * 1000:10.2f} ms")
+    print(f"torn line recovery    {'OK' if torn_ok else 'FAILED'}")
+    print(f"query results         {'OK' if queries_ok else 'FAILED'}")
+    sys.exit(0 if torn_ok and queries_ok else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Measure posting throughput of individual operations and of a batch import.
+
+Usage:
+    python -m benchmarks.batch_posting [postings] [accounts]
+"""
+import io
+import random
+import sys
+import tempfile
+import time
+from services.banking_system import BankingSystem
+from services.batch_posting import import_postings
+from benchmarks.concurrency_stress import make_storage
+
+def make_bank(backend, directory, account_count):
+    """
+    Create a banking system with empty accounts in a scratch directory.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+        directory (str): Directory for the data files
+        account_count (int): Number of accounts to create
+
+    Returns:
+        tuple: BankingSystem and the list of account numbers
+    """
+    bank = BankingSystem(make_storage(backend, directory))
+    return bank, [bank.create_account(f"user{i}", "secret") for i in range(account_count)]
+
+def generate_csv(account_numbers, count, seed=7):
+    """
+    Generate a posting file with a mix of deposits and withdrawals.
+
+    Args:
+        account_numbers (list): Accounts to post to
+        count (int): Number of postings
+        seed (int, optional): Random seed
+
+    Returns:
+        str: CSV posting file
+    """
+    rng = random.Random(seed)
+    lines = ["account_number,type,amount"]
+    for _ in range(count):
+        tx_type = 'deposit' if rng.random() < 0.6 else 'withdrawal'
+        lines.append(f"{rng.choice(account_numbers)},{tx_type},{rng.randint(1, 100000) / 100:.2f}")
+    return "\n".join(lines) + "\n"
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    account_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    single_count = min(count, 2000)
+
+    for backend in ('json', 'sqlite'):
+        bank, account_numbers = make_bank(backend, tempfile.mkdtemp(), account_count)
+        started = time.perf_counter()
+        for i in range(single_count):
+            bank.deposit(account_numbers[i % account_count], 100)
+        single_rate = single_count / (time.perf_counter() - started)
+
+        posting_file = generate_csv(account_numbers, count)
+        started = time.perf_counter()
+        applied, rejections = import_postings(bank, io.StringIO(posting_file), 'csv')
+        batch_rate = count / (time.perf_counter() - started)
+        bank.close()
+
+        print(f"{backend:6} single deposits: {single_rate:10.0f} postings/s   "
+              f"batch import: {batch_rate:10.0f} postings/s "
+              f"({applied} applied, {len(rejections)} rejected)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Multi-threaded stress test for BankingSystem.
+
+Many threads deposit into and withdraw from a small set of shared
+accounts. Afterwards every running balance is reconciled, the number of
+recorded transactions is compared with the number of successful
+operations, and the data is reloaded from storage to check that the
+persisted state matches memory. Runs against both storage backends, with
+writes on the calling threads and on the background persistence thread,
+and once more in the background with full snapshots saved meanwhile.
+
+Usage:
+    python -m benchmarks.concurrency_stress [threads] [operations per thread]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from services.banking_system import BankingSystem
+from services.reconciliation import reconcile_ledger
+from storage.json_storage import JsonStorage
+from storage.sqlite_storage import SqliteStorage
+
+ACCOUNT_COUNT = 8
+
+def make_storage(backend, directory):
+    """
+    Create a storage backend writing into a scratch directory.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+        directory (str): Directory for the data files
+
+    Returns:
+        StorageBackend: New storage backend
+    """
+    if backend == 'json':
+        return JsonStorage(
+            os.path.join(directory, 'bank_data.json'),
+            os.path.join(directory, 'bank_journal.jsonl'),
+            os.path.join(directory, 'admin_data.json'),
+            os.path.join(directory, 'admin_logs.json'),
+            checkpoint_interval=500
+        )
+    return SqliteStorage(os.path.join(directory, 'bank.db'))
+
+def snapshot(accounts):
+    """
+    Capture balances and histories for comparison.
+
+    Args:
+        accounts (dict): Account number to BankAccount mapping
+
+    Returns:
+        dict: Account number to (balance, transaction list)
+    """
+    return {
+        acc_num: (account.balance, list(account.transactions))
+        for acc_num, account in accounts.items()
+    }
+
+def run(backend, background, threads, operations, saves=0):
+    """
+    Run one stress scenario and verify consistency.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+        background (bool): Use the background persistence thread
+        threads (int): Number of worker threads
+        operations (int): Operations per thread
+        saves (int, optional): Full snapshots saved by another thread
+            while the workers run
+
+    Returns:
+        bool: True if all checks passed
+    """
+    directory = tempfile.mkdtemp()
+    if saves:
+        # Reopen so the histories are loaded on demand, as after a restart
+        bank = BankingSystem(make_storage(backend, directory))
+        for i in range(ACCOUNT_COUNT):
+            bank.create_account(f"user{i}", "secret")
+        bank.close()
+        bank = BankingSystem(make_storage(backend, directory), background)
+        account_numbers = list(bank.accounts)
+    else:
+        bank = BankingSystem(make_storage(backend, directory), background)
+        account_numbers = [bank.create_account(f"user{i}", "secret") for i in range(ACCOUNT_COUNT)]
+    successes = [0] * threads
+
+    def worker(index):
+        rng = random.Random(index)
+        for _ in range(operations):
+            account_number = rng.choice(account_numbers)
+            amount = rng.randint(1, 10000)
+            if rng.random() < 0.5:
+                done = bank.deposit(account_number, amount)
+            else:
+                done = bank.withdraw(account_number, amount)
+            successes[index] += done
+
+    def saver():
+        for _ in range(saves):
+            bank.save_data()
+            bank.flush()
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    if saves:
+        workers.append(threading.Thread(target=saver))
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    in_memory = snapshot(bank.accounts)
+    mismatches = reconcile_ledger(bank.accounts)
+    recorded = sum(len(history) for _, history in in_memory.values())
+    bank.close()
+
+    reloaded = BankingSystem(make_storage(backend, directory))
+    persisted = snapshot(reloaded.accounts)
+    reloaded.close()
+
+    passed = not mismatches and recorded == sum(successes) and persisted == in_memory
+    mode = ("background" if background else "inline") + (" + saves" if saves else "")
+    print(f"{backend:6} {mode:18} {sum(successes):7} transactions "
+          f"{sum(successes) / elapsed:10.0f} ops/s  {'OK' if passed else 'FAILED'}")
+    return passed
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    results = [
+        run(backend, background, threads, operations)
+        for backend in ('json', 'sqlite')
+        for background in (False, True)
+    ] + [run(backend, True, threads, operations, saves=10) for backend in ('json', 'sqlite')]
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Throughput of deposits at various group commit windows.
+
+Worker threads make deposits and withdrawals on shared accounts while the
+persistence thread folds their transactions into group commits. Each
+window is measured with plain and with durable acknowledgements, next to
+inline commits (one storage write per operation) as the baseline. After
+every run the data is reloaded to check that storage matches memory.
+
+Usage:
+    python -m benchmarks.group_commit [--threads 32] [--operations 200]
+        [--windows 0 1 2 5 10] [--max-ops 256] [--backend json|sqlite]
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from benchmarks.concurrency_stress import make_storage, snapshot
+from services.banking_system import BankingSystem
+
+ACCOUNT_COUNT = 64
+
+def run(backend, window_ms, durable, threads, operations, max_ops):
+    """
+    Measure one configuration.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+        window_ms (float): Group commit window, None for inline commits
+        durable (bool): Acknowledge only after an fsync
+        threads (int): Number of worker threads
+        operations (int): Operations per thread
+        max_ops (int): Maximum transactions per group commit
+
+    Returns:
+        bool: True if the reloaded data matched memory
+    """
+    directory = tempfile.mkdtemp()
+    if window_ms is None:
+        bank = BankingSystem(make_storage(backend, directory), durable_ack=durable)
+    else:
+        bank = BankingSystem(make_storage(backend, directory), True, window_ms, max_ops, durable)
+    account_numbers = [bank.create_account(f"user{i}", "secret") for i in range(ACCOUNT_COUNT)]
+    latencies = [[] for _ in range(threads)]
+
+    def worker(index):
+        rng = random.Random(index)
+        for _ in range(operations):
+            account_number = rng.choice(account_numbers)
+            amount = rng.randint(1, 10000)
+            started = time.perf_counter()
+            if rng.random() < 0.6:
+                bank.deposit(account_number, amount)
+            else:
+                bank.withdraw(account_number, amount)
+            latencies[index].append(time.perf_counter() - started)
+
+    commits = bank.writer.commits if bank.writer else 0
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = threads * operations
+    commits = bank.writer.commits - commits if bank.writer else total
+    in_memory = snapshot(bank.accounts)
+    bank.close()
+    reloaded = BankingSystem(make_storage(backend, directory))
+    passed = snapshot(reloaded.accounts) == in_memory
+    reloaded.close()
+
+    ordered = sorted(latency for thread in latencies for latency in thread)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    window = "inline" if window_ms is None else f"{window_ms:g} ms"
+    # A 0 ms window acknowledges transactions once queued unless durable
+    ack = "durable" if durable else "queued" if window_ms == 0 else "written"
+    print(f"{window:>8} {ack:8} {total / elapsed:10.0f} ops/s "
+          f"{total / max(commits, 1):7.1f} ops/commit  p99 {p99 * 1000:7.2f} ms  "
+          f"{'OK' if passed else 'FAILED'}")
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ops/sec at various commit windows.")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--windows", type=float, nargs='+', default=[0, 1, 2, 5, 10])
+    parser.add_argument("--max-ops", type=int, default=256)
+    parser.add_argument("--backend", choices=('json', 'sqlite'), default='json')
+    args = parser.parse_args()
+
+    print(f"{args.backend}, {args.threads} threads x {args.operations} operations")
+    results = []
+    for durable in (False, True):
+        for window_ms in [None] + args.windows:
+            results.append(run(args.backend, window_ms, durable, args.threads,
+                               args.operations, args.max_ops))
+    raise SystemExit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Load generator for the headless HTTP API.
+
+Opens keep-alive connections, sends a mix of deposits, withdrawals and
+history reads with a configurable number of requests pipelined per
+connection, and reports throughput, latency percentiles and response
+status counts. Requests authenticate with a session token from
+POST /login, or with --auth basic with the account password on every
+request. Unless --port is given, a server on scratch storage is started in
+a separate process first.
+
+Usage:
+    python -m benchmarks.http_load [--connections 32] [--pipeline 4]
+        [--duration 10] [--accounts 200] [--auth token|basic]
+        [--backend json|sqlite] [--host 127.0.0.1 --port 8080]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import random
+import tempfile
+import time
+from collections import Counter
+
+def run_server(backend, directory, ready):
+    """
+    Serve the API on scratch storage until the process is terminated.
+
+    Args:
+        backend (str): 'json' or 'sqlite'
+        directory (str): Directory for the data files
+        ready (multiprocessing.Queue): Receives the port once listening
+    """
+    from api.bank_api import BankApi
+    from api.http_server import HttpServer
+    from benchmarks.concurrency_stress import make_storage
+    from services.admin_service import AdminService
+    from services.banking_system import BankingSystem
+
+    bank = BankingSystem(make_storage(backend, directory))
+    server = HttpServer(BankApi(bank, AdminService(bank)).handle, '127.0.0.1', 0)
+
+    async def serve():
+        await server.start()
+        ready.put(server.port)
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+def basic_auth(username, password):
+    """
+    Build a Basic Authorization header value.
+
+    Args:
+        username (str): User name
+        password (str): Password
+
+    Returns:
+        str: Header value
+    """
+    return "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+
+def build_request(method, path, payload=None, authorization=None):
+    """
+    Encode an HTTP/1.1 request.
+
+    Args:
+        method (str): Request method
+        path (str): Request target
+        payload (dict, optional): JSON body
+        authorization (str, optional): Authorization header value
+
+    Returns:
+        bytes: Complete request
+    """
+    body = json.dumps(payload).encode() if payload is not None else b""
+    lines = [f"{method} {path} HTTP/1.1", "Host: bench", f"Content-Length: {len(body)}"]
+    if authorization:
+        lines.append(f"Authorization: {authorization}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+async def read_response(reader):
+    """
+    Read one HTTP response.
+
+    Args:
+        reader (asyncio.StreamReader): Connection to read from
+
+    Returns:
+        tuple: Status code and decoded JSON body
+    """
+    head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1').split("\r\n")
+    length = 0
+    for line in head[1:]:
+        name, _, value = line.partition(":")
+        if name.lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length)
+    return int(head[0].split(" ")[1]), json.loads(body) if body else None
+
+async def setup_accounts(host, port, count, auth):
+    """
+    Create funded accounts through the API.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        count (int): Number of accounts
+        auth (str): 'token' to log in for a session token, 'basic' to send
+            the password with every request
+
+    Returns:
+        list: (account number, Authorization header value) pairs
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    accounts = []
+    for i in range(count):
+        password = f"secret{i}"
+        writer.write(build_request('POST', '/accounts', {'name': f"load{i}", 'password': password}))
+        status, body = await read_response(reader)
+        account_number = body['account_number']
+        authorization = basic_auth(account_number, password)
+        if auth == 'token':
+            writer.write(build_request('POST', '/login', {'account_number': account_number,
+                                                          'password': password}))
+            status, body = await read_response(reader)
+            authorization = f"Bearer {body['token']}"
+        writer.write(build_request('POST', f"/accounts/{account_number}/deposit",
+                                   {'amount': "1000.00"}, authorization))
+        await read_response(reader)
+        accounts.append((account_number, authorization))
+    writer.close()
+    return accounts
+
+def random_request(rng, accounts):
+    """
+    Pick a request of the load mix.
+
+    Args:
+        rng (random.Random): Random source
+        accounts (list): (account number, Authorization header value) pairs
+
+    Returns:
+        bytes: Complete request
+    """
+    account_number, authorization = rng.choice(accounts)
+    roll = rng.random()
+    if roll < 0.45:
+        return build_request('POST', f"/accounts/{account_number}/deposit",
+                             {'amount': f"{rng.randint(1, 10000) / 100:.2f}"}, authorization)
+    if roll < 0.8:
+        return build_request('POST', f"/accounts/{account_number}/withdraw",
+                             {'amount': f"{rng.randint(1, 10000) / 100:.2f}"}, authorization)
+    return build_request('GET', f"/accounts/{account_number}/transactions?limit=20",
+                         authorization=authorization)
+
+async def client(host, port, accounts, pipeline, deadline, latencies, statuses, seed):
+    """
+    Send batches of pipelined requests on one connection until the deadline.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        accounts (list): (account number, Authorization header value) pairs
+        pipeline (int): Requests sent before reading responses
+        deadline (float): perf_counter value to stop at
+        latencies (list): Receives request latencies in seconds
+        statuses (Counter): Receives response status counts
+        seed (int): Random seed
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    while time.perf_counter() < deadline:
+        sent = time.perf_counter()
+        writer.write(b"".join(random_request(rng, accounts) for _ in range(pipeline)))
+        for _ in range(pipeline):
+            status, _ = await read_response(reader)
+            latencies.append(time.perf_counter() - sent)
+            statuses[status] += 1
+    writer.close()
+
+def percentile(ordered, fraction):
+    """
+    Get a percentile of sorted values.
+
+    Args:
+        ordered (list): Values in ascending order
+        fraction (float): Percentile as a fraction, such as 0.99
+
+    Returns:
+        float: Value at the percentile
+    """
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def run_load(args, host, port):
+    """
+    Run the load test against a server.
+
+    Args:
+        args (argparse.Namespace): Command line options
+        host (str): Server host
+        port (int): Server port
+    """
+    accounts = await setup_accounts(host, port, args.accounts, args.auth)
+    latencies = []
+    statuses = Counter()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, accounts, args.pipeline, started + args.duration,
+               latencies, statuses, seed)
+        for seed in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    print(f"{len(ordered)} requests in {elapsed:.1f} s over {args.connections} connections, "
+          f"pipeline depth {args.pipeline}")
+    print(f"throughput: {len(ordered) / elapsed:10.0f} requests/s")
+    print("latency ms: " + "  ".join(
+        f"p{int(fraction * 100)} {percentile(ordered, fraction) * 1000:.2f}"
+        for fraction in (0.5, 0.9, 0.99)
+    ) + f"  max {ordered[-1] * 1000:.2f}")
+    print("statuses:   " + "  ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure HTTP API throughput and latency.")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--pipeline", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--auth", choices=('token', 'basic'), default='token')
+    parser.add_argument("--backend", choices=('json', 'sqlite'), default='json')
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, help="use a running server instead of starting one")
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        ready = multiprocessing.Queue()
+        server = multiprocessing.Process(
+            target=run_server, args=(args.backend, tempfile.mkdtemp(), ready), daemon=True)
+        server.start()
+        port = ready.get(timeout=30)
+    try:
+        asyncio.run(run_load(args, args.host, port))
+    finally:
+        if server:
+            server.terminate()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Ledger analytics with NumPy columns against a Python loop.
+
+A synthetic ledger of equally long account histories is copied into
+LedgerAnalytics, then totals per transaction type, daily volumes, deposit
+and withdrawal amount distributions, the average balance and the largest
+depositors are computed from the columns and by looping over every
+account's transaction dictionaries, as admins had to before. Reports the
+time of both, the cost of appending a new transaction to the columns, and
+checks that both give the same answers.
+
+Usage:
+    python -m benchmarks.ledger_analytics [transactions] [accounts]
+"""
+import heapq
+import resource
+import sys
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from models.transaction_store import (
+    TransactionStore, TRANSACTION_TYPES, TYPE_CODES, epoch_to_date, parse_date_bound
+)
+from services.analytics import LedgerAnalytics, np
+
+# Only the fields the analytics read, so millions of transactions fit in memory
+Account = namedtuple('Account', 'account_number balance transactions')
+
+# Accounts in the largest depositors query
+TOP_COUNT = 10
+
+def make_ledger(transaction_count, account_count, seed=11):
+    """
+    Generate accounts with a year of deposits and withdrawals each.
+
+    Args:
+        transaction_count (int): Total number of transactions
+        account_count (int): Number of accounts
+        seed (int, optional): Random seed
+
+    Returns:
+        list: Account tuples holding TransactionStore histories
+    """
+    rng = np.random.default_rng(seed)
+    length = transaction_count // account_count
+    shape = (account_count, length)
+    year_start = parse_date_bound("2024-01-01")
+    types = np.where(rng.random(shape) < 0.6, TYPE_CODES['deposit'],
+                     TYPE_CODES['withdrawal']).astype(np.int8)
+    amounts = rng.integers(1, 100_000, shape, dtype=np.int64)
+    amounts[types == TYPE_CODES['withdrawal']] //= 2
+    timestamps = np.sort(rng.integers(year_start, year_start + 365 * 86400, shape,
+                                      dtype=np.int64), axis=1)
+    balances = np.cumsum(np.where(types == TYPE_CODES['deposit'], amounts, -amounts), axis=1)
+
+    accounts = []
+    for row in range(account_count):
+        store = TransactionStore()
+        store.types.frombytes(types[row].tobytes())
+        store.amounts.frombytes(amounts[row].tobytes())
+        store.timestamps.frombytes(timestamps[row].tobytes())
+        store.balances.frombytes(balances[row].tobytes())
+        accounts.append(Account(str(1000 + row), int(balances[row, -1]), store))
+    return accounts
+
+def loop_aggregates(accounts, edges):
+    """
+    Compute every aggregate by looping over all transaction dictionaries.
+
+    Args:
+        accounts (list): Account tuples
+        edges (dict): Transaction type to histogram bin edges
+
+    Returns:
+        dict: The aggregates, in the shape compared with the analytics
+    """
+    totals = {tx_type: {'count': 0, 'total': 0} for tx_type in TRANSACTION_TYPES}
+    days = {}
+    counts = {tx_type: [0] * (len(bins) - 1) for tx_type, bins in edges.items()}
+    deposits = {}
+    for account in accounts:
+        deposited = 0
+        for transaction in account.transactions:
+            tx_type, amount = transaction['type'], transaction['amount']
+            totals[tx_type]['count'] += 1
+            totals[tx_type]['total'] += amount
+            day = days.setdefault(transaction['date'][:10], {
+                other: {'count': 0, 'total': 0} for other in TRANSACTION_TYPES})
+            day[tx_type]['count'] += 1
+            day[tx_type]['total'] += amount
+            if tx_type in counts:
+                counts[tx_type][bisect_right(edges[tx_type], amount) - 1] += 1
+            if tx_type == 'deposit':
+                deposited += amount
+        deposits[account.account_number] = deposited
+    return {
+        'totals': totals,
+        'days': [{'start': f"{day} 00:00:00", **days[day]} for day in sorted(days)],
+        'distributions': counts,
+        'average': sum(account.balance for account in accounts) / len(accounts),
+        'top': heapq.nlargest(TOP_COUNT, deposits.items(), key=lambda item: item[1])
+    }
+
+def column_aggregates(analytics):
+    """
+    Compute every aggregate from the analytics columns.
+
+    Args:
+        analytics (LedgerAnalytics): Analytics holding the ledger
+
+    Returns:
+        dict: The aggregates, in the shape compared with the loop
+    """
+    return {
+        'totals': analytics.totals_by_type(),
+        'days': analytics.volume_by_period(),
+        'distributions': {tx_type: [count for _, _, count in
+                                    analytics.amount_distribution(tx_type)]
+                          for tx_type in ('deposit', 'withdrawal')},
+        'average': analytics.average_balance(),
+        'top': analytics.top_accounts('deposit', TOP_COUNT)
+    }
+
+def main():
+    transaction_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    account_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    started = time.perf_counter()
+    accounts = make_ledger(transaction_count, account_count)
+    print(f"{len(accounts)} accounts, {sum(len(a.transactions) for a in accounts)} "
+          f"transactions generated in {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    analytics = LedgerAnalytics()
+    for account in accounts:
+        analytics.add_account(account, account.transactions)
+    print(f"columns built in {time.perf_counter() - started:.2f} s, "
+          f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    started = time.perf_counter()
+    columns = column_aggregates(analytics)
+    column_time = time.perf_counter() - started
+
+    # The loop bins amounts on the same edges so both histograms can be compared
+    edges = {}
+    for tx_type in ('deposit', 'withdrawal'):
+        bins = analytics.amount_distribution(tx_type)
+        edges[tx_type] = [low for low, _, _ in bins] + [bins[-1][1]]
+    started = time.perf_counter()
+    looped = loop_aggregates(accounts, edges)
+    loop_time = time.perf_counter() - started
+
+    results = []
+    for name in columns:
+        same = (abs(columns[name] - looped[name]) < 1e-6 if name == 'average'
+                else columns[name] == looped[name])
+        results.append(same)
+        print(f"{name:<14} {'OK' if same else 'MISMATCH'}")
+    print(f"all aggregates: columns {column_time:.2f} s   Python loop {loop_time:.1f} s"
+          f"   {loop_time / column_time:.0f}x")
+
+    appends = 100_000
+    date = epoch_to_date(parse_date_bound("2025-01-01"))
+    started = time.perf_counter()
+    for position in range(appends):
+        account = accounts[position % len(accounts)]
+        analytics.record([(account, {'type': 'deposit', 'amount': 100, 'balance': 0,
+                                     'date': date})])
+    elapsed = time.perf_counter() - started
+    print(f"incremental append {elapsed / appends * 1e6:.1f} us per transaction")
+
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
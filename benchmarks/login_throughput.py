@@ -0,0 +1,99 @@
+"""
+Login throughput with and without the credential cache.
+
+Accounts are created with hashed passwords, then logged into repeatedly
+from several threads, once with the cache disabled so every login derives
+the scrypt key, and once with the default cache. Also checks that a
+plaintext password from an earlier version is replaced by a hash on its
+first successful login and survives a reload.
+
+Usage:
+    python -m benchmarks.login_throughput [accounts] [logins per thread] [threads]
+"""
+import sys
+import tempfile
+import threading
+import time
+from benchmarks.concurrency_stress import make_storage
+from models.bank_account import BankAccount
+from services.banking_system import BankingSystem
+from utils.credential_cache import CredentialCache
+from utils.passwords import parse_hash
+
+def measure(bank, passwords, logins, threads):
+    """
+    Log in repeatedly from several threads.
+
+    Args:
+        bank (BankingSystem): System to log into
+        passwords (list): (account number, password) pairs to cycle through
+        logins (int): Logins per thread
+        threads (int): Number of threads
+
+    Returns:
+        tuple: Logins per second and number of failed logins
+    """
+    failures = [0] * threads
+
+    def worker(index):
+        for i in range(logins):
+            account_number, password = passwords[(index + i) % len(passwords)]
+            if bank.login(account_number, password) is None:
+                failures[index] += 1
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * logins / (time.perf_counter() - started), sum(failures)
+
+def check_upgrade(directory):
+    """
+    Check the transparent upgrade of a plaintext password.
+
+    Args:
+        directory (str): Directory for the data files
+
+    Returns:
+        bool: True if the password was hashed and persisted
+    """
+    bank = BankingSystem(make_storage('json', directory))
+    legacy = BankAccount('9000', "legacy", "plaintext")
+    bank.accounts['9000'] = legacy
+    bank.storage.save_account(legacy)
+    upgraded = (bank.login('9000', "wrong") is None
+                and bank.login('9000', "plaintext") is legacy
+                and parse_hash(legacy.password) is not None)
+    bank.close()
+    reloaded = BankingSystem(make_storage('json', directory))
+    upgraded = upgraded and reloaded.login('9000', "plaintext") is not None
+    reloaded.close()
+    return upgraded
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    bank = BankingSystem(make_storage('json', tempfile.mkdtemp()))
+    passwords = [(bank.create_account(f"user{i}", f"secret{i}"), f"secret{i}")
+                 for i in range(account_count)]
+    cache = bank.credentials
+
+    bank.credentials = CredentialCache(max_entries=0)
+    uncached, failed = measure(bank, passwords, logins, threads)
+    print(f"without cache {uncached:12.0f} logins/s  {failed} failed")
+
+    bank.credentials = cache
+    cached, failed = measure(bank, passwords, logins * 1000, threads)
+    print(f"with cache    {cached:12.0f} logins/s  {failed} failed")
+    bank.close()
+
+    upgraded = check_upgrade(tempfile.mkdtemp())
+    print(f"plaintext upgrade {'OK' if upgraded else 'FAILED'}")
+    sys.exit(0 if upgraded and not failed else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
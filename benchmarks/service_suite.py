@@ -0,0 +1,238 @@
+"""
+Service layer benchmark suite with regression comparison.
+
+The run command writes a synthetic bank to scratch storage, opens it with
+BankingSystem and AdminService, and measures the operations everything
+else is built on: opening the bank, save_data, deposit, withdraw, login
+and log_action. Each operation is timed call by call, and reported with its
+latency percentiles, throughput and the peak memory of the process once
+it finished. The results can be written as JSON.
+
+The compare command reads two such JSON files and flags every metric
+that got worse by more than a threshold, exiting with status 1 if any
+did, so it can gate a change in a script.
+
+Usage:
+    python -m benchmarks.service_suite run [--backend json|sqlite]
+        [--accounts N] [--transactions N] [--admin-logs N] [--operations N]
+        [--repeat N] [--seed N] [--output results.json]
+    python -m benchmarks.service_suite compare baseline.json current.json
+        [--threshold 0.25]
+"""
+import argparse
+import json
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from benchmarks.concurrency_stress import make_storage
+from benchmarks.synthetic_data import SYNTHETIC_PASSWORD, generate
+from services.admin_service import AdminService
+from services.banking_system import BankingSystem
+
+# Accounts logged into by the login benchmark; the first login of each
+# derives the key, later ones hit the credential cache
+LOGIN_ACCOUNTS = 20
+
+# Latency percentiles reported for every operation
+PERCENTILES = (50, 90, 99)
+
+# Metrics compared between runs, with True where larger values are better
+COMPARED_METRICS = {'p50_ms': False, 'p90_ms': False, 'p99_ms': False,
+                    'ops_per_second': True, 'peak_rss_mb': False}
+
+def percentile(samples, percent):
+    """
+    Get a percentile of sorted samples by the nearest rank method.
+
+    Args:
+        samples (list): Samples in ascending order
+        percent (float): Percentile between 0 and 100
+
+    Returns:
+        float: Smallest sample with at least percent of the samples at or
+            below it
+    """
+    rank = max(1, -(-len(samples) * percent // 100))
+    return samples[int(rank) - 1]
+
+def timed(operation, calls):
+    """
+    Call an operation repeatedly, timing each call.
+
+    Args:
+        operation (function): Called with the index of each call
+        calls (int): Number of calls
+
+    Returns:
+        dict: Number of calls, throughput, latency percentiles, mean and
+            maximum in milliseconds, and peak memory in MB
+    """
+    samples = []
+    clock = time.perf_counter
+    started = clock()
+    for index in range(calls):
+        call_started = clock()
+        operation(index)
+        samples.append(clock() - call_started)
+    elapsed = clock() - started
+    samples.sort()
+    result = {'calls': calls, 'ops_per_second': calls / elapsed if elapsed else 0.0}
+    for percent in PERCENTILES:
+        result[f'p{percent}_ms'] = percentile(samples, percent) * 1e3
+    result['mean_ms'] = sum(samples) / calls * 1e3
+    result['max_ms'] = samples[-1] * 1e3
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+def run_suite(args):
+    """
+    Generate a synthetic bank and benchmark the service operations on it.
+
+    Args:
+        args (argparse.Namespace): Parsed run command options
+
+    Returns:
+        dict: Configuration, environment and per-operation results
+    """
+    rng = random.Random(args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        storage = make_storage(args.backend, directory)
+        started = time.perf_counter()
+        numbers, admins = generate(storage, args.accounts, args.transactions,
+                                   args.admin_logs, args.seed)
+        storage.close()
+        print(f"synthetic data generated in {time.perf_counter() - started:.1f} s")
+
+        # Each opening starts a fresh system on the data, as a restart does
+        results['open'] = timed(
+            lambda _: BankingSystem(make_storage(args.backend, directory)).close(), args.repeat)
+        started = time.perf_counter()
+        bank = BankingSystem(make_storage(args.backend, directory))
+        admin_service = AdminService(bank)
+        print(f"opened in {time.perf_counter() - started:.2f} s")
+
+        amounts = [rng.randrange(100, 50_000) for _ in range(args.operations)]
+        accounts = [rng.choice(numbers) for _ in range(args.operations)]
+        results['deposit'] = timed(
+            lambda i: bank.deposit(accounts[i], amounts[i]), args.operations)
+        # Each withdrawal takes back one of the deposits above, so none
+        # fails for lack of funds
+        results['withdraw'] = timed(
+            lambda i: bank.withdraw(accounts[i], amounts[i]), args.operations)
+        logins = numbers[:LOGIN_ACCOUNTS]
+        results['login'] = timed(
+            lambda i: bank.login(logins[i % len(logins)], SYNTHETIC_PASSWORD), args.operations)
+        results['log_action'] = timed(
+            lambda i: admin_service.log_action(admins[i % len(admins)], "Benchmark",
+                                               f"Benchmark action {i}"),
+            args.operations)
+
+        def save(_):
+            bank.save_data()
+            bank.flush()
+        results['save_data'] = timed(save, args.repeat)
+        bank.close()
+
+    return {
+        'config': {'backend': args.backend, 'accounts': args.accounts,
+                   'transactions': args.transactions, 'admin_logs': args.admin_logs,
+                   'operations': args.operations, 'repeat': args.repeat, 'seed': args.seed},
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'machine': platform.machine()},
+        'results': results
+    }
+
+def print_results(report):
+    """
+    Print a results table.
+
+    Args:
+        report (dict): Report returned by run_suite
+    """
+    print(f"{'operation':<12}{'calls':>8}{'ops/s':>12}"
+          + "".join(f"{f'p{percent} ms':>11}" for percent in PERCENTILES)
+          + f"{'max ms':>11}{'peak MB':>10}")
+    for name, result in report['results'].items():
+        print(f"{name:<12}{result['calls']:>8}{result['ops_per_second']:>12,.0f}"
+              + "".join(f"{result[f'p{percent}_ms']:>11.3f}" for percent in PERCENTILES)
+              + f"{result['max_ms']:>11.3f}{result['peak_rss_mb']:>10.0f}")
+
+def compare_reports(baseline, current, threshold):
+    """
+    Compare two reports and print every change of the compared metrics.
+
+    Args:
+        baseline (dict): Report of the reference run
+        current (dict): Report of the run to check
+        threshold (float): Relative change beyond which a worse value is
+            a regression, 0.25 for 25%
+
+    Returns:
+        list: (operation, metric, baseline value, current value) of every
+            regression
+    """
+    if baseline['config'] != current['config']:
+        print("warning: the runs used different configurations")
+    regressions = []
+    print(f"{'operation':<12}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, before in baseline['results'].items():
+        after = current['results'].get(name)
+        if after is None:
+            print(f"{name:<12}missing from the current run")
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before[metric], after[metric]
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            regressed = worse > threshold
+            if regressed:
+                regressions.append((name, metric, old, new))
+            print(f"{name:<12}{metric:<16}{old:>12.3f}{new:>12.3f}{change:>+9.1%}"
+                  f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="Benchmark the service operations")
+    run.add_argument("--backend", choices=('json', 'sqlite'), default='sqlite')
+    run.add_argument("--accounts", type=int, default=1000)
+    run.add_argument("--transactions", type=int, default=100,
+                     help="Transactions per account")
+    run.add_argument("--admin-logs", type=int, default=10000)
+    run.add_argument("--operations", type=int, default=2000,
+                     help="Calls of each deposit, withdraw, login and log_action")
+    run.add_argument("--repeat", type=int, default=5,
+                     help="Openings of the bank and calls of save_data")
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--output", help="Write the results to this JSON file")
+    compare = commands.add_parser('compare', help="Flag regressions between two runs")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.25,
+                         help="Relative change flagged as a regression")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        report = run_suite(args)
+        print_results(report)
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump(report, file, indent=2)
+            print(f"results written to {args.output}")
+        return True
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    regressions = compare_reports(baseline, current, args.threshold)
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return not regressions
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
\ No newline at end of file
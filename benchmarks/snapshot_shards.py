@@ -0,0 +1,91 @@
+"""
+Cost of snapshot checkpoints with dirty tracking.
+
+A synthetic set of accounts is written as a full sharded snapshot, then
+one account is changed and one is removed, each followed by a checkpoint.
+Reports the time taken and the number of shard files rewritten by each
+step.
+
+Usage:
+    python -m benchmarks.snapshot_shards [accounts] [transactions per account]
+"""
+import os
+import sys
+import tempfile
+import time
+from models.bank_account import BankAccount
+from storage.json_storage import JsonStorage
+
+def shard_times(storage):
+    """
+    Get the modification times of the shard files.
+
+    Args:
+        storage (JsonStorage): Storage to inspect
+
+    Returns:
+        dict: Shard index to modification time in nanoseconds
+    """
+    return {index: os.stat(storage.shard_path(index)).st_mtime_ns
+            for index in storage.shard_indices()}
+
+def measure(name, storage, step):
+    """
+    Run one checkpointing step and report its cost.
+
+    Args:
+        name (str): Step description
+        storage (JsonStorage): Storage being written
+        step (function): Performs the step
+    """
+    before = shard_times(storage)
+    started = time.perf_counter()
+    step()
+    elapsed = time.perf_counter() - started
+    after = shard_times(storage)
+    shards = before.keys() | after.keys()
+    rewritten = sum(1 for index in shards if before.get(index) != after.get(index))
+    print(f"{name:22} {elapsed * 1000:9.1f} ms  {rewritten:4} of {len(shards)} shards rewritten")
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    transaction_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    directory = tempfile.mkdtemp()
+    storage = JsonStorage(
+        os.path.join(directory, 'bank_data.json'),
+        admin_file=os.path.join(directory, 'admin_data.json'),
+        log_file=os.path.join(directory, 'admin_logs.json'),
+        use_journal=False
+    )
+    storage.load_accounts()
+
+    accounts = {}
+    for number in range(1000, 1000 + account_count):
+        account = BankAccount(str(number), f"user{number}", "secret")
+        for i in range(transaction_count):
+            account.balance += 1000
+            account.add_transaction({'type': 'deposit', 'amount': 1000,
+                                     'date': '2024-01-01 12:00:00', 'balance': account.balance})
+        accounts[account.account_number] = account
+    print(f"{account_count} accounts x {transaction_count} transactions")
+
+    measure("full snapshot", storage, lambda: storage.save_accounts(accounts))
+    changed = accounts[str(1000 + account_count // 2)]
+
+    def deposit():
+        changed.balance += 500
+        changed.add_transaction({'type': 'deposit', 'amount': 500,
+                                 'date': '2024-01-02 12:00:00', 'balance': changed.balance})
+        storage.save_accounts(accounts)
+
+    def remove():
+        del accounts['1000']
+        storage.delete_account('1000')
+
+    measure("one account changed", storage, deposit)
+    measure("one account removed", storage, remove)
+    measure("nothing changed", storage, lambda: storage.save_accounts(accounts))
+    storage.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Streaming statement export, in one process and with a worker pool.
+
+A synthetic bank is saved to scratch storage and reopened, so histories
+are read the way the export reads them in production. A month of
+statements and transactions is then exported in this process and with a
+pool of worker processes. Reports the time, rows per second and peak
+memory of each run, checks that every statement's closing balance equals
+its opening balance plus the month's movements, and that all runs wrote
+the same rows.
+
+Usage:
+    python -m benchmarks.statement_export [accounts] [transactions per account]
+        [--backend json|sqlite] [--workers 1,2,4]
+"""
+import argparse
+import csv
+import glob
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from benchmarks.concurrency_stress import make_storage
+from models.bank_account import BankAccount
+from models.transaction_store import epoch_to_date, parse_date_bound
+from services.banking_system import BankingSystem
+from services.statements import export_statements, month_bounds
+from utils.money import to_cents
+
+def populate(storage, account_count, transaction_count, rng):
+    """
+    Save synthetic accounts with a year of history each.
+
+    Args:
+        storage (StorageBackend): Storage to write
+        account_count (int): Number of accounts
+        transaction_count (int): Transactions per account
+        rng (random.Random): Random source
+    """
+    year_start = parse_date_bound("2024-01-01")
+    accounts = {}
+    for number in range(1000, 1000 + account_count):
+        account = BankAccount(str(number), f"user{number}", "secret")
+        timestamps = sorted(rng.randrange(year_start, year_start + 365 * 86400)
+                            for _ in range(transaction_count))
+        for timestamp in timestamps:
+            amount = rng.randrange(1, 50_000)
+            tx_type = 'withdrawal' if account.balance >= amount and rng.random() < 0.4 else 'deposit'
+            account.balance += amount if tx_type == 'deposit' else -amount
+            account.add_transaction({'type': tx_type, 'amount': amount,
+                                     'date': epoch_to_date(timestamp),
+                                     'balance': account.balance})
+        accounts[account.account_number] = account
+    storage.save_accounts(accounts)
+
+def read_rows(directory, kind):
+    """
+    Read back all rows of one kind of export file.
+
+    Args:
+        directory (str): Export directory
+        kind (str): 'statements' or 'transactions'
+
+    Returns:
+        list: Rows in shard order
+    """
+    rows = []
+    for path in sorted(glob.glob(os.path.join(directory, f"{kind}-*.csv"))):
+        with open(path, newline='', encoding='utf-8') as file:
+            rows.extend(csv.DictReader(file))
+    return rows
+
+def balanced(statement):
+    """
+    Check that a statement's closing balance follows from its movements.
+
+    Args:
+        statement (dict): Statement row read back from CSV
+
+    Returns:
+        bool: True if the balances add up
+    """
+    movement = (to_cents(statement['deposits']) + to_cents(statement['transfers_in'])
+                - to_cents(statement['withdrawals']) - to_cents(statement['transfers_out']))
+    return to_cents(statement['opening_balance']) + movement == to_cents(statement['closing_balance'])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("accounts", type=int, nargs='?', default=20000)
+    parser.add_argument("transactions", type=int, nargs='?', default=50)
+    parser.add_argument("--backend", choices=('json', 'sqlite'), default='sqlite')
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = make_storage(args.backend, directory)
+        populate(storage, args.accounts, args.transactions, random.Random(3))
+        storage.close()
+        bank = BankingSystem(make_storage(args.backend, directory))
+        start, end = month_bounds("2024-06")
+        print(f"{args.accounts} accounts x {args.transactions} transactions, "
+              f"{args.backend} backend, exporting 2024-06")
+
+        reference = None
+        ok = True
+        for workers in (int(count) for count in args.workers.split(',')):
+            output = os.path.join(directory, f"export-{workers}")
+            started = time.perf_counter()
+            statements, transactions = export_statements(
+                bank, output, 'csv', start, end, workers=workers)
+            elapsed = time.perf_counter() - started
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+            rows = (read_rows(output, 'statements'), read_rows(output, 'transactions'))
+            ok &= all(balanced(statement) for statement in rows[0])
+            if reference is None:
+                reference = rows
+            same = rows == reference
+            ok &= same
+            print(f"workers {workers}: {statements} statements, {transactions} transactions "
+                  f"in {elapsed:.2f} s ({(statements + transactions) / elapsed:,.0f} rows/s), "
+                  f"peak RSS {peak:.0f} MB, {'OK' if same else 'MISMATCH'}")
+        bank.close()
+    print("balances OK" if ok else "FAILED")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
\ No newline at end of file
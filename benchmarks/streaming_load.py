@@ -0,0 +1,94 @@
+"""
+Compare peak memory of loading the account snapshot with json.load and
+with the streaming loader.
+
+A synthetic bank_data.json is generated in a scratch directory and each
+loader runs in a fresh interpreter so its peak resident set size is
+measured in isolation.
+
+Usage:
+    python -m benchmarks.streaming_load [accounts] [transactions per account]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from storage.json_stream import write_json_object
+
+LOADERS = {
+    'json.load': (
+        "import json\n"
+        "from models.bank_account import BankAccount\n"
+        "with open(path) as file:\n"
+        "    data = json.load(file)\n"
+        "data.pop('__meta__', None)\n"
+        "accounts = {n: BankAccount.from_dict(d) for n, d in data.items()}\n"
+    ),
+    'streaming': (
+        "from storage.json_storage import JsonStorage\n"
+        "accounts = JsonStorage(path, use_journal=False).load_accounts()\n"
+    ),
+}
+
+def generate(path, account_count, transaction_count):
+    """
+    Write a synthetic account snapshot.
+
+    Args:
+        path (str): File to write
+        account_count (int): Number of accounts
+        transaction_count (int): Transactions per account
+    """
+    def account(number):
+        transactions = [
+            {'type': 'deposit', 'amount': 10.0, 'date': '2024-01-01 12:00:00',
+             'balance': 10.0 * (i + 1)}
+            for i in range(transaction_count)
+        ]
+        return {'account_number': number, 'name': f"user{number}", 'password': 'secret',
+                'balance': 10.0 * transaction_count, 'transactions': transactions}
+
+    with open(path, 'w') as file:
+        write_json_object(file, (
+            (str(number), account(str(number)))
+            for number in range(1000, 1000 + account_count)
+        ))
+
+def measure(code, path):
+    """
+    Run a loader in a fresh interpreter.
+
+    Args:
+        code (str): Loader source, reading the snapshot from 'path'
+        path (str): Snapshot file
+
+    Returns:
+        tuple: Seconds taken and peak resident set size in MiB
+    """
+    script = (
+        "import resource, sys, time\n"
+        f"path = {path!r}\n"
+        "started = time.perf_counter()\n"
+        f"{code}"
+        "print(time.perf_counter() - started,"
+        " resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ).stdout.split()
+    return float(output[0]), int(output[1]) / 1024
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    transaction_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    path = os.path.join(tempfile.mkdtemp(), 'bank_data.json')
+    generate(path, account_count, transaction_count)
+    print(f"snapshot: {os.path.getsize(path) / 2 ** 20:.1f} MiB, "
+          f"{account_count} accounts x {transaction_count} transactions")
+    for name, code in LOADERS.items():
+        seconds, peak = measure(code, path)
+        print(f"{name:10} {seconds:7.2f} s  peak RSS {peak:8.1f} MiB")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Synthetic bank data for benchmarks.
+
+Writes accounts with a year of deposit and withdrawal history each,
+admins, and an admin log straight to a storage backend, as a bank that
+has been running for a while would have them. Every account and
+admin shares one password hash, so generating large banks does not pay
+for a key derivation per account; the password is SYNTHETIC_PASSWORD.
+
+Usage:
+    python -m benchmarks.synthetic_data directory [--backend json|sqlite]
+        [--accounts N] [--transactions N] [--admin-logs N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from benchmarks.account_index import FIRST_NAMES, LAST_NAMES
+from benchmarks.concurrency_stress import make_storage
+from models.admin import Admin
+from models.admin_log import AdminLog
+from models.bank_account import BankAccount
+from models.transaction_store import epoch_to_date
+from utils.constants import ACCOUNT_NUMBER_START
+from utils.passwords import hash_password
+
+# Password of every synthetic account and admin
+SYNTHETIC_PASSWORD = "benchmark"
+
+# Number of synthetic admins writing the admin log
+ADMIN_COUNT = 5
+
+# (action, details format) of synthetic admin log entries
+ADMIN_ACTIONS = (
+    ("Login", "Admin logged into the system"),
+    ("View Transactions", "Viewed transactions of account {}"),
+    ("Remove User", "Removed user account {}"),
+)
+
+def make_history(account, count, rng, start, end):
+    """
+    Give an account a chronological history that never overdraws.
+
+    Args:
+        account (BankAccount): Account to fill
+        count (int): Number of transactions
+        rng (random.Random): Random source
+        start (int): Epoch second of the earliest transaction
+        end (int): Epoch second of the latest transaction
+    """
+    for timestamp in sorted(rng.randrange(start, end) for _ in range(count)):
+        amount = rng.randrange(100, 200_000)
+        tx_type = 'withdrawal' if account.balance >= amount and rng.random() < 0.4 else 'deposit'
+        account.balance += amount if tx_type == 'deposit' else -amount
+        account.add_transaction({'type': tx_type, 'amount': amount,
+                                 'date': epoch_to_date(timestamp), 'balance': account.balance})
+
+def generate(storage, account_count=1000, transaction_count=100, admin_log_count=10000,
+             seed=1):
+    """
+    Write a synthetic bank to a storage backend.
+
+    Args:
+        storage (StorageBackend): Empty storage to write
+        account_count (int, optional): Number of accounts
+        transaction_count (int, optional): Transactions per account
+        admin_log_count (int, optional): Number of admin log entries
+        seed (int, optional): Random seed; the same seed gives the same
+            accounts, amounts and logs, dated up to the current time
+
+    Returns:
+        tuple: Account numbers and admin usernames written
+    """
+    rng = random.Random(seed)
+    password = hash_password(SYNTHETIC_PASSWORD)
+    end = int(time.time())
+    start = end - 365 * 86400
+    numbers = [str(ACCOUNT_NUMBER_START + i) for i in range(account_count)]
+
+    accounts = {}
+    for number in numbers:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        account = BankAccount(number, name, password)
+        make_history(account, transaction_count, rng, start, end)
+        accounts[number] = account
+    storage.save_accounts(accounts)
+
+    usernames = [f"admin{i}" for i in range(ADMIN_COUNT)]
+    storage.save_admins({username: Admin(username, password) for username in usernames})
+    logs = []
+    for timestamp in sorted(rng.randrange(start, end) for _ in range(admin_log_count)):
+        action, details = rng.choice(ADMIN_ACTIONS)
+        logs.append(AdminLog(rng.choice(usernames), action,
+                             details.format(rng.choice(numbers)), epoch_to_date(timestamp)))
+    storage.save_logs(logs)
+    return numbers, usernames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directory", help="Directory for the data files, created if needed")
+    parser.add_argument("--backend", choices=('json', 'sqlite'), default='json')
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--transactions", type=int, default=100,
+                        help="Transactions per account")
+    parser.add_argument("--admin-logs", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    storage = make_storage(args.backend, args.directory)
+    started = time.perf_counter()
+    generate(storage, args.accounts, args.transactions, args.admin_logs, args.seed)
+    storage.close()
+    print(f"{args.accounts} accounts x {args.transactions} transactions and "
+          f"{args.admin_logs} admin logs written to {args.directory} "
+          f"in {time.perf_counter() - started:.1f} s")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
\ No newline at end of file
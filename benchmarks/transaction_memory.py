@@ -0,0 +1,75 @@
+"""
+Compare the memory used by transaction dictionaries and TransactionStore.
+
+Usage:
+    python -m benchmarks.transaction_memory [count]
+"""
+import random
+import sys
+import tracemalloc
+from models.transaction_store import TransactionStore, epoch_to_date
+
+def generate_transactions(count, seed=42):
+    """
+    Generate a realistic transaction history.
+
+    Args:
+        count (int): Number of transactions
+        seed (int, optional): Random seed
+
+    Returns:
+        list: Transaction dictionaries with amounts in cents, oldest first
+    """
+    rng = random.Random(seed)
+    epoch = 1700000000
+    balance = 0
+    transactions = []
+    for _ in range(count):
+        epoch += rng.randint(1, 3600)
+        amount = rng.randint(100, 50000)
+        if balance >= amount and rng.random() < 0.4:
+            tx_type = 'withdrawal'
+            balance -= amount
+        else:
+            tx_type = 'deposit'
+            balance += amount
+        transactions.append({
+            'type': tx_type,
+            'amount': amount,
+            'date': epoch_to_date(epoch),
+            'balance': balance
+        })
+    return transactions
+
+def measure(build):
+    """
+    Measure the memory retained by the object a callable builds.
+
+    Args:
+        build (function): Callable creating the object to measure
+
+    Returns:
+        int: Bytes still allocated after the call
+    """
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    dict_bytes = measure(lambda: generate_transactions(count))
+
+    rows = generate_transactions(count)
+    store_bytes = measure(lambda: TransactionStore(rows))
+    assert list(TransactionStore(rows)) == rows
+
+    print(f"transactions:      {count}")
+    print(f"list of dicts:     {dict_bytes / count:8.1f} bytes/transaction")
+    print(f"TransactionStore:  {store_bytes / count:8.1f} bytes/transaction")
+    print(f"saving:            {100 * (1 - store_bytes / dict_bytes):8.1f} %")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Transaction history queries against a linear scan.
+
+One account is given a long synthetic history, then month statements,
+type and amount filtered searches and the newest matches are answered
+with TransactionStore.query, which locates the date range by binary
+search, and by filtering the whole history, as reading the full list did
+before. Reports the average time per query for both and checks that they
+return the same transactions.
+
+Usage:
+    python -m benchmarks.transaction_query [transactions] [queries]
+"""
+import random
+import sys
+import time
+from models.transaction_store import TransactionStore, epoch_to_date, parse_date_bound
+
+def make_history(count, rng):
+    """
+    Generate a chronological history of deposits and withdrawals.
+
+    Args:
+        count (int): Number of transactions
+        rng (random.Random): Random source
+
+    Returns:
+        TransactionStore: Store holding the history
+    """
+    store = TransactionStore()
+    timestamp = parse_date_bound("2015-01-01")
+    balance = 0
+    for _ in range(count):
+        timestamp += rng.randrange(1, 300)
+        amount = rng.randrange(1, 100_000)
+        tx_type = 'deposit' if amount > balance or rng.random() < 0.55 else 'withdrawal'
+        balance += amount if tx_type == 'deposit' else -amount
+        store.append({'type': tx_type, 'amount': amount,
+                      'date': epoch_to_date(timestamp), 'balance': balance})
+    return store
+
+def scan(store, start=None, end=None, types=None, min_amount=None, max_amount=None,
+         limit=None, newest_first=False):
+    """
+    Answer a query by reading every transaction of the history.
+
+    Args:
+        store (TransactionStore): History to read
+        start (int, optional): Earliest epoch second to include
+        end (int, optional): Latest epoch second to include
+        types (iterable, optional): Transaction types to include
+        min_amount (int, optional): Smallest amount in cents
+        max_amount (int, optional): Largest amount in cents
+        limit (int, optional): Maximum number of transactions
+        newest_first (bool, optional): Return the newest matches first
+
+    Returns:
+        list: Matching transactions
+    """
+    first = epoch_to_date(start) if start is not None else None
+    last = epoch_to_date(end) if end is not None else None
+    matches = [
+        transaction for transaction in store
+        if (first is None or transaction['date'] >= first)
+        and (last is None or transaction['date'] <= last)
+        and (types is None or transaction['type'] in types)
+        and (min_amount is None or transaction['amount'] >= min_amount)
+        and (max_amount is None or transaction['amount'] <= max_amount)
+    ]
+    if newest_first:
+        matches.reverse()
+    return matches[:limit] if limit is not None else matches
+
+def compare(name, store, queries):
+    """
+    Time a kind of query with the index and with a scan and report both.
+
+    Args:
+        name (str): Query description
+        store (TransactionStore): History to query
+        queries (list): Keyword arguments of each query
+
+    Returns:
+        bool: True if both methods gave the same answers
+    """
+    started = time.perf_counter()
+    indexed = [store.query(**query) for query in queries]
+    index_time = (time.perf_counter() - started) / len(queries)
+    started = time.perf_counter()
+    scanned = [scan(store, **query) for query in queries]
+    scan_time = (time.perf_counter() - started) / len(queries)
+    same = indexed == scanned
+    rows = sum(len(answer) for answer in indexed) / len(queries)
+    print(f"{name:<22} {rows:8.0f} rows   index {index_time * 1e3:8.2f} ms"
+          f"   scan {scan_time * 1e3:9.1f} ms   {scan_time / index_time:7.0f}x"
+          f"   {'OK' if same else 'MISMATCH'}")
+    return same
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = random.Random(7)
+
+    started = time.perf_counter()
+    store = make_history(count, rng)
+    first, last = store.timestamps[0], store.timestamps[-1]
+    print(f"{count} transactions from {epoch_to_date(first)} to {epoch_to_date(last)}"
+          f" built in {time.perf_counter() - started:.1f} s")
+
+    months = []
+    days = []
+    for _ in range(query_count):
+        year = rng.randrange(int(epoch_to_date(first)[:4]), int(epoch_to_date(last)[:4]))
+        month = rng.randrange(1, 13)
+        start = parse_date_bound(f"{year}-{month:02d}-01")
+        months.append({'start': start, 'end': start + 30 * 86400 - 1})
+        day = rng.randrange(first, last)
+        days.append({'start': day, 'end': day + 86399, 'types': ('withdrawal',),
+                     'min_amount': 50_000})
+
+    results = [
+        compare("month statement", store, months),
+        compare("day, large withdrawals", store, days),
+        compare("newest 50 deposits", store,
+                [{'types': ('deposit',), 'min_amount': 90_000, 'limit': 50,
+                  'newest_first': True}] * query_count),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
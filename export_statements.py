@@ -0,0 +1,36 @@
+# export_statements.py (Write account statements and transaction extracts)
+import argparse
+import sys
+from services.banking_system import BankingSystem
+from services.statements import EXPORT_FORMATS, export_statements, month_bounds
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write the statements and transactions of all accounts as CSV or JSON lines."
+    )
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--month", help="statement month as YYYY-MM (default: whole history)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default='csv', help="file format")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes writing account shards in parallel")
+    args = parser.parse_args()
+
+    start = end = None
+    if args.month:
+        try:
+            start, end = month_bounds(args.month)
+        except ValueError as e:
+            parser.error(str(e))
+
+    banking_system = BankingSystem()
+    try:
+        statements, transactions = export_statements(
+            banking_system, args.directory, args.format, start, end, args.workers)
+    finally:
+        banking_system.close()
+
+    print(f"Wrote {statements} statements and {transactions} transactions to {args.directory}.")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
\ No newline at end of file
@@ -2,8 +2,11 @@ import tkinter as tk
 from UI.user_type_screen import UserTypeScreen
 from UI.banking_GUI import BankingGUI
 from UI.admin_GUI import AdminGUI
+from UI.latency_probe import FrameLatencyProbe
+from UI.task_runner import TaskRunner
 from services.banking_system import BankingSystem
 from services.admin_service import AdminService
+from utils.constants import FRAME_LATENCY_PROBE
 
 class BankingApplication:
     """
@@ -16,6 +19,9 @@ class BankingApplication:
         root (tk.Tk): Main window of the application
         banking_system (BankingSystem): Main banking system service
         admin_service (AdminService): Administrative service
+        task_runner (TaskRunner): Runs service calls off the main loop
+        latency_probe (FrameLatencyProbe): Main loop responsiveness probe,
+            None when FRAME_LATENCY_PROBE is off
         user_type_screen (UserTypeScreen): Initial user type selection screen
         admin_gui (AdminGUI): Administrator interface
         banking_gui (BankingGUI): Client banking interface
@@ -31,6 +37,7 @@ class BankingApplication:
         # Initialize services
         self.banking_system = BankingSystem()
         self.admin_service = AdminService(self.banking_system)
+        self.task_runner = TaskRunner(self.root)
         
         # Initialize UI components
         self.user_type_screen = UserTypeScreen(
@@ -42,15 +49,19 @@ class BankingApplication:
         self.admin_gui = AdminGUI(
             self.root,
             self.admin_service,
-            self.show_user_type_screen
+            self.show_user_type_screen,
+            self.task_runner
         )
         
         self.banking_gui = BankingGUI(
             self.root,
             self.banking_system,
-            self.show_user_type_screen
+            self.show_user_type_screen,
+            self.task_runner
         )
         
+        self.latency_probe = FrameLatencyProbe(self.root) if FRAME_LATENCY_PROBE else None
+        
         # Show initial screen
         self.show_user_type_screen()
 
@@ -77,7 +88,16 @@ class BankingApplication:
 
     def run(self):
         """Start the application main loop."""
+        if self.latency_probe:
+            self.latency_probe.start()
         self.root.mainloop()
+        self.task_runner.shutdown()
+        self.banking_system.close()
+        if self.latency_probe:
+            stats = self.latency_probe.summary()
+            print(f"Main loop latency over {stats['samples']} samples: "
+                  f"p50 {stats['p50']:.1f} ms, p99 {stats['p99']:.1f} ms, "
+                  f"max {stats['max']:.1f} ms")
 
 if __name__ == "__main__":
     app = BankingApplication()
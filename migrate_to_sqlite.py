@@ -0,0 +1,27 @@
+# migrate_to_sqlite.py (One-shot import of the JSON data files into SQLite)
+import os
+from storage.json_storage import JsonStorage
+from storage.migrate import migrate_storage
+from storage.sqlite_storage import SqliteStorage
+from utils.constants import SQLITE_FILE
+
+def migrate_to_sqlite():
+    # Never overwrite an existing database
+    if os.path.exists(SQLITE_FILE):
+        print("SQLite database already exists. Skipping migration.")
+        return
+
+    print("Migrating JSON data to SQLite...")
+    source = JsonStorage()
+    target = SqliteStorage()
+    try:
+        accounts, logs = migrate_storage(source, target)
+    finally:
+        source.close()
+        target.close()
+
+    print(f"Migrated {accounts} accounts and {logs} admin logs to {SQLITE_FILE}")
+    print("Set STORAGE_BACKEND = 'sqlite' in utils/constants.py to use it.")
+
+if __name__ == "__main__":
+    migrate_to_sqlite()
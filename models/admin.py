@@ -7,7 +7,8 @@ class Admin:
     
     Attributes:
         username (str): Administrator's username
-        password (str): Administrator's password
+        password (str): Salted hash of the administrator's password, or the
+            plaintext password of earlier versions until the next login
     """
 
     def __init__(self, username, password):
@@ -1,3 +1,7 @@
+import threading
+from models.transaction_store import TransactionStore
+from utils.money import to_cents, from_cents
+
 class BankAccount:
     """
     A class representing a bank account with basic banking operations.
@@ -8,40 +12,123 @@ class BankAccount:
     Attributes:
         account_number (str): Unique identifier for the account
         name (str): Account holder's name
-        password (str): Account password for authentication
-        balance (float): Current balance in the account
-        transactions (list): List of all transactions performed
+        password (str): Salted hash of the account password, or the
+            plaintext password of earlier versions until the next login
+        balance (int): Current balance in the account, in cents
+        transactions (TransactionStore): Compact history of all transactions
+            performed, loaded on first access when a transaction loader is set
+        transaction_loader (function): Callback returning the stored
+            transaction history for an account number
+        lock (threading.RLock): Serializes operations on this account
+        dirty (bool): Changed since the account was last written to a
+            snapshot; new accounts start dirty
     """
-    def __init__(self, account_number, name, password, balance=0):
+    def __init__(self, account_number, name, password, balance=0,
+                 transaction_loader=None):
         """
         Initialize a new bank account.
         
         Args:
             account_number (str): Unique account identifier
             name (str): Account holder's name
-            password (str): Account password
-            balance (float, optional): Initial balance. Defaults to 0
+            password (str): Password hash
+            balance (int, optional): Initial balance in cents. Defaults to 0
+            transaction_loader (function, optional): Callback loading the
+                transaction history on demand. Defaults to an empty history
         """
         self.account_number = account_number
         self.name = name
         self.password = password
         self.balance = balance
-        self.transactions = []
+        self.transaction_loader = transaction_loader
+        self.lock = threading.RLock()
+        self._transactions = None if transaction_loader else TransactionStore()
+        self.dirty = True
+
+    @property
+    def transactions(self):
+        """
+        Full transaction history, oldest first.
+
+        Returns:
+            TransactionStore: Transactions, loaded through transaction_loader
+                if needed
+        """
+        if self._transactions is None:
+            self._transactions = TransactionStore(
+                self.transaction_loader(self.account_number))
+        return self._transactions
+
+    @transactions.setter
+    def transactions(self, transactions):
+        if not isinstance(transactions, TransactionStore):
+            transactions = TransactionStore(transactions)
+        self._transactions = transactions
 
-    def to_dict(self):
+    def transactions_loaded(self):
+        """
+        Check whether the transaction history is held in memory.
+
+        Returns:
+            bool: True if transactions can be read without storage access
+        """
+        return self._transactions is not None
+
+    def add_transaction(self, transaction):
+        """
+        Record a new transaction without loading an unloaded history.
+
+        Marks the account as changed since its last snapshot.
+
+        Args:
+            transaction (dict): Transaction entry to append
+        """
+        self.dirty = True
+        if self._transactions is not None:
+            self._transactions.append(transaction)
+
+    def get_transaction_page(self, cursor=None, limit=50):
+        """
+        Get a page of the in-memory transaction history, newest first.
+
+        Args:
+            cursor (int, optional): Position returned by the previous page.
+                Defaults to the newest transaction
+            limit (int, optional): Maximum number of transactions
+
+        Returns:
+            tuple: List of transactions and the cursor of the next older
+                page, None when there are no older transactions
+        """
+        end = len(self.transactions) if cursor is None else cursor
+        start = max(0, end - limit)
+        page = self.transactions[start:end][::-1]
+        return page, (start if start > 0 else None)
+
+    def to_dict(self, transactions=None):
         """
         Convert account information to a dictionary format for JSON storage.
         
+        Args:
+            transactions (list, optional): History in JSON storage form to
+                write instead of the account's own, such as a stored history
+                that has not been loaded
+            
         Returns:
             dict: Account information in dictionary format
         """
 
+        # Safe while another thread appends: the balance is taken from the
+        # last transaction read, so both always describe the same moment
+        if transactions is None:
+            transactions = self.transactions.to_list()
+        balance = transactions[-1]['balance'] if transactions else from_cents(self.balance)
         return {
             'account_number': self.account_number,
             'name': self.name,
             'password': self.password,
-            'balance': self.balance,
-            'transactions': self.transactions
+            'balance': balance,
+            'transactions': transactions
         }
 
     @classmethod
@@ -59,7 +146,7 @@ class BankAccount:
             data['account_number'],
             data['name'],
             data['password'],
-            data['balance']
+            to_cents(data['balance'])
         )
-        account.transactions = data['transactions']
+        account.transactions = TransactionStore.from_list(data['transactions'])
         return account
\ No newline at end of file
@@ -0,0 +1,336 @@
+import calendar
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from utils.money import to_cents, from_cents
+
+# Format of the transaction 'date' field
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Format of a whole day accepted as a query bound
+DAY_FORMAT = "%Y-%m-%d"
+
+# Transaction types, indexed by their stored type code
+TRANSACTION_TYPES = ('deposit', 'withdrawal', 'transfer_in', 'transfer_out')
+
+# Effect of each transaction type on the balance, indexed by type code
+TYPE_SIGNS = (1, -1, 1, -1)
+
+# Optional fields linking the two entries of a transfer
+LINK_FIELDS = ('transfer_id', 'counterparty')
+
+TYPE_CODES = {tx_type: code for code, tx_type in enumerate(TRANSACTION_TYPES)}
+
+def date_to_epoch(date):
+    """
+    Convert a transaction date string to epoch seconds.
+
+    The wall-clock time is read as UTC so the conversion is exact in both
+    directions regardless of the local timezone and DST changes.
+
+    Args:
+        date (str): Date in DATE_FORMAT
+
+    Returns:
+        int: Seconds since the epoch
+    """
+    return calendar.timegm(time.strptime(date, DATE_FORMAT))
+
+def epoch_to_date(epoch):
+    """
+    Convert epoch seconds back to a transaction date string.
+
+    Args:
+        epoch (int): Seconds since the epoch, as from date_to_epoch
+
+    Returns:
+        str: Date in DATE_FORMAT
+    """
+    return time.strftime(DATE_FORMAT, time.gmtime(epoch))
+
+def parse_date_bound(text, end=False):
+    """
+    Convert a query bound to epoch seconds.
+
+    Args:
+        text (str): Date in DATE_FORMAT, or a day in DAY_FORMAT
+        end (bool, optional): The bound is the last moment to include, so
+            a day stands for its last second instead of its first
+
+    Returns:
+        int: Seconds since the epoch
+
+    Raises:
+        ValueError: If the text is in neither format
+    """
+    text = text.strip()
+    try:
+        return date_to_epoch(text)
+    except ValueError:
+        pass
+    try:
+        day = calendar.timegm(time.strptime(text, DAY_FORMAT))
+    except ValueError:
+        raise ValueError(f"Invalid date: {text}")
+    return day + 86399 if end else day
+
+def transaction_from_dict(data):
+    """
+    Convert a stored transaction to its in-memory form.
+
+    Args:
+        data (dict): Transaction with dollar amount and balance
+
+    Returns:
+        dict: Transaction with amount and balance in integer cents
+    """
+    return dict(data, amount=to_cents(data['amount']), balance=to_cents(data['balance']))
+
+def transaction_to_dict(transaction):
+    """
+    Convert an in-memory transaction to its stored form.
+
+    Args:
+        transaction (dict): Transaction with amount and balance in cents
+
+    Returns:
+        dict: Transaction with dollar amount and balance
+    """
+    return dict(
+        transaction,
+        amount=from_cents(transaction['amount']),
+        balance=from_cents(transaction['balance'])
+    )
+
+class TransactionStore:
+    """
+    Compact, column-oriented transaction history of one account.
+
+    Instead of one dictionary per transaction, every field is kept in a
+    typed array: a type code, the amount and running balance in integer
+    cents, and the date as epoch seconds. This costs 25 bytes per
+    transaction. Reading an entry rebuilds the transaction dictionary, so
+    callers keep using the existing shape, and to_list converts amounts
+    back to dollars for the JSON files.
+
+    The balances column is appended last and defines the length, so a
+    thread reading while another appends only ever sees complete entries.
+
+    Transfers additionally carry a transfer id and the counterparty account,
+    which are kept in a sparse mapping so other transactions pay nothing
+    for them.
+
+    As transactions are appended when they happen, the timestamps column is
+    normally sorted and doubles as a time index: query finds the positions
+    of a date range by binary search, so reading one month of a long
+    history costs O(log n + k). Should the clock ever have gone back,
+    ordered turns False and queries check every timestamp instead.
+
+    Attributes:
+        types (array): Transaction type codes
+        amounts (array): Transaction amounts in cents
+        timestamps (array): Transaction dates in epoch seconds
+        balances (array): Balance after each transaction in cents
+        links (dict): Position to (transfer id, counterparty) for transfers
+        ordered (bool): True while the timestamps are in ascending order
+    """
+
+    def __init__(self, transactions=()):
+        """
+        Initialize the store.
+
+        Args:
+            transactions (iterable, optional): Transaction dictionaries to
+                add, oldest first
+        """
+        self.types = array('b')
+        self.amounts = array('q')
+        self.timestamps = array('q')
+        self.balances = array('q')
+        self.links = {}
+        self.ordered = True
+        self.extend(transactions)
+
+    def append(self, transaction):
+        """
+        Add a transaction to the end of the history.
+
+        All values are converted and checked before any column changes, so
+        a rejected transaction leaves the columns the same length.
+
+        Args:
+            transaction (dict): Transaction with type, amount and balance
+                in cents, date, and for transfers transfer_id and counterparty
+
+        Raises:
+            ValueError: If the transaction type is unknown or a value does
+                not fit its column
+        """
+        try:
+            type_code = TYPE_CODES[transaction['type']]
+        except KeyError:
+            raise ValueError(f"Unknown transaction type: {transaction['type']}")
+        timestamp = date_to_epoch(transaction['date'])
+        try:
+            amount, timestamp, balance = array(
+                'q', (transaction['amount'], timestamp, transaction['balance']))
+        except OverflowError:
+            raise ValueError(f"Transaction out of range: {transaction!r}")
+        link = None
+        if 'transfer_id' in transaction:
+            link = (transaction['transfer_id'], transaction['counterparty'])
+
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            self.ordered = False
+        if link:
+            self.links[len(self.types)] = link
+        self.types.append(type_code)
+        self.amounts.append(amount)
+        self.timestamps.append(timestamp)
+        self.balances.append(balance)
+
+    def extend(self, transactions):
+        """
+        Add several transactions to the end of the history.
+
+        Args:
+            transactions (iterable): Transaction dictionaries, oldest first
+        """
+        for transaction in transactions:
+            self.append(transaction)
+
+    def get(self, index):
+        """
+        Rebuild the transaction dictionary at a position.
+
+        Args:
+            index (int): Position in the history
+
+        Returns:
+            dict: Transaction with type, amount and balance in cents, and date
+        """
+        transaction = {
+            'type': TRANSACTION_TYPES[self.types[index]],
+            'amount': self.amounts[index],
+            'date': epoch_to_date(self.timestamps[index]),
+            'balance': self.balances[index]
+        }
+        link = self.links.get(index)
+        if link:
+            transaction.update(zip(LINK_FIELDS, link))
+        return transaction
+
+    def query(self, start=None, end=None, types=None, min_amount=None, max_amount=None,
+              limit=None, newest_first=False):
+        """
+        Find the transactions matching all given conditions.
+
+        The date range is located by binary search over the timestamps;
+        the other conditions are checked on the typed columns, and only
+        matching transactions are rebuilt as dictionaries.
+
+        Args:
+            start (int, optional): Earliest epoch second to include
+            end (int, optional): Latest epoch second to include
+            types (iterable, optional): Transaction types to include
+            min_amount (int, optional): Smallest amount in cents
+            max_amount (int, optional): Largest amount in cents
+            limit (int, optional): Maximum number of transactions
+            newest_first (bool, optional): Return the newest matches first,
+                so limit keeps the newest ones
+
+        Returns:
+            list: Matching transactions, oldest first unless newest_first
+
+        Raises:
+            ValueError: If a transaction type is unknown
+        """
+        length = len(self)
+        low, high = 0, length
+        check_time = not self.ordered and (start is not None or end is not None)
+        if not check_time:
+            low, high = self.span(start, end, length)
+        codes = None
+        if types is not None:
+            try:
+                codes = {TYPE_CODES[tx_type] for tx_type in types}
+            except KeyError as e:
+                raise ValueError(f"Unknown transaction type: {e.args[0]}")
+
+        results = []
+        positions = range(high - 1, low - 1, -1) if newest_first else range(low, high)
+        for index in positions:
+            if limit is not None and len(results) >= limit:
+                break
+            if codes is not None and self.types[index] not in codes:
+                continue
+            amount = self.amounts[index]
+            if ((min_amount is not None and amount < min_amount)
+                    or (max_amount is not None and amount > max_amount)):
+                continue
+            if check_time:
+                timestamp = self.timestamps[index]
+                if ((start is not None and timestamp < start)
+                        or (end is not None and timestamp > end)):
+                    continue
+            results.append(self.get(index))
+        return results
+
+    def span(self, start=None, end=None, length=None):
+        """
+        Find the positions of a time range by binary search.
+
+        Only meaningful while the history is ordered.
+
+        Args:
+            start (int, optional): Earliest epoch second to include
+            end (int, optional): Latest epoch second to include
+            length (int, optional): Number of transactions to consider,
+                as read before by the caller. Defaults to all of them
+
+        Returns:
+            tuple: First position in the range and the position after it
+        """
+        if length is None:
+            length = len(self)
+        low = bisect_left(self.timestamps, start, 0, length) if start is not None else 0
+        high = bisect_right(self.timestamps, end, low, length) if end is not None else length
+        return low, high
+
+    def to_list(self):
+        """
+        Convert the history to a list of dictionaries for JSON storage.
+
+        Returns:
+            list: Transactions with dollar amounts, oldest first
+        """
+        return [transaction_to_dict(transaction) for transaction in self]
+
+    @classmethod
+    def from_list(cls, data):
+        """
+        Create a store from transactions in JSON storage form.
+
+        Args:
+            data (list): Transactions with dollar amounts, oldest first
+
+        Returns:
+            TransactionStore: New store holding the transactions
+        """
+        return cls(transaction_from_dict(transaction) for transaction in data)
+
+    def __len__(self):
+        return len(self.balances)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        return self.get(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.get(index)
\ No newline at end of file
@@ -0,0 +1,37 @@
+# post_batch.py (Apply a daily posting file in one commit)
+import argparse
+import os
+import sys
+from services.banking_system import BankingSystem
+from services.batch_posting import POSTING_FORMATS, import_postings
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply a CSV or JSON lines file of deposits and withdrawals."
+    )
+    parser.add_argument("file", help="posting file, or - to read standard input")
+    parser.add_argument("--format", choices=POSTING_FORMATS,
+                        help="file format (default: from the file extension, else csv)")
+    args = parser.parse_args()
+
+    file_format = args.format
+    if not file_format:
+        file_format = 'jsonl' if os.path.splitext(args.file)[1] in ('.jsonl', '.json') else 'csv'
+
+    banking_system = BankingSystem()
+    try:
+        if args.file == '-':
+            applied, rejections = import_postings(banking_system, sys.stdin, file_format)
+        else:
+            with open(args.file, 'r', newline='') as file:
+                applied, rejections = import_postings(banking_system, file, file_format)
+    finally:
+        banking_system.close()
+
+    for line_number, reason in rejections:
+        print(f"Line {line_number}: {reason}")
+    print(f"Applied {applied} postings, rejected {len(rejections)}.")
+    return not rejections
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,26 @@
+# reconcile.py (Nightly ledger reconciliation)
+import sys
+from services.banking_system import BankingSystem
+from services.reconciliation import reconcile_ledger
+from utils.money import format_money
+
+def run_reconciliation():
+    banking_system = BankingSystem()
+    try:
+        mismatches = reconcile_ledger(banking_system.accounts)
+    finally:
+        banking_system.close()
+
+    for mismatch in mismatches:
+        where = ("account balance" if mismatch['position'] is None
+                 else f"transaction {mismatch['position']}")
+        print(f"Account {mismatch['account_number']}, {where}: "
+              f"expected {format_money(mismatch['expected'])}, "
+              f"recorded {format_money(mismatch['recorded'])}")
+
+    print(f"Reconciled {len(banking_system.accounts)} accounts, "
+          f"{len(mismatches)} mismatches found.")
+    return not mismatches
+
+if __name__ == "__main__":
+    sys.exit(0 if run_reconciliation() else 1)
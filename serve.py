@@ -0,0 +1,36 @@
+# serve.py (Run the banking system as a headless HTTP/JSON API)
+import argparse
+import asyncio
+from api.bank_api import BankApi
+from api.http_server import HttpServer
+from services.admin_service import AdminService
+from services.banking_system import BankingSystem
+from utils.constants import API_HOST, API_PORT, API_WORKER_THREADS
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the banking system over HTTP.")
+    parser.add_argument("--host", default=API_HOST, help=f"interface to listen on (default: {API_HOST})")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"port to listen on (default: {API_PORT})")
+    parser.add_argument("--workers", type=int, default=API_WORKER_THREADS,
+                        help=f"threads running requests (default: {API_WORKER_THREADS})")
+    args = parser.parse_args()
+
+    banking_system = BankingSystem()
+    api = BankApi(banking_system, AdminService(banking_system))
+    server = HttpServer(api.handle, args.host, args.port, workers=args.workers)
+
+    async def run():
+        await server.start()
+        print(f"Serving on http://{args.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        banking_system.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
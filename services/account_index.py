@@ -0,0 +1,274 @@
+import itertools
+import threading
+from utils.constants import ACCOUNT_SEARCH_LIMIT, NAME_GRAM_SIZE
+from utils.sorted_list import SortedList
+
+# Sorts after every character that can appear in a name, bounding prefix ranges
+PREFIX_END = '\U0010ffff'
+
+def fold_name(name):
+    """
+    Normalize a name for case-insensitive comparison.
+
+    Args:
+        name (str): Account holder's name
+
+    Returns:
+        str: Case-folded name
+    """
+    return name.casefold()
+
+def name_grams(folded, size):
+    """
+    Get the distinct fragments of a folded name.
+
+    Args:
+        folded (str): Name as returned by fold_name
+        size (int): Fragment length
+
+    Returns:
+        set: Substrings of the given length
+    """
+    return {folded[i:i + size] for i in range(len(folded) - size + 1)}
+
+class AccountIndex:
+    """
+    Secondary indexes over account names and balances.
+
+    Names are kept in a SortedList of (folded name, account number) pairs,
+    so a prefix search is a binary search followed by reading the matches.
+    Every name fragment of gram_size characters maps to a SortedList of the
+    pairs of the names containing it, and a substring search reads the list
+    of the rarest fragment of the text in name order until enough names
+    contain the whole text. Balances are kept in a SortedList of (balance, account number) pairs,
+    which answers balance ranges and the largest balances without looking
+    at other accounts.
+
+    The indexes are updated as accounts are created, change balance and
+    are removed, each update costing a few bucket operations, so lookups
+    never scan all accounts. Searches return account numbers; ties are
+    ordered by account number.
+
+    Attributes:
+        gram_size (int): Length of the indexed name fragments
+        names (SortedList): (folded name, account number) pairs
+        balances (SortedList): (balance in cents, account number) pairs
+        grams (dict): Name fragment to SortedList of (folded name, account
+            number) pairs
+        entries (dict): Account number to (folded name, balance)
+        lock (threading.Lock): Guards the indexes
+    """
+
+    def __init__(self, accounts=(), gram_size=NAME_GRAM_SIZE):
+        """
+        Initialize the indexes.
+
+        Args:
+            accounts (iterable, optional): BankAccount instances to index
+            gram_size (int, optional): Length of the indexed name fragments
+        """
+        self.gram_size = gram_size
+        self.lock = threading.Lock()
+        self.rebuild(accounts)
+
+    def rebuild(self, accounts):
+        """
+        Replace the indexes with the given accounts.
+
+        Args:
+            accounts (iterable): BankAccount instances to index
+        """
+        entries = {
+            account.account_number: (fold_name(account.name), account.balance)
+            for account in accounts
+        }
+        keys = {}
+        for account_number, (folded, _) in entries.items():
+            key = (folded, account_number)
+            for gram in name_grams(folded, self.gram_size):
+                keys.setdefault(gram, []).append(key)
+        grams = {gram: SortedList(gram_keys) for gram, gram_keys in keys.items()}
+        names = SortedList((folded, number) for number, (folded, _) in entries.items())
+        balances = SortedList((balance, number) for number, (_, balance) in entries.items())
+        with self.lock:
+            self.entries = entries
+            self.grams = grams
+            self.names = names
+            self.balances = balances
+
+    def add(self, account):
+        """
+        Index a new account.
+
+        Args:
+            account (BankAccount): Account to index
+        """
+        folded = fold_name(account.name)
+        account_number = account.account_number
+        with self.lock:
+            if account_number in self.entries:
+                self.discard(account_number)
+            key = (folded, account_number)
+            self.entries[account_number] = (folded, account.balance)
+            self.names.add(key)
+            self.balances.add((account.balance, account_number))
+            for gram in name_grams(folded, self.gram_size):
+                self.grams.setdefault(gram, SortedList()).add(key)
+
+    def remove(self, account_number):
+        """
+        Remove an account from the indexes.
+
+        Args:
+            account_number (str): Account to remove
+        """
+        with self.lock:
+            self.discard(account_number)
+
+    def discard(self, account_number):
+        """
+        Remove an account from the indexes. The lock must be held.
+
+        Args:
+            account_number (str): Account to remove
+        """
+        entry = self.entries.pop(account_number, None)
+        if entry is None:
+            return
+        folded, balance = entry
+        key = (folded, account_number)
+        self.names.remove(key)
+        self.balances.remove((balance, account_number))
+        for gram in name_grams(folded, self.gram_size):
+            keys = self.grams[gram]
+            keys.remove(key)
+            if not keys:
+                del self.grams[gram]
+
+    def update_balance(self, account):
+        """
+        Move an account to its current balance in the balance index.
+
+        Called while the account is locked, after its balance changed.
+
+        Args:
+            account (BankAccount): Account whose balance changed
+        """
+        account_number = account.account_number
+        with self.lock:
+            entry = self.entries.get(account_number)
+            if entry is None or entry[1] == account.balance:
+                return
+            self.balances.remove((entry[1], account_number))
+            self.balances.add((account.balance, account_number))
+            self.entries[account_number] = (entry[0], account.balance)
+
+    def find_by_name_prefix(self, prefix, start=0, limit=ACCOUNT_SEARCH_LIMIT):
+        """
+        Find accounts whose name starts with a prefix, ignoring case.
+
+        Args:
+            prefix (str): Start of the name
+            start (int, optional): Number of matches to skip
+            limit (int, optional): Maximum number of matches
+
+        Returns:
+            list: Account numbers in name order
+        """
+        folded = fold_name(prefix)
+        with self.lock:
+            matches = self.names.irange((folded,), (folded + PREFIX_END,))
+            return [number for _, number in itertools.islice(matches, start, start + limit)]
+
+    def count_name_prefix(self, prefix):
+        """
+        Count accounts whose name starts with a prefix, ignoring case.
+
+        Args:
+            prefix (str): Start of the name
+
+        Returns:
+            int: Number of matching accounts
+        """
+        folded = fold_name(prefix)
+        with self.lock:
+            return self.names.count_range((folded,), (folded + PREFIX_END,))
+
+    def search_names(self, text, limit=ACCOUNT_SEARCH_LIMIT):
+        """
+        Find accounts whose name contains a text, ignoring case.
+
+        Only the names holding the rarest fragment of the text are read,
+        in name order, until limit of them contain the whole text. Texts
+        shorter than a fragment read all names in order instead, which
+        stops early as such short texts match most names.
+
+        Args:
+            text (str): Text to look for
+            limit (int, optional): Maximum number of matches
+
+        Returns:
+            list: Account numbers in name order
+        """
+        folded = fold_name(text)
+        with self.lock:
+            keys = self.names
+            if len(folded) >= self.gram_size:
+                keys = min((self.grams.get(gram, ())
+                            for gram in name_grams(folded, self.gram_size)), key=len)
+            matches = (number for name, number in keys if folded in name)
+            return list(itertools.islice(matches, limit))
+
+    def find_by_balance(self, minimum=None, maximum=None, start=0,
+                        limit=ACCOUNT_SEARCH_LIMIT, descending=False):
+        """
+        Find accounts with a balance in a range.
+
+        Args:
+            minimum (int, optional): Smallest balance in cents, None for no
+                lower bound
+            maximum (int, optional): Largest balance in cents, None for no
+                upper bound
+            start (int, optional): Number of matches to skip
+            limit (int, optional): Maximum number of matches
+            descending (bool, optional): Return the largest balances first
+
+        Returns:
+            list: Account numbers ordered by balance
+        """
+        low = (minimum,) if minimum is not None else None
+        stop = (maximum + 1,) if maximum is not None else None
+        with self.lock:
+            matches = self.balances.irange(low, stop, reverse=descending)
+            return [number for _, number in itertools.islice(matches, start, start + limit)]
+
+    def count_balance_range(self, minimum=None, maximum=None):
+        """
+        Count accounts with a balance in a range.
+
+        Args:
+            minimum (int, optional): Smallest balance in cents
+            maximum (int, optional): Largest balance in cents
+
+        Returns:
+            int: Number of matching accounts
+        """
+        low = (minimum,) if minimum is not None else None
+        stop = (maximum + 1,) if maximum is not None else None
+        with self.lock:
+            return self.balances.count_range(low, stop)
+
+    def top_balances(self, count):
+        """
+        Find the accounts with the largest balances.
+
+        Args:
+            count (int): Number of accounts
+
+        Returns:
+            list: Account numbers, largest balance first
+        """
+        return self.find_by_balance(limit=count, descending=True)
+
+    def __len__(self):
+        return len(self.entries)
\ No newline at end of file
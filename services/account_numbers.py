@@ -0,0 +1,152 @@
+import threading
+from utils.constants import (
+    ACCOUNT_NUMBER_START, ACCOUNT_NUMBER_BLOCK, ACCOUNT_NUMBER_CHECK_DIGIT
+)
+
+# Metadata key holding the first account number not yet reserved
+NEXT_ACCOUNT_NUMBER_KEY = 'next_account_number'
+
+def luhn_check_digit(digits):
+    """
+    Compute the Luhn check digit for a string of digits.
+
+    Args:
+        digits (str): Digits without the check digit
+
+    Returns:
+        str: Check digit to append
+    """
+    total = 0
+    for index, digit in enumerate(reversed(digits)):
+        value = int(digit)
+        if index % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str(-total % 10)
+
+class AccountNumberAllocator:
+    """
+    Issues account numbers that are never reused.
+
+    A high-water mark is kept in the storage metadata and only ever moves
+    forward, so numbers of removed accounts are not issued again. Numbers
+    are reserved from storage block_size at a time and then handed out from
+    memory, which makes every allocation O(1) regardless of the number of
+    accounts. Numbers reserved but not issued before a restart are skipped.
+
+    Attributes:
+        storage (StorageBackend): Backend holding the high-water mark
+        persist (function): Applies a storage write in order with the
+            other writes, as BankingSystem.persist
+        block_size (int): Numbers reserved per metadata write
+        check_digit (bool): Append a Luhn check digit to issued numbers
+        next_number (int): Next number to issue, without check digit
+        reserved (int): First number not covered by the stored reservation
+        lock (threading.Lock): Guards next_number and reserved
+    """
+
+    def __init__(self, storage, persist, accounts, block_size=ACCOUNT_NUMBER_BLOCK,
+                 check_digit=ACCOUNT_NUMBER_CHECK_DIGIT, start=ACCOUNT_NUMBER_START):
+        """
+        Initialize the allocator from the stored high-water mark.
+
+        Data saved before the high-water mark existed is scanned once so
+        numbers continue after the highest existing account.
+
+        Args:
+            storage (StorageBackend): Backend holding the high-water mark
+            persist (function): Applies a storage write in order
+            accounts (dict): Existing accounts
+            block_size (int, optional): Numbers reserved per metadata write
+            check_digit (bool, optional): Append a Luhn check digit
+            start (int, optional): First number on a fresh system
+        """
+        self.storage = storage
+        self.persist = persist
+        self.block_size = max(1, block_size)
+        self.check_digit = check_digit
+        self.lock = threading.Lock()
+
+        next_number = storage.load_metadata().get(NEXT_ACCOUNT_NUMBER_KEY)
+        if next_number is None:
+            numbers = (self.parse(account_number) for account_number in accounts)
+            next_number = max(
+                (number + 1 for number in numbers if number is not None),
+                default=start
+            )
+        self.next_number = self.reserved = max(next_number, start)
+
+    def format(self, number):
+        """
+        Format a number as an account number.
+
+        Args:
+            number (int): Number without check digit
+
+        Returns:
+            str: Account number
+        """
+        digits = str(number)
+        if self.check_digit:
+            digits += luhn_check_digit(digits)
+        return digits
+
+    def parse(self, account_number):
+        """
+        Recover the number an account number was formatted from.
+
+        Args:
+            account_number (str): Account number
+
+        Returns:
+            int: Number without check digit, None if the account number
+                is not one format could have produced
+        """
+        if not account_number.isascii() or not account_number.isdigit():
+            return None
+        if not self.check_digit:
+            return int(account_number)
+        digits, check = account_number[:-1], account_number[-1]
+        if not digits or luhn_check_digit(digits) != check:
+            return None
+        return int(digits)
+
+    def reserve(self, count):
+        """
+        Reserve consecutive account numbers.
+
+        Storage writes are submitted before they are needed, so the
+        reservation is persisted before any account using it.
+
+        Args:
+            count (int): Numbers to reserve
+
+        Returns:
+            range: Reserved numbers, without check digit
+        """
+        with self.lock:
+            first = self.next_number
+            self.next_number += count
+            if self.next_number > self.reserved:
+                self.reserved = self.next_number + self.block_size - 1
+                self.persist(self.storage.save_metadata,
+                             {NEXT_ACCOUNT_NUMBER_KEY: self.reserved})
+            return range(first, self.next_number)
+
+    def allocate(self, accounts=()):
+        """
+        Issue the next account number.
+
+        Args:
+            accounts (dict, optional): Existing accounts; numbers already
+                in use are skipped
+
+        Returns:
+            str: New account number
+        """
+        while True:
+            account_number = self.format(self.reserve(1)[0])
+            if account_number not in accounts:
+                return account_number
\ No newline at end of file
@@ -1,22 +1,26 @@
-import json
-import os
-from models.admin import Admin
+import itertools
 from models.admin_log import AdminLog
-from utils.constants import ADMIN_FILE, ADMIN_LOG_FILE
+from utils.constants import (
+    TRANSACTION_PAGE_SIZE, ADMIN_LOG_PAGE_SIZE, ACCOUNT_SEARCH_LIMIT, SUMMARY_DAYS
+)
+from utils.credential_cache import CredentialCache
+from utils.passwords import hash_password, verify_password, needs_rehash
 
 class AdminService:
     """
     Service class handling all administrative operations.
     
     This class manages admin authentication, user management,
-    and logging of administrative actions.
+    and logging of administrative actions. Logs are appended to the
+    storage backend's audit log and queried from it, so they are not kept
+    in memory.
     
     Attributes:
-        admin_file (str): Path to admin credentials file
-        log_file (str): Path to admin logs file
+        storage (StorageBackend): Backend persisting admins and logs
         banking_system (BankingSystem): Reference to the banking system
         admins (dict): Dictionary of all admin accounts
-        logs (list): List of all admin action logs
+        credentials (CredentialCache): Recently verified admin logins
+        sessions (SessionManager): Sessions shared with the banking system
     """
 
     def __init__(self, banking_system):
@@ -27,49 +31,25 @@ class AdminService:
             banking_system (BankingSystem): Reference to the main banking system
         """
 
-        self.admin_file = ADMIN_FILE
-        self.log_file = ADMIN_LOG_FILE
+        self.storage = banking_system.storage
         self.banking_system = banking_system
         self.admins = {}
-        self.logs = []
+        self.credentials = CredentialCache()
+        self.sessions = banking_system.sessions
         self.load_data()
 
     def load_data(self):
         """
-        Load admin and log data from JSON files.
+        Load admin data from the storage backend.
         
-        Reads existing admin credentials and action logs from
-        their respective JSON files.
+        Reads existing admin credentials through the storage backend
+        shared with the banking system.
         """
-        # Load admin credentials
-        if os.path.exists(self.admin_file):
-            with open(self.admin_file, 'r') as file:
-                data = json.load(file)
-                self.admins = {
-                    username: Admin.from_dict(admin_data)
-                    for username, admin_data in data.items()
-                }
-
-        # Load admin logs
-        if os.path.exists(self.log_file):
-            with open(self.log_file, 'r') as file:
-                data = json.load(file)
-                self.logs = [AdminLog.from_dict(log_data) for log_data in data]
+        self.admins = self.storage.load_admins()
 
     def save_admin_data(self):
-        """Save admin credentials to JSON file."""
-        data = {
-            username: admin.to_dict()
-            for username, admin in self.admins.items()
-        }
-        with open(self.admin_file, 'w') as file:
-            json.dump(data, file, indent=4)
-
-    def save_log_data(self):
-        """Save admin logs to JSON file."""
-        data = [log.to_dict() for log in self.logs]
-        with open(self.log_file, 'w') as file:
-            json.dump(data, file, indent=4)
+        """Save admin credentials to the storage backend."""
+        self.banking_system.persist(self.storage.save_admins, self.admins)
 
     def login(self, username, password):
         """
@@ -82,11 +62,74 @@ class AdminService:
         Returns:
             Admin: Admin instance if authentication successful, None otherwise
         """
-        admin = self.admins.get(username)
-        if admin and admin.password == password:
+        admin = self.verify_admin(username, password)
+        if admin:
             self.log_action(username, "Login", "Admin logged into the system")
+        return admin
+
+    def open_session(self, username, password):
+        """
+        Log an admin in and start a session.
+        
+        Args:
+            username (str): Admin username
+            password (str): Admin password
+            
+        Returns:
+            str: Session token, None if authentication failed
+        """
+        if not self.login(username, password):
+            return None
+        return self.sessions.issue('admin', username)
+
+    def session_admin(self, token):
+        """
+        Get the admin of an active session.
+        
+        Args:
+            token (str): Session token
+            
+        Returns:
+            Admin: Admin of the session, None if the session has ended
+        """
+        session = self.sessions.validate(token, 'admin')
+        return self.admins.get(session.subject) if session else None
+
+    def close_session(self, token):
+        """
+        End an admin session.
+        
+        Args:
+            token (str): Session token
+        """
+        self.sessions.revoke(token)
+
+    def verify_admin(self, username, password):
+        """
+        Check admin credentials without recording a login.
+        
+        Used to authenticate individual API requests. Credentials verified
+        within the cache TTL skip the password hashing, and a plaintext or
+        outdated stored password is replaced by a new hash once verified.
+        
+        Args:
+            username (str): Admin username
+            password (str): Admin password
+            
+        Returns:
+            Admin: Admin instance if the credentials are valid, None otherwise
+        """
+        admin = self.admins.get(username)
+        stored = admin.password if admin else None
+        if admin and self.credentials.check(username, password, stored):
             return admin
-        return None
+        if not verify_password(password, stored):
+            return None
+        if needs_rehash(stored):
+            admin.password = hash_password(password)
+            self.save_admin_data()
+        self.credentials.remember(username, password, admin.password)
+        return admin
 
     def log_action(self, admin_username, action, details):
         """
@@ -98,13 +141,16 @@ class AdminService:
             details (str): Additional details about the action
         """
         log = AdminLog(admin_username, action, details)
-        self.logs.append(log)
-        self.save_log_data()
+        self.banking_system.summary.record_action(admin_username)
+        self.banking_system.persist(self.storage.append_log, log)
 
     def remove_user(self, admin_username, account_number):
         """
         Remove a user account from the system.
         
+        The account's sessions are revoked, which logs it out of every
+        front end.
+        
         Args:
             admin_username (str): Username of admin performing the removal
             account_number (str): Account number to remove
@@ -114,10 +160,8 @@ class AdminService:
         """
         try:
             account_number = str(account_number)
-            if account_number in self.banking_system.accounts:
-                user = self.banking_system.accounts[account_number]
-                del self.banking_system.accounts[account_number]
-                self.banking_system.save_data()
+            user = self.banking_system.remove_account(account_number)
+            if user:
                 self.log_action(
                     admin_username,
                     "Remove User",
@@ -129,26 +173,230 @@ class AdminService:
             print(f"Error removing user: {e}")
             return False
 
-    def get_user_transactions(self, account_number):
+    def get_user_transactions(self, account_number, cursor=None,
+                              limit=TRANSACTION_PAGE_SIZE):
         """
-        Get transaction history for a specific user.
+        Get a page of transaction history for a specific user.
         
         Args:
             account_number (str): Account number to get transactions for
+            cursor (int, optional): Cursor returned with the previous page
+            limit (int, optional): Maximum number of transactions
             
         Returns:
-            list: List of transactions for the account
+            tuple: List of transactions, newest first, and the cursor of
+                the next older page (None when there are no more)
         """
         try:
-            account_number = str(account_number)
-            account = self.banking_system.accounts.get(account_number)
-            if account and hasattr(account, 'transactions'):
-                return account.transactions
-            return []
+            return self.banking_system.get_transaction_page(
+                str(account_number), cursor, limit
+            )
+        except Exception as e:
+            print(f"Error getting transactions: {e}")
+            return [], None
+
+    def get_user_transaction_range(self, account_number, start, count):
+        """
+        Get consecutive transactions of a specific user by position.
+        
+        Args:
+            account_number (str): Account number to get transactions for
+            start (int): Position of the first transaction, 0 being the oldest
+            count (int): Maximum number of transactions
+            
+        Returns:
+            list: Transactions, oldest first
+        """
+        try:
+            return self.banking_system.get_transaction_range(str(account_number), start, count)
         except Exception as e:
             print(f"Error getting transactions: {e}")
             return []
 
+    def get_user_transaction_count(self, account_number):
+        """
+        Count the transactions of a specific user.
+        
+        Args:
+            account_number (str): Account number to count transactions for
+            
+        Returns:
+            int: Number of transactions
+        """
+        try:
+            return self.banking_system.get_transaction_count(str(account_number))
+        except Exception as e:
+            print(f"Error counting transactions: {e}")
+            return 0
+
+    def query_user_transactions(self, account_number, start=None, end=None, types=None,
+                                min_amount=None, max_amount=None,
+                                limit=TRANSACTION_PAGE_SIZE):
+        """
+        Find transactions of a specific user matching all given conditions.
+        
+        Args:
+            account_number (str): Account number to search
+            start (str, optional): Earliest date to include, as
+                "YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD"
+            end (str, optional): Latest date to include
+            types (iterable, optional): Transaction types to include
+            min_amount (int, optional): Smallest amount in cents
+            max_amount (int, optional): Largest amount in cents
+            limit (int, optional): Return only the newest matches, None
+                for all of them
+            
+        Returns:
+            list: Matching transactions, newest first
+        """
+        try:
+            return self.banking_system.query_transactions(
+                str(account_number), start, end, types, min_amount, max_amount, limit
+            )
+        except Exception as e:
+            print(f"Error querying transactions: {e}")
+            return []
+
+    def count_users(self):
+        """
+        Count all user accounts in the system.
+        
+        Returns:
+            int: Number of accounts
+        """
+        return len(self.banking_system.accounts)
+
+    def get_users(self, start, count):
+        """
+        Get consecutive user accounts in creation order.
+        
+        Args:
+            start (int): Position of the first account
+            count (int): Maximum number of accounts
+            
+        Returns:
+            list: (account number, BankAccount) pairs
+        """
+        accounts = self.banking_system.accounts
+        try:
+            return list(itertools.islice(accounts.items(), start, start + count))
+        except RuntimeError:
+            # The accounts changed while being read; retry on a copy
+            return list(accounts.items())[start:start + count]
+
+    def search_users(self, text, limit=ACCOUNT_SEARCH_LIMIT):
+        """
+        Find user accounts whose name contains a text, ignoring case.
+        
+        Args:
+            text (str): Text to look for in the account holder's name
+            limit (int, optional): Maximum number of accounts
+            
+        Returns:
+            list: (account number, BankAccount) pairs in name order
+        """
+        return self.resolve_users(self.banking_system.index.search_names(text, limit))
+
+    def get_users_by_name_prefix(self, prefix, start, count):
+        """
+        Get user accounts whose name starts with a prefix, ignoring case.
+        
+        Args:
+            prefix (str): Start of the account holder's name
+            start (int): Number of matching accounts to skip
+            count (int): Maximum number of accounts
+            
+        Returns:
+            list: (account number, BankAccount) pairs in name order
+        """
+        index = self.banking_system.index
+        return self.resolve_users(index.find_by_name_prefix(prefix, start, count))
+
+    def count_users_by_name_prefix(self, prefix):
+        """
+        Count user accounts whose name starts with a prefix, ignoring case.
+        
+        Args:
+            prefix (str): Start of the account holder's name
+            
+        Returns:
+            int: Number of matching accounts
+        """
+        return self.banking_system.index.count_name_prefix(prefix)
+
+    def get_users_by_balance(self, minimum=None, maximum=None, start=0,
+                             count=ACCOUNT_SEARCH_LIMIT, descending=False):
+        """
+        Get user accounts with a balance in a range.
+        
+        Args:
+            minimum (int, optional): Smallest balance in cents
+            maximum (int, optional): Largest balance in cents
+            start (int, optional): Number of matching accounts to skip
+            count (int, optional): Maximum number of accounts
+            descending (bool, optional): Largest balances first
+            
+        Returns:
+            list: (account number, BankAccount) pairs ordered by balance
+        """
+        index = self.banking_system.index
+        return self.resolve_users(
+            index.find_by_balance(minimum, maximum, start, count, descending))
+
+    def count_users_by_balance(self, minimum=None, maximum=None):
+        """
+        Count user accounts with a balance in a range.
+        
+        Args:
+            minimum (int, optional): Smallest balance in cents
+            maximum (int, optional): Largest balance in cents
+            
+        Returns:
+            int: Number of matching accounts
+        """
+        return self.banking_system.index.count_balance_range(minimum, maximum)
+
+    def get_top_users(self, count):
+        """
+        Get the user accounts with the largest balances.
+        
+        Args:
+            count (int): Number of accounts
+            
+        Returns:
+            list: (account number, BankAccount) pairs, largest balance first
+        """
+        return self.resolve_users(self.banking_system.index.top_balances(count))
+
+    def resolve_users(self, account_numbers):
+        """
+        Look up accounts found by an index search.
+        
+        Args:
+            account_numbers (list): Account numbers
+            
+        Returns:
+            list: (account number, BankAccount) pairs, skipping accounts
+                removed since the search
+        """
+        accounts = self.banking_system.accounts
+        found = ((number, accounts.get(number)) for number in account_numbers)
+        return [(number, account) for number, account in found if account]
+
+    def get_summary(self, days=SUMMARY_DAYS):
+        """
+        Get the bank-wide totals without scanning accounts or logs.
+        
+        Args:
+            days (int, optional): Number of most recent days of deposit
+                and withdrawal totals to include
+            
+        Returns:
+            dict: Total balance, account count, daily deposits and
+                withdrawals and actions per admin, amounts in cents
+        """
+        return self.banking_system.summary.report(days)
+
     def get_all_users(self):
         """
         Get all user accounts in the system.
@@ -158,11 +406,58 @@ class AdminService:
         """
         return self.banking_system.accounts
 
-    def get_admin_logs(self):
+    def get_admin_logs(self, admin_username=None, action=None, start=None, end=None,
+                       limit=ADMIN_LOG_PAGE_SIZE):
         """
-        Get all administrative action logs.
+        Get administrative action logs matching all given conditions.
         
+        Args:
+            admin_username (str, optional): Only logs of this admin
+            action (str, optional): Only logs of this action
+            start (str, optional): Earliest timestamp to include, as
+                "YYYY-MM-DD HH:MM:SS"
+            end (str, optional): Latest timestamp to include
+            limit (int, optional): Return only the newest matching logs,
+                None for all of them
+            
         Returns:
-            list: List of all admin logs
+            list: Admin logs in chronological order
         """
-        return self.logs
\ No newline at end of file
+        try:
+            self.banking_system.flush()
+            return self.storage.query_logs(admin_username, action, start, end, limit)
+        except Exception as e:
+            print(f"Error getting admin logs: {e}")
+            return []
+
+    def count_admin_logs(self):
+        """
+        Count all administrative action logs.
+        
+        Returns:
+            int: Number of logs
+        """
+        try:
+            self.banking_system.flush()
+            return self.storage.count_logs()
+        except Exception as e:
+            print(f"Error counting admin logs: {e}")
+            return 0
+
+    def get_admin_log_range(self, start, count):
+        """
+        Get consecutive administrative action logs by position.
+        
+        Args:
+            start (int): Position of the first log, 0 being the oldest
+            count (int): Maximum number of logs
+            
+        Returns:
+            list: Admin logs in chronological order
+        """
+        try:
+            self.banking_system.flush()
+            return self.storage.load_log_range(start, count)
+        except Exception as e:
+            print(f"Error getting admin logs: {e}")
+            return []
\ No newline at end of file
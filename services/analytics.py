@@ -0,0 +1,336 @@
+"""
+Aggregate analytics over the whole ledger.
+
+Every transaction of every account is copied once into flat NumPy
+columns: account id, type code, amount and balance in cents, and the date
+in epoch seconds. New transactions are appended as they are recorded, so
+the columns stay current without being rebuilt. Aggregates such as totals
+per type, volumes per day and amount distributions are then computed by
+vectorized operations over the columns instead of Python loops over
+every transaction.
+"""
+import threading
+from models.transaction_store import TRANSACTION_TYPES, TYPE_CODES, date_to_epoch, epoch_to_date
+from utils.constants import ANALYTICS_INITIAL_CAPACITY, ANALYTICS_HISTOGRAM_BINS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def grow(array, size):
+    """
+    Get an array with room for at least size items, keeping its contents.
+
+    Args:
+        array (numpy.ndarray): Array to grow
+        size (int): Number of items needed
+
+    Returns:
+        numpy.ndarray: The same array if it is large enough, otherwise a
+            copy with at least twice its capacity
+    """
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+class LedgerAnalytics:
+    """
+    Columnar copy of the ledger answering aggregate queries.
+
+    The columns are allocated with spare capacity and doubled when full,
+    so appending a transaction is amortized O(1). Only positions past the
+    current size are ever written, so a query works on views of the
+    columns up to the size read at its start while new transactions keep
+    being appended.
+
+    Accounts are numbered in the order they are added. The current balance
+    and whether the account still exists are kept per account; the
+    transactions of removed accounts stay in the ledger columns.
+
+    Attributes:
+        size (int): Number of transactions held
+        accounts (list): Account number of each account id
+        account_ids (dict): Account number to account id
+        account (numpy.ndarray): Account id of each transaction
+        types (numpy.ndarray): Type code of each transaction
+        amounts (numpy.ndarray): Amount of each transaction in cents
+        timestamps (numpy.ndarray): Date of each transaction in epoch seconds
+        balances (numpy.ndarray): Balance after each transaction in cents
+        current (numpy.ndarray): Current balance of each account id
+        active (numpy.ndarray): Whether each account id still exists
+        last_date (tuple): Last recorded date and its epoch second, as
+            transactions recorded together share their date
+        lock (threading.Lock): Serializes appends
+    """
+
+    def __init__(self, capacity=ANALYTICS_INITIAL_CAPACITY):
+        """
+        Initialize empty columns.
+
+        Args:
+            capacity (int, optional): Transactions to allocate room for
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        if np is None:
+            raise RuntimeError("Ledger analytics require NumPy")
+        self.size = 0
+        self.accounts = []
+        self.account_ids = {}
+        self.account = np.zeros(capacity, dtype=np.int32)
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.amounts = np.zeros(capacity, dtype=np.int64)
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.balances = np.zeros(capacity, dtype=np.int64)
+        self.current = np.zeros(1024, dtype=np.int64)
+        self.active = np.zeros(1024, dtype=bool)
+        self.last_date = (None, 0)
+        self.lock = threading.Lock()
+
+    def add_account(self, account, store):
+        """
+        Add an account and its history.
+
+        The caller holds the account lock, so no transaction of the account
+        can be recorded between reading the history and registering it.
+        Adding an account a second time has no effect.
+
+        Args:
+            account (BankAccount): Account to add
+            store (TransactionStore): The account's history
+        """
+        with self.lock:
+            if account.account_number in self.account_ids:
+                return
+            account_id = len(self.accounts)
+            self.accounts.append(account.account_number)
+            self.account_ids[account.account_number] = account_id
+            self.current = grow(self.current, account_id + 1)
+            self.active = grow(self.active, account_id + 1)
+            self.current[account_id] = account.balance
+            self.active[account_id] = True
+
+            count = len(store)
+            start, end = self.size, self.size + count
+            self.reserve(end)
+            self.account[start:end] = account_id
+            self.types[start:end] = np.frombuffer(store.types, dtype=np.int8)[:count]
+            self.amounts[start:end] = np.frombuffer(store.amounts, dtype=np.int64)[:count]
+            self.timestamps[start:end] = np.frombuffer(store.timestamps, dtype=np.int64)[:count]
+            self.balances[start:end] = np.frombuffer(store.balances, dtype=np.int64)[:count]
+            self.size = end
+
+    def remove_account(self, account_number):
+        """
+        Exclude a removed account from balance statistics.
+
+        Args:
+            account_number (str): Removed account
+        """
+        with self.lock:
+            account_id = self.account_ids.get(account_number)
+            if account_id is not None:
+                self.active[account_id] = False
+
+    def record(self, entries):
+        """
+        Append newly recorded transactions.
+
+        Transactions of accounts that have not been added yet are skipped,
+        as add_account will read them from the account's history.
+
+        Args:
+            entries (iterable): (BankAccount, transaction dict) pairs
+        """
+        with self.lock:
+            for account, transaction in entries:
+                account_id = self.account_ids.get(account.account_number)
+                if account_id is None:
+                    continue
+                if transaction['date'] != self.last_date[0]:
+                    self.last_date = (transaction['date'], date_to_epoch(transaction['date']))
+                position = self.size
+                self.reserve(position + 1)
+                self.account[position] = account_id
+                self.types[position] = TYPE_CODES[transaction['type']]
+                self.amounts[position] = transaction['amount']
+                self.timestamps[position] = self.last_date[1]
+                self.balances[position] = transaction['balance']
+                self.current[account_id] = transaction['balance']
+                self.size = position + 1
+
+    def reserve(self, size):
+        """
+        Make room for size transactions. The lock must be held.
+
+        Args:
+            size (int): Number of transactions needed
+        """
+        if size > len(self.types):
+            self.account = grow(self.account, size)
+            self.types = grow(self.types, size)
+            self.amounts = grow(self.amounts, size)
+            self.timestamps = grow(self.timestamps, size)
+            self.balances = grow(self.balances, size)
+
+    def view(self, start=None, end=None):
+        """
+        Get the columns of the transactions in a time range.
+
+        Args:
+            start (int, optional): Earliest epoch second to include
+            end (int, optional): Latest epoch second to include
+
+        Returns:
+            dict: Column name to array, holding only the selected rows
+        """
+        with self.lock:
+            size = self.size
+            columns = {
+                'account': self.account[:size],
+                'type': self.types[:size],
+                'amount': self.amounts[:size],
+                'timestamp': self.timestamps[:size],
+                'balance': self.balances[:size]
+            }
+        if start is None and end is None:
+            return columns
+        selected = np.ones(size, dtype=bool)
+        if start is not None:
+            selected &= columns['timestamp'] >= start
+        if end is not None:
+            selected &= columns['timestamp'] <= end
+        return {name: column[selected] for name, column in columns.items()}
+
+    def totals_by_type(self, start=None, end=None):
+        """
+        Count and sum the transactions of each type.
+
+        Args:
+            start (int, optional): Earliest epoch second to include
+            end (int, optional): Latest epoch second to include
+
+        Returns:
+            dict: Transaction type to {'count', 'total'}, total in cents
+        """
+        columns = self.view(start, end)
+        counts = np.bincount(columns['type'], minlength=len(TRANSACTION_TYPES))
+        return {
+            tx_type: {
+                'count': int(counts[code]),
+                'total': int(columns['amount'][columns['type'] == code].sum())
+            }
+            for code, tx_type in enumerate(TRANSACTION_TYPES)
+        }
+
+    def volume_by_period(self, bucket_seconds=86400, start=None, end=None):
+        """
+        Count and sum the transactions of each type per time bucket.
+
+        Buckets are aligned to the epoch, so day buckets are calendar days
+        of the recorded dates. Empty buckets are left out.
+
+        Args:
+            bucket_seconds (int, optional): Bucket length, a day by default
+            start (int, optional): Earliest epoch second to include
+            end (int, optional): Latest epoch second to include
+
+        Returns:
+            list: One dict per bucket, oldest first, with its 'start' date
+                and a {'count', 'total'} dict per transaction type
+        """
+        columns = self.view(start, end)
+        if not len(columns['type']):
+            return []
+        buckets = columns['timestamp'] // bucket_seconds
+        first = int(buckets.min())
+        groups = (buckets - first) * len(TRANSACTION_TYPES) + columns['type']
+        length = (int(buckets.max()) - first + 1) * len(TRANSACTION_TYPES)
+        counts = np.bincount(groups, minlength=length).reshape(-1, len(TRANSACTION_TYPES))
+        # Sums stay exact below 2**53 cents per bucket and type
+        totals = np.bincount(groups, weights=columns['amount'], minlength=length)
+        totals = np.rint(totals).astype(np.int64).reshape(-1, len(TRANSACTION_TYPES))
+
+        periods = []
+        for offset in np.flatnonzero(counts.sum(axis=1)):
+            period = {'start': epoch_to_date((first + int(offset)) * bucket_seconds)}
+            for code, tx_type in enumerate(TRANSACTION_TYPES):
+                period[tx_type] = {'count': int(counts[offset, code]),
+                                   'total': int(totals[offset, code])}
+            periods.append(period)
+        return periods
+
+    def average_balance(self):
+        """
+        Compute the average current balance of the existing accounts.
+
+        Returns:
+            float: Average balance in cents, 0 without accounts
+        """
+        with self.lock:
+            count = len(self.accounts)
+            current = self.current[:count]
+            active = self.active[:count]
+        return float(current[active].mean()) if active.any() else 0.0
+
+    def amount_distribution(self, tx_type, bins=ANALYTICS_HISTOGRAM_BINS, start=None,
+                            end=None):
+        """
+        Build a histogram of the amounts of one transaction type.
+
+        Bins have the same whole number of cents in width, so every amount
+        falls in exactly one bin whatever its size.
+
+        Args:
+            tx_type (str): Transaction type, such as 'deposit'
+            bins (int, optional): Maximum number of bins
+            start (int, optional): Earliest epoch second to include
+            end (int, optional): Latest epoch second to include
+
+        Returns:
+            list: (low, high, count) per bin, from the smallest amounts up,
+                with amounts in cents from low included to high excluded
+
+        Raises:
+            ValueError: If the transaction type is unknown
+        """
+        if tx_type not in TYPE_CODES:
+            raise ValueError(f"Unknown transaction type: {tx_type}")
+        columns = self.view(start, end)
+        amounts = columns['amount'][columns['type'] == TYPE_CODES[tx_type]]
+        if not len(amounts):
+            return []
+        low = int(amounts.min())
+        width = -(-(int(amounts.max()) - low + 1) // bins)
+        counts = np.bincount((amounts - low) // width)
+        return [(low + i * width, low + (i + 1) * width, int(count))
+                for i, count in enumerate(counts)]
+
+    def top_accounts(self, tx_type, count, start=None, end=None):
+        """
+        Find the accounts with the largest total of one transaction type.
+
+        Args:
+            tx_type (str): Transaction type, such as 'deposit'
+            count (int): Number of accounts
+            start (int, optional): Earliest epoch second to include
+            end (int, optional): Latest epoch second to include
+
+        Returns:
+            list: (account number, total in cents) pairs, largest first
+
+        Raises:
+            ValueError: If the transaction type is unknown
+        """
+        if tx_type not in TYPE_CODES:
+            raise ValueError(f"Unknown transaction type: {tx_type}")
+        columns = self.view(start, end)
+        selected = columns['type'] == TYPE_CODES[tx_type]
+        totals = np.bincount(columns['account'][selected],
+                             weights=columns['amount'][selected])
+        top = np.argsort(totals)[::-1][:count]
+        return [(self.accounts[i], int(round(totals[i]))) for i in top if totals[i] > 0]
\ No newline at end of file
@@ -0,0 +1,278 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from utils.constants import ASYNC_COMMIT_BATCH, ASYNC_READ_THREADS, TRANSACTION_PAGE_SIZE
+from utils.money import require_cents
+from utils.passwords import hash_password
+
+class AsyncBankingSystem:
+    """
+    Asyncio facade over BankingSystem.
+
+    Account creation, deposits and withdrawals are queued to a single writer
+    coroutine. Each time it wakes up it takes everything queued so far, up
+    to max_batch operations, and applies the deposits and withdrawals with
+    one BankingSystem.post_batch call, so concurrent mutations share a
+    single storage commit (group commit). The blocking part of a commit runs
+    on one dedicated writer thread, and logins and history reads that may
+    go to storage run on a small reader pool, so the event loop never waits
+    on file I/O or password hashing and thousands of sessions can share one
+    process. Passwords of new accounts are hashed on the reader pool before
+    they are queued, so the writer thread only inserts and persists.
+
+    Attributes:
+        banking_system (BankingSystem): System the operations are applied to
+        max_batch (int): Maximum number of operations per group commit
+        queue (asyncio.Queue): Operations waiting for the writer
+        writer (ThreadPoolExecutor): Single thread applying group commits
+        readers (ThreadPoolExecutor): Threads serving logins and history reads
+        commits (int): Number of group commits applied
+        operations (int): Number of operations applied
+    """
+
+    def __init__(self, banking_system, max_batch=ASYNC_COMMIT_BATCH,
+                 read_threads=ASYNC_READ_THREADS):
+        """
+        Initialize the facade. Call start before submitting operations.
+
+        Args:
+            banking_system (BankingSystem): System to apply operations to
+            max_batch (int, optional): Maximum operations per group commit
+            read_threads (int, optional): Threads serving logins and history
+                reads
+        """
+        self.banking_system = banking_system
+        self.max_batch = max_batch
+        self.queue = None
+        self.task = None
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-writer")
+        self.readers = ThreadPoolExecutor(max_workers=read_threads,
+                                          thread_name_prefix="async-reader")
+        self.commits = 0
+        self.operations = 0
+
+    async def start(self):
+        """Start the writer coroutine on the running event loop."""
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self.run_writer())
+
+    async def close(self):
+        """
+        Apply all queued operations and stop the writer.
+
+        The wrapped BankingSystem stays open and is closed by its owner.
+        """
+        if self.task is not None:
+            await self.queue.put(None)
+            await self.task
+            self.task = None
+        self.writer.shutdown(wait=True)
+        self.readers.shutdown(wait=True)
+
+    async def create_account(self, name, password):
+        """
+        Create a new bank account.
+
+        Args:
+            name (str): Account holder's name
+            password (str): Account password
+
+        Returns:
+            str: New account number
+        """
+        password_hash = await self.read(hash_password, password)
+        return await self.submit('create', name, password_hash)
+
+    async def login(self, account_number, password):
+        """
+        Authenticate user login.
+
+        Runs on the reader pool, as verifying a password that is not cached
+        hashes it.
+
+        Args:
+            account_number (str): Account number to authenticate
+            password (str): Password to verify
+
+        Returns:
+            BankAccount: Account instance if authentication successful, None otherwise
+        """
+        return await self.read(self.banking_system.login, account_number, password)
+
+    async def deposit(self, account_number, amount):
+        """
+        Deposit money into an account.
+
+        Args:
+            account_number (str): Target account number
+            amount (int): Amount to deposit, in cents
+
+        Returns:
+            bool: True once the deposit is committed, False if it was rejected
+        """
+        require_cents(amount)
+        return await self.submit('deposit', account_number, amount)
+
+    async def withdraw(self, account_number, amount):
+        """
+        Withdraw money from an account.
+
+        Args:
+            account_number (str): Source account number
+            amount (int): Amount to withdraw, in cents
+
+        Returns:
+            bool: True once the withdrawal is committed, False if it was rejected
+        """
+        require_cents(amount)
+        return await self.submit('withdrawal', account_number, amount)
+
+    async def get_transaction_page(self, account_number, cursor=None,
+                                   limit=TRANSACTION_PAGE_SIZE):
+        """
+        Get a page of an account's transaction history, newest first.
+
+        Args:
+            account_number (str): Account to read
+            cursor (int, optional): Cursor returned with the previous page
+            limit (int, optional): Maximum number of transactions
+
+        Returns:
+            tuple: List of transactions and the cursor of the next older
+                page, None when there are no older transactions
+        """
+        return await self.read(self.banking_system.get_transaction_page,
+                               account_number, cursor, limit)
+
+    async def get_transaction_range(self, account_number, start, count):
+        """
+        Get consecutive transactions of an account by position.
+
+        Args:
+            account_number (str): Account to read
+            start (int): Position of the first transaction, 0 being the oldest
+            count (int): Maximum number of transactions
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        return await self.read(self.banking_system.get_transaction_range,
+                               account_number, start, count)
+
+    async def get_transaction_count(self, account_number):
+        """
+        Count an account's transactions.
+
+        Args:
+            account_number (str): Account to count
+
+        Returns:
+            int: Number of transactions, 0 for unknown accounts
+        """
+        return await self.read(self.banking_system.get_transaction_count, account_number)
+
+    async def read(self, method, *args):
+        """
+        Run a blocking call on the reader pool.
+
+        Args:
+            method (function): BankingSystem method or other function to call
+            *args: Arguments for the method
+
+        Returns:
+            The method's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.readers, method, *args)
+
+    async def submit(self, kind, *args):
+        """
+        Queue a mutation for the next group commit and wait for it.
+
+        Args:
+            kind (str): 'create', 'deposit' or 'withdrawal'
+            *args: Arguments of the operation; name and password hash for
+                'create'
+
+        Returns:
+            Result of the operation once it is committed
+
+        Raises:
+            RuntimeError: If start has not been called
+        """
+        if self.task is None:
+            raise RuntimeError("AsyncBankingSystem has not been started")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((kind, args, future))
+        return await future
+
+    async def run_writer(self):
+        """Apply queued operations in group commits until close is called."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            operations = []
+            item = await self.queue.get()
+            while item is not None:
+                operations.append(item)
+                if len(operations) >= self.max_batch or self.queue.empty():
+                    break
+                item = self.queue.get_nowait()
+            stopping = item is None
+            if not operations:
+                continue
+
+            outcomes = await loop.run_in_executor(self.writer, self.apply, operations)
+            self.commits += 1
+            self.operations += len(operations)
+            for (_, _, future), (result, error) in zip(operations, outcomes):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def apply(self, operations):
+        """
+        Apply a group of queued operations on the writer thread.
+
+        Runs of consecutive deposits and withdrawals are posted together
+        with a single commit; account creations are applied in between, so
+        the queue order is preserved. Each posting is resolved with its own
+        outcome from post_batch, which rejects a failing posting without
+        touching the others. post_batch itself only raises before it
+        changes anything or when the shared commit fails, and the error
+        then belongs to every posting of the run.
+
+        Args:
+            operations (list): (kind, args, future) tuples
+
+        Returns:
+            list: (result, exception) pair for each operation
+        """
+        outcomes = []
+        postings = []
+
+        def post():
+            try:
+                reasons = self.banking_system.post_batch(postings)
+                outcomes.extend((reason is None, None) for reason in reasons)
+            except Exception as e:
+                outcomes.extend((None, e) for _ in postings)
+            postings.clear()
+
+        for kind, args, _ in operations:
+            if kind != 'create':
+                postings.append((args[0], kind, args[1]))
+                continue
+            if postings:
+                post()
+            name, password_hash = args
+            try:
+                outcomes.append((self.banking_system.create_account(
+                    name, None, password_hash=password_hash), None))
+            except Exception as e:
+                outcomes.append((None, e))
+        if postings:
+            post()
+        return outcomes
\ No newline at end of file
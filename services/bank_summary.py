@@ -0,0 +1,188 @@
+"""
+Bank-wide summary counters.
+
+The total balance, the number of accounts, the deposits and withdrawals
+of each day and the number of actions of each admin are kept as running
+counters, adjusted by every mutation in O(1). Reading them never walks
+the accounts, their histories or the admin logs.
+
+The counters are saved in the storage metadata when the system closes,
+and marked stale in storage once it starts again. After an unclean
+shutdown they are recomputed from the accounts, histories and logs.
+"""
+import threading
+from models.transaction_store import TYPE_CODES, TYPE_SIGNS, epoch_to_date
+from utils.constants import SUMMARY_DAYS
+
+# Metadata key holding the counters saved at the last clean shutdown
+SUMMARY_KEY = 'summary'
+
+# Metadata key telling whether the saved counters are still current
+SUMMARY_CLEAN_KEY = 'summary_clean'
+
+# Transaction types counted in the daily flows
+FLOW_TYPES = ('deposit', 'withdrawal')
+
+# Type code to position in a day's flows
+FLOW_POSITIONS = {TYPE_CODES[tx_type]: position for position, tx_type in enumerate(FLOW_TYPES)}
+
+class BankSummary:
+    """
+    Running totals over all accounts and admin actions.
+
+    Transfers move money between accounts, so they change balances but
+    are not counted as deposits or withdrawals. The flows of a day stay
+    counted when an account is removed; only a recount after an unclean
+    shutdown drops them, as the account's history is gone by then.
+
+    Attributes:
+        total_balance (int): Sum of all account balances in cents
+        account_count (int): Number of accounts
+        daily (dict): Day as "YYYY-MM-DD" to [deposits, withdrawals] in cents
+        admin_actions (dict): Admin username to number of logged actions
+        lock (threading.Lock): Guards the counters
+    """
+
+    def __init__(self):
+        """Initialize counters for an empty bank."""
+        self.total_balance = 0
+        self.account_count = 0
+        self.daily = {}
+        self.admin_actions = {}
+        self.lock = threading.Lock()
+
+    def add_account(self, account):
+        """
+        Count a new account.
+
+        Args:
+            account (BankAccount): Account added
+        """
+        with self.lock:
+            self.account_count += 1
+            self.total_balance += account.balance
+
+    def remove_account(self, account):
+        """
+        Stop counting a removed account.
+
+        Args:
+            account (BankAccount): Account removed, with its final balance
+        """
+        with self.lock:
+            self.account_count -= 1
+            self.total_balance -= account.balance
+
+    def record(self, entries):
+        """
+        Count newly recorded transactions.
+
+        Args:
+            entries (iterable): (BankAccount, transaction dict) pairs
+        """
+        with self.lock:
+            for _, transaction in entries:
+                type_code = TYPE_CODES[transaction['type']]
+                self.total_balance += TYPE_SIGNS[type_code] * transaction['amount']
+                position = FLOW_POSITIONS.get(type_code)
+                if position is not None:
+                    flows = self.daily.setdefault(transaction['date'][:10], [0, 0])
+                    flows[position] += transaction['amount']
+
+    def record_action(self, admin_username):
+        """
+        Count a logged admin action.
+
+        Args:
+            admin_username (str): Admin who performed the action
+        """
+        with self.lock:
+            self.admin_actions[admin_username] = self.admin_actions.get(admin_username, 0) + 1
+
+    def rebuild(self, accounts, histories, logs):
+        """
+        Recompute every counter from the stored data.
+
+        Args:
+            accounts (iterable): All BankAccount instances
+            histories (iterable): TransactionStore of every account
+            logs (iterable): All AdminLog entries
+        """
+        total_balance = account_count = 0
+        for account in accounts:
+            total_balance += account.balance
+            account_count += 1
+        daily = {}
+        days = {}
+        for store in histories:
+            for type_code, amount, timestamp in zip(store.types, store.amounts, store.timestamps):
+                position = FLOW_POSITIONS.get(type_code)
+                if position is not None:
+                    day = days.get(timestamp // 86400)
+                    if day is None:
+                        day = days[timestamp // 86400] = epoch_to_date(timestamp)[:10]
+                    daily.setdefault(day, [0, 0])[position] += amount
+        admin_actions = {}
+        for log in logs:
+            admin_actions[log.admin_username] = admin_actions.get(log.admin_username, 0) + 1
+        with self.lock:
+            self.total_balance = total_balance
+            self.account_count = account_count
+            self.daily = daily
+            self.admin_actions = admin_actions
+
+    def report(self, days=SUMMARY_DAYS):
+        """
+        Get the current counters.
+
+        Args:
+            days (int, optional): Number of most recent days with flows to
+                include
+
+        Returns:
+            dict: 'total_balance' and 'account_count', 'daily' as a list of
+                {'date', 'deposit', 'withdrawal'} dicts oldest first, and
+                'admin_actions' per admin; amounts in cents
+        """
+        with self.lock:
+            recent = sorted(self.daily)[-days:] if days > 0 else []
+            return {
+                'total_balance': self.total_balance,
+                'account_count': self.account_count,
+                'daily': [dict(zip(('date',) + FLOW_TYPES, [day] + self.daily[day]))
+                          for day in recent],
+                'admin_actions': dict(self.admin_actions)
+            }
+
+    def to_dict(self):
+        """
+        Convert the counters to a dictionary format for the storage metadata.
+
+        Returns:
+            dict: Counters in dictionary format
+        """
+        with self.lock:
+            return {
+                'total_balance': self.total_balance,
+                'account_count': self.account_count,
+                'daily': {day: list(flows) for day, flows in self.daily.items()},
+                'admin_actions': dict(self.admin_actions)
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create counters from dictionary data.
+
+        Args:
+            data (dict): Counters as written by to_dict
+
+        Returns:
+            BankSummary: New instance holding the counters
+        """
+        summary = cls()
+        summary.total_balance = data['total_balance']
+        summary.account_count = data['account_count']
+        summary.daily = {day: list(flows) for day, flows in data['daily'].items()}
+        summary.admin_actions = dict(data['admin_actions'])
+        return summary
\ No newline at end of file
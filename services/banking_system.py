@@ -1,8 +1,23 @@
-import json
-import os
+import threading
+import uuid
+from contextlib import ExitStack
 from datetime import datetime
 from models.bank_account import BankAccount
-from utils.constants import DATA_FILE
+from models.transaction_store import TransactionStore, parse_date_bound
+from services.account_index import AccountIndex
+from services.analytics import LedgerAnalytics
+from services.bank_summary import BankSummary, SUMMARY_KEY, SUMMARY_CLEAN_KEY
+from services.account_numbers import AccountNumberAllocator
+from services.persistence import PersistenceWorker
+from services.session_manager import SessionManager
+from storage.factory import create_storage
+from utils.constants import (
+    TRANSACTION_PAGE_SIZE, BACKGROUND_PERSISTENCE, GROUP_COMMIT_WINDOW_MS,
+    GROUP_COMMIT_MAX_OPS, DURABLE_ACK
+)
+from utils.credential_cache import CredentialCache
+from utils.money import require_cents, fits_cents
+from utils.passwords import hash_password, verify_password, needs_rehash
 
 class BankingSystem:
     """
@@ -10,81 +25,450 @@ class BankingSystem:
     
     This class manages all bank accounts and their operations, including
     creation, authentication, and transaction processing.
+
+    The system is safe to use from several threads. Each account carries
+    its own lock, so operations on different accounts run in parallel,
+    while storage writes are applied one at a time in the order the
+    operations happened. Reads of an account's history hold the account's
+    lock too, whether the history is in memory or read from storage after
+    the pending writes are applied, so each read sees the history between
+    two operations.
+
+    With a group commit window, transactions from concurrent deposits and
+    withdrawals are folded into shared commits on the persistence thread,
+    and each operation returns once the commit holding it is written. With
+    durable acknowledgement, that commit is also forced to stable storage
+    first.
     
     Attributes:
-        filename (str): Path to the JSON file storing account data
+        storage (StorageBackend): Backend persisting the account data
         accounts (dict): Dictionary of all bank accounts
+        lock (threading.Lock): Guards creation and removal of accounts
+        storage_lock (threading.Lock): Serializes storage writes made on
+            the calling thread
+        writer (PersistenceWorker): Background persistence thread, None
+            when writes are applied on the calling thread
+        group_commit (bool): Acknowledge transactions once their group
+            commit has been written
+        durable_ack (bool): Force transactions to stable storage before
+            acknowledging them
+        account_numbers (AccountNumberAllocator): Issues new account numbers
+        credentials (CredentialCache): Recently verified logins
+        sessions (SessionManager): Sessions of accounts and admins
+        index (AccountIndex): Accounts by name and balance
+        analytics (LedgerAnalytics): Columnar copy of the ledger, None
+            until get_analytics is first called
+        summary (BankSummary): Running bank-wide totals
     """
 
-    def __init__(self):
-        """Initialize the banking system and load existing account data."""
-        self.filename = DATA_FILE
+    def __init__(self, storage=None, background_persistence=BACKGROUND_PERSISTENCE,
+                 commit_window_ms=GROUP_COMMIT_WINDOW_MS, commit_max_ops=GROUP_COMMIT_MAX_OPS,
+                 durable_ack=DURABLE_ACK):
+        """
+        Initialize the banking system and load existing account data.
+
+        Args:
+            storage (StorageBackend, optional): Backend persisting the
+                account data. Defaults to the configured backend
+            background_persistence (bool, optional): Apply storage writes
+                on a background thread
+            commit_window_ms (float, optional): Milliseconds to collect
+                transactions into one group commit. Above 0 this implies
+                background persistence
+            commit_max_ops (int, optional): Maximum transactions per group
+                commit
+            durable_ack (bool, optional): Force transactions to stable
+                storage before acknowledging them
+        """
+        self.storage = storage or create_storage()
         self.accounts = {}
+        self.lock = threading.Lock()
+        self.storage_lock = threading.Lock()
+        self.credentials = CredentialCache()
+        self.sessions = SessionManager()
+        self.index = AccountIndex()
+        self.analytics = None
+        self.summary = BankSummary()
+        self.group_commit = commit_window_ms > 0
+        self.durable_ack = durable_ack
+        self.writer = None
+        if background_persistence or self.group_commit:
+            self.writer = PersistenceWorker(self.storage, commit_window_ms, commit_max_ops)
         self.load_data()
+        self.account_numbers = AccountNumberAllocator(self.storage, self.persist, self.accounts)
 
     def load_data(self):
         """
-        Load account data from JSON file.
+        Load account data from the storage backend.
+        
+        Creates BankAccount instances for each stored account and indexes
+        them. Histories that are loaded on demand wait for pending writes
+        first, so they always include every transaction made so far.
+        
+        Reloading a running system waits for pending writes first, then
+        restores the summary counters for the new accounts and drops the
+        ledger analytics, which get_analytics builds again on next use.
+        The account number allocator only reads the stored high-water
+        mark and is kept.
+        """
+
+        self.flush()
+        self.accounts = self.storage.load_accounts()
+        for account in self.accounts.values():
+            if not account.transactions_loaded():
+                account.transaction_loader = self.load_transactions
+        self.index.rebuild(self.accounts.values())
+        with self.lock:
+            self.analytics = None
+        self.load_summary()
+
+    def load_summary(self):
+        """
+        Restore the summary counters saved at the last clean shutdown.
         
-        Reads existing account data from the JSON file and creates
-        BankAccount instances for each account.
+        Counters that were not saved cleanly, or that disagree with the
+        loaded accounts, are recomputed from the stored histories and
+        admin logs. Storage is then told the saved counters are stale
+        until close saves them again.
         """
 
-        if os.path.exists(self.filename):
-            with open(self.filename, 'r') as file:
-                data = json.load(file)
-                self.accounts = {
-                    acc_num: BankAccount.from_dict(acc_data)
-                    for acc_num, acc_data in data.items()
-                }
+        meta = self.storage.load_metadata()
+        data = meta.get(SUMMARY_KEY)
+        summary = BankSummary.from_dict(data) if data and meta.get(SUMMARY_CLEAN_KEY) else None
+        accounts = self.accounts.values()
+        if (summary is None or summary.account_count != len(self.accounts)
+                or summary.total_balance != sum(account.balance for account in accounts)):
+            summary = BankSummary()
+            summary.rebuild(accounts, (
+                account.transactions if account.transactions_loaded()
+                else TransactionStore(self.storage.load_transactions(account.account_number))
+                for account in accounts
+            ), self.storage.load_logs())
+        self.summary = summary
+        self.persist(self.storage.save_metadata, {SUMMARY_CLEAN_KEY: False})
+
+    def load_transactions(self, account_number):
+        """
+        Load an account's full history once pending writes are applied.
+
+        Args:
+            account_number (str): Account number to load
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        self.flush()
+        return self.storage.load_transactions(account_number)
+
+    def history_reader(self, account_numbers):
+        """
+        Locate stored histories, once pending writes are applied, so
+        another process can read them.
+
+        Args:
+            account_numbers (list): Accounts whose histories will be read
+
+        Returns:
+            Picklable reader from StorageBackend.history_reader, or None
+        """
+        self.flush()
+        return self.storage.history_reader(account_numbers)
 
     def save_data(self):
         """
-        Save all account data to JSON file.
+        Save a full snapshot of all account data.
+        
+        Hands all account instances to the storage backend, which
+        rewrites the complete dataset.
+        """
+
+        self.persist(self.storage.save_accounts, self.accounts)
+
+    def persist(self, method, *args):
+        """
+        Apply a storage write after all previously submitted ones.
+
+        Args:
+            method (function): Storage method to call
+            *args: Arguments for the method
+
+        Returns:
+            Future: Completion of the write in background mode, None when
+                the write has already been applied
+        """
+        if self.writer:
+            return self.writer.submit(method, *args)
+        with self.storage_lock:
+            method(*args)
+
+    def record_transaction(self, account, transaction):
+        """
+        Persist a transaction that has been applied to an account.
+
+        Must be called while holding the account lock so transactions are
+        written in the order they were applied.
+
+        Args:
+            account (BankAccount): Account the transaction belongs to
+            transaction (dict): Transaction entry appended to the account
+
+        Returns:
+            Future: Completion of the write in background mode, None when
+                the write has already been applied
+        """
+        self.summary.record([(account, transaction)])
+        if self.analytics:
+            self.analytics.record([(account, transaction)])
+        return self.persist(self.storage.append_transactions, [(account, transaction)],
+                            self.durable_ack)
+
+    def acknowledge(self, commit):
+        """
+        Wait for a transaction's commit when acknowledgements require it.
+
+        Must be called after releasing the account lock, so other
+        operations on the account can join the same group commit.
+
+        Args:
+            commit (Future): Completion returned by record_transaction
+        """
+        if commit is not None and (self.group_commit or self.durable_ack):
+            commit.result()
+
+    def get_analytics(self):
+        """
+        Get the columnar copy of the ledger, building it on first use.
         
-        Converts all account instances to dictionary format and
-        saves them to the JSON file.
+        Each account's history is copied while its lock is held. Once
+        analytics exist, transactions of accounts already copied are added
+        as they are recorded, so nothing is missed or counted twice.
+        Histories that are not loaded are read from storage for the copy
+        only, and are not kept.
+        
+        Returns:
+            LedgerAnalytics: Analytics over every recorded transaction
+            
+        Raises:
+            RuntimeError: If NumPy is not installed
         """
 
-        data = {
-            acc_num: account.to_dict()
-            for acc_num, account in self.accounts.items()
-        }
-        with open(self.filename, 'w') as file:
-            json.dump(data, file, indent=4)
+        with self.lock:
+            if self.analytics is None:
+                self.analytics = LedgerAnalytics()
+                for account in list(self.accounts.values()):
+                    with account.lock:
+                        if account.transactions_loaded():
+                            store = account.transactions
+                        else:
+                            store = TransactionStore(self.load_transactions(account.account_number))
+                        self.analytics.add_account(account, store)
+        return self.analytics
 
-    def create_account(self, name, password):
+    def flush(self):
+        """Wait until all submitted storage writes have been applied."""
+        if self.writer:
+            self.writer.flush()
+
+    def close(self):
+        """
+        Save the summary counters, flush pending writes and release the
+        storage backend.
+        """
+        self.sessions.close()
+        self.persist(self.storage.save_metadata,
+                     {SUMMARY_KEY: self.summary.to_dict(), SUMMARY_CLEAN_KEY: True})
+        if self.writer:
+            self.writer.close()
+        self.storage.close()
+
+    def create_account(self, name, password, password_hash=None):
         """
         Create a new bank account.
         
+        Only a salted hash of the password is stored.
+        
         Args:
             name (str): Account holder's name
-            password (str): Account password
+            password (str): Account password, ignored when password_hash is
+                given
+            password_hash (str, optional): Salted hash of the password made
+                by the caller with hash_password, so a caller that must not
+                block on key derivation can hash elsewhere
             
         Returns:
             str: New account number
         """
 
-        account_number = self.generate_account_number()
-        account = BankAccount(account_number, name, password)
-        self.accounts[account_number] = account
-        self.save_data()
+        if password_hash is None:
+            password_hash = hash_password(password)
+        with self.lock:
+            account_number = self.generate_account_number()
+            account = BankAccount(account_number, name, password_hash)
+            self.accounts[account_number] = account
+            self.index.add(account)
+            self.summary.add_account(account)
+            if self.analytics:
+                self.analytics.add_account(account, account.transactions)
+            self.persist(self.storage.save_account, account)
         return account_number
 
     def generate_account_number(self):
         """
         Generate a unique account number.
         
+        Numbers are never reissued, even after an account is removed.
+        
         Returns:
             str: New unique account number
         """
 
-        return str(len(self.accounts) + 1000)
+        return self.account_numbers.allocate(self.accounts)
+
+    def remove_account(self, account_number):
+        """
+        Remove an account and its transaction history.
+
+        Sessions of the account are revoked.
+
+        Args:
+            account_number (str): Account number to remove
+
+        Returns:
+            BankAccount: Removed account, None if it did not exist
+        """
+
+        with self.lock:
+            account = self.accounts.get(account_number)
+            if account:
+                with account.lock:
+                    del self.accounts[account_number]
+                    self.index.remove(account_number)
+                    self.summary.remove_account(account)
+                    if self.analytics:
+                        self.analytics.remove_account(account_number)
+                    self.persist(self.storage.delete_account, account_number)
+                self.credentials.invalidate(account_number)
+                self.sessions.revoke_subject('account', account_number)
+        return account
+
+    def get_transaction_page(self, account_number, cursor=None,
+                             limit=TRANSACTION_PAGE_SIZE):
+        """
+        Get a page of an account's transaction history, newest first.
+        
+        Histories already in memory are paged directly; otherwise only the
+        requested page is read from the storage backend.
+        
+        Args:
+            account_number (str): Account to read
+            cursor (int, optional): Cursor returned with the previous page.
+                Defaults to the newest transaction
+            limit (int, optional): Maximum number of transactions
+            
+        Returns:
+            tuple: List of transactions and the cursor of the next older
+                page, None when there are no older transactions
+        """
+
+        account = self.accounts.get(account_number)
+        if not account:
+            return [], None
+        with account.lock:
+            if account.transactions_loaded():
+                return account.get_transaction_page(cursor, limit)
+            self.flush()
+            return self.storage.load_transaction_page(account_number, cursor, limit)
+
+    def get_transaction_range(self, account_number, start, count):
+        """
+        Get consecutive transactions of an account by position.
+        
+        Args:
+            account_number (str): Account to read
+            start (int): Position of the first transaction, 0 being the oldest
+            count (int): Maximum number of transactions
+            
+        Returns:
+            list: Transactions, oldest first
+        """
+
+        account = self.accounts.get(account_number)
+        if not account:
+            return []
+        with account.lock:
+            if account.transactions_loaded():
+                return account.transactions[start:start + count]
+            self.flush()
+            return self.storage.load_transaction_range(account_number, start, count)
+
+    def get_transaction_count(self, account_number):
+        """
+        Count an account's transactions without loading its history.
+        
+        Args:
+            account_number (str): Account to count
+            
+        Returns:
+            int: Number of transactions, 0 for unknown accounts
+        """
+
+        account = self.accounts.get(account_number)
+        if not account:
+            return 0
+        with account.lock:
+            if account.transactions_loaded():
+                return len(account.transactions)
+            self.flush()
+            return self.storage.count_transactions(account_number)
+
+    def query_transactions(self, account_number, start=None, end=None, types=None,
+                           min_amount=None, max_amount=None, limit=None,
+                           newest_first=True):
+        """
+        Find an account's transactions matching all given conditions.
+        
+        The history is loaded into memory on the first query, after which
+        a date range is located by binary search over its timestamps, so a
+        month of a years-long history is read without touching the rest.
+        
+        Args:
+            account_number (str): Account to read
+            start (str, optional): Earliest date to include, as
+                "YYYY-MM-DD HH:MM:SS" or a whole day "YYYY-MM-DD"
+            end (str, optional): Latest date to include, in the same forms
+            types (iterable, optional): Transaction types to include, such
+                as 'deposit' and 'withdrawal'
+            min_amount (int, optional): Smallest amount in cents
+            max_amount (int, optional): Largest amount in cents
+            limit (int, optional): Maximum number of transactions
+            newest_first (bool, optional): Return the newest matches first,
+                so limit keeps the newest ones
+            
+        Returns:
+            list: Matching transactions, empty for unknown accounts
+            
+        Raises:
+            ValueError: If a date or transaction type is invalid
+        """
+
+        start = parse_date_bound(start) if start else None
+        end = parse_date_bound(end, end=True) if end else None
+        account = self.accounts.get(account_number)
+        if not account:
+            return []
+        with account.lock:
+            return account.transactions.query(start, end, types, min_amount, max_amount,
+                                              limit, newest_first)
 
     def login(self, account_number, password):
         """
         Authenticate user login.
         
+        Credentials verified within the cache TTL are accepted without
+        hashing the password again. A password stored in plaintext by an
+        earlier version, or hashed with other parameters, is replaced by a
+        new hash once it has been verified.
+        
         Args:
             account_number (str): Account number to authenticate
             password (str): Password to verify
@@ -94,9 +478,61 @@ class BankingSystem:
         """
 
         account = self.accounts.get(account_number)
-        if account and account.password == password:
+        stored = account.password if account else None
+        if account and self.credentials.check(account_number, password, stored):
             return account
-        return None
+        if not verify_password(password, stored):
+            return None
+        if needs_rehash(stored):
+            password_hash = hash_password(password)
+            with account.lock:
+                if self.accounts.get(account_number) is not account:
+                    return None
+                account.password = password_hash
+                self.persist(self.storage.save_account, account)
+        self.credentials.remember(account_number, password, account.password)
+        return account
+
+    def open_session(self, account_number, password):
+        """
+        Log in and start a session for the account.
+        
+        Args:
+            account_number (str): Account number to authenticate
+            password (str): Password to verify
+            
+        Returns:
+            str: Session token, None if authentication failed
+        """
+
+        if not self.login(account_number, password):
+            return None
+        return self.sessions.issue('account', account_number)
+
+    def session_account(self, token):
+        """
+        Get the account of an active session.
+        
+        Args:
+            token (str): Session token
+            
+        Returns:
+            BankAccount: Account of the session, None if the session has
+                ended or the account no longer exists
+        """
+
+        session = self.sessions.validate(token, 'account')
+        return self.accounts.get(session.subject) if session else None
+
+    def close_session(self, token):
+        """
+        End a session.
+        
+        Args:
+            token (str): Session token
+        """
+
+        self.sessions.revoke(token)
 
     def deposit(self, account_number, amount):
         """
@@ -104,24 +540,35 @@ class BankingSystem:
         
         Args:
             account_number (str): Target account number
-            amount (float): Amount to deposit
+            amount (int): Amount to deposit, in cents
             
         Returns:
             bool: True if deposit successful, False otherwise
+            
+        Raises:
+            ValueError: If the amount or the resulting balance is out of range
         """
 
+        require_cents(amount)
         account = self.accounts.get(account_number)
-        if account:
+        if not account:
+            return False
+        with account.lock:
+            if self.accounts.get(account_number) is not account:
+                return False
+            require_cents(account.balance + amount)
             account.balance += amount
-            account.transactions.append({
+            self.index.update_balance(account)
+            transaction = {
                 'type': 'deposit',
                 'amount': amount,
                 'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'balance': account.balance
-            })
-            self.save_data()
-            return True
-        return False
+            }
+            account.add_transaction(transaction)
+            commit = self.record_transaction(account, transaction)
+        self.acknowledge(commit)
+        return True
 
     def withdraw(self, account_number, amount):
         """
@@ -129,21 +576,221 @@ class BankingSystem:
         
         Args:
             account_number (str): Source account number
-            amount (float): Amount to withdraw
+            amount (int): Amount to withdraw, in cents
             
         Returns:
             bool: True if withdrawal successful, False otherwise
+            
+        Raises:
+            ValueError: If the amount or the resulting balance is out of range
         """
         
+        require_cents(amount)
         account = self.accounts.get(account_number)
-        if account and account.balance >= amount:
+        if not account:
+            return False
+        with account.lock:
+            if self.accounts.get(account_number) is not account:
+                return False
+            if account.balance < amount:
+                return False
+            require_cents(account.balance - amount)
             account.balance -= amount
-            account.transactions.append({
+            self.index.update_balance(account)
+            transaction = {
                 'type': 'withdrawal',
                 'amount': amount,
                 'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'balance': account.balance
-            })
-            self.save_data()
-            return True
-        return False
\ No newline at end of file
+            }
+            account.add_transaction(transaction)
+            commit = self.record_transaction(account, transaction)
+        self.acknowledge(commit)
+        return True
+
+    def transfer(self, source_number, target_number, amount):
+        """
+        Move money from one account to another.
+        
+        Both accounts receive a linked transaction entry and the pair is
+        committed together.
+        
+        Args:
+            source_number (str): Account to debit
+            target_number (str): Account to credit
+            amount (int): Amount to transfer, in cents
+            
+        Returns:
+            bool: True if transfer successful, False otherwise
+        """
+
+        return self.transfer_batch([(source_number, target_number, amount)])[0]
+
+    def transfer_batch(self, transfers):
+        """
+        Apply many transfers with a single durable commit.
+        
+        The locks of all involved accounts are taken in account number
+        order, so concurrent batches can never deadlock. Transfers are
+        applied in the given order; one that fails (unknown account, same
+        source and target, non-positive amount, insufficient funds or a
+        target balance out of range) is skipped without affecting the
+        others. All resulting entries are then written in one storage commit.
+        
+        Args:
+            transfers (list): (source number, target number, amount in
+                cents) tuples
+            
+        Returns:
+            list: One bool per transfer, True if it was applied
+        """
+
+        for _, _, amount in transfers:
+            require_cents(amount)
+        involved = {number for source, target, _ in transfers
+                    for number in (source, target)}
+
+        results = []
+        entries = []
+        with ExitStack() as stack:
+            accounts = self.lock_accounts(stack, involved)
+            date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for source_number, target_number, amount in transfers:
+                source = accounts[source_number]
+                target = accounts[target_number]
+                if (not source or not target or source is target or amount <= 0
+                        or source.balance < amount
+                        or not fits_cents(target.balance + amount)):
+                    results.append(False)
+                    continue
+                transfer_id = uuid.uuid4().hex
+                source.balance -= amount
+                target.balance += amount
+                self.index.update_balance(source)
+                self.index.update_balance(target)
+                for account, tx_type, counterparty in (
+                        (source, 'transfer_out', target_number),
+                        (target, 'transfer_in', source_number)):
+                    transaction = {
+                        'type': tx_type,
+                        'amount': amount,
+                        'date': date,
+                        'balance': account.balance,
+                        'transfer_id': transfer_id,
+                        'counterparty': counterparty
+                    }
+                    account.add_transaction(transaction)
+                    entries.append((account, transaction))
+                results.append(True)
+            commit = self.commit_entries(entries)
+        if commit:
+            commit.result()
+        return results
+
+    def post_batch(self, postings):
+        """
+        Apply many deposits and withdrawals with a single durable commit.
+        
+        Postings are validated and applied in order while the locks of all
+        involved accounts are held; a rejected posting does not affect the
+        others. Each posting's transaction is recorded before its balance
+        changes, so one that cannot be recorded is rejected without having
+        changed anything. All resulting transactions are then written in
+        one storage commit, which is the only failure affecting every
+        posting.
+        
+        Args:
+            postings (list): (account number, 'deposit' or 'withdrawal',
+                amount in cents) tuples
+            
+        Returns:
+            list: None for each applied posting, otherwise the reason it
+                was rejected
+        """
+
+        for _, _, amount in postings:
+            require_cents(amount)
+
+        reasons = []
+        entries = []
+        with ExitStack() as stack:
+            accounts = self.lock_accounts(stack, {number for number, _, _ in postings})
+            date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for account_number, tx_type, amount in postings:
+                account = accounts[account_number]
+                if not account:
+                    reasons.append("unknown account")
+                elif tx_type not in ('deposit', 'withdrawal'):
+                    reasons.append(f"unknown posting type {tx_type!r}")
+                elif amount <= 0:
+                    reasons.append("amount must be positive")
+                elif tx_type == 'withdrawal' and account.balance < amount:
+                    reasons.append("insufficient funds")
+                elif tx_type == 'deposit' and not fits_cents(account.balance + amount):
+                    reasons.append("balance out of range")
+                else:
+                    transaction = {
+                        'type': tx_type,
+                        'amount': amount,
+                        'date': date,
+                        'balance': account.balance + (amount if tx_type == 'deposit' else -amount)
+                    }
+                    try:
+                        account.add_transaction(transaction)
+                    except ValueError as e:
+                        reasons.append(str(e))
+                        continue
+                    account.balance = transaction['balance']
+                    self.index.update_balance(account)
+                    entries.append((account, transaction))
+                    reasons.append(None)
+            commit = self.commit_entries(entries)
+        if commit:
+            commit.result()
+        return reasons
+
+    def lock_accounts(self, stack, account_numbers):
+        """
+        Lock several accounts in account number order.
+        
+        Taking locks in one global order means concurrent multi-account
+        operations can never deadlock.
+        
+        Args:
+            stack (ExitStack): Stack releasing the locks on exit
+            account_numbers (iterable): Accounts to lock
+            
+        Returns:
+            dict: Account number to locked BankAccount, None for accounts
+                that do not exist
+        """
+
+        accounts = {}
+        for account_number in sorted(account_numbers):
+            account = self.accounts.get(account_number)
+            if account:
+                stack.enter_context(account.lock)
+                if self.accounts.get(account_number) is not account:
+                    account = None
+            accounts[account_number] = account
+        return accounts
+
+    def commit_entries(self, entries):
+        """
+        Durably write the transactions of a multi-account operation.
+        
+        Must be called while the affected accounts are locked.
+        
+        Args:
+            entries (list): (BankAccount, transaction dict) pairs
+            
+        Returns:
+            Future: Completion of the commit in background mode, None when
+                the commit has already been applied or there is nothing to write
+        """
+
+        if entries:
+            self.summary.record(entries)
+            if self.analytics:
+                self.analytics.record(entries)
+            return self.persist(self.storage.append_transactions, entries, True)
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Import of posting files.
+
+A posting file lists deposits and withdrawals, one per line, either as
+CSV with an 'account_number,type,amount' header or as JSON lines with the
+same keys. Amounts are dollar values such as "12.50". Each line is
+validated, all valid postings are applied with BankingSystem.post_batch in
+a single commit, and every rejected line is reported with its reason.
+"""
+import csv
+import json
+from utils.money import parse_amount
+
+# Supported posting file formats
+POSTING_FORMATS = ('csv', 'jsonl')
+
+def parse_postings(lines, file_format):
+    """
+    Parse and validate the lines of a posting file.
+
+    Args:
+        lines (iterable): Lines of the file
+        file_format (str): 'csv' or 'jsonl'
+
+    Yields:
+        tuple: Line number, posting tuple (account number, type, amount in
+            cents) or None, and the validation error or None
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(lines)
+        rows = ((reader.line_num, row) for row in reader)
+    elif file_format == 'jsonl':
+        rows = (
+            (line_number, line)
+            for line_number, line in enumerate(lines, 1)
+            if line.strip()
+        )
+    else:
+        raise ValueError(f"Unknown posting format: {file_format}")
+
+    for line_number, row in rows:
+        try:
+            if file_format == 'jsonl':
+                row = json.loads(row)
+            posting = (
+                str(row['account_number']).strip(),
+                str(row['type']).strip().lower(),
+                parse_amount(str(row['amount']))
+            )
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            yield line_number, None, f"invalid posting: {e}"
+            continue
+        yield line_number, posting, None
+
+def import_postings(banking_system, lines, file_format):
+    """
+    Apply a posting file with a single commit.
+
+    Args:
+        banking_system (BankingSystem): System to post to
+        lines (iterable): Lines of the file
+        file_format (str): 'csv' or 'jsonl'
+
+    Returns:
+        tuple: Number of applied postings and a list of (line number,
+            reason) pairs for rejected lines, in line order
+    """
+    postings = []
+    line_numbers = []
+    rejections = []
+    for line_number, posting, error in parse_postings(lines, file_format):
+        if error:
+            rejections.append((line_number, error))
+        else:
+            postings.append(posting)
+            line_numbers.append(line_number)
+
+    reasons = banking_system.post_batch(postings)
+    rejections.extend(
+        (line_number, reason)
+        for line_number, reason in zip(line_numbers, reasons)
+        if reason
+    )
+    rejections.sort()
+    return reasons.count(None), rejections
@@ -0,0 +1,142 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from utils.constants import GROUP_COMMIT_WINDOW_MS, GROUP_COMMIT_MAX_OPS
+
+# Queued by close to stop the persistence thread
+STOP = object()
+
+class PersistenceWorker:
+    """
+    Background thread applying storage writes one at a time.
+
+    Writes are executed strictly in submission order, so a storage backend
+    is only ever used by this thread and callers can return as soon as a
+    write has been queued. Each submission returns a Future that completes
+    once the write has been applied.
+
+    Consecutive transaction appends are folded into a single
+    append_transactions call (group commit). After the first append of a
+    group the thread waits up to window_ms for more, stopping early once
+    max_ops transactions are collected or another kind of write is queued,
+    which keeps every write in submission order. The group is forced to
+    stable storage if any of its appends asked for durability, so one fsync
+    covers all of them.
+
+    Attributes:
+        storage (StorageBackend): Backend the writes are applied to
+        window_ms (float): Milliseconds to wait for more transactions
+            before committing a group, 0 to commit only what is queued
+        max_ops (int): Maximum number of transactions per group
+        queue (queue.Queue): Pending writes
+        commits (int): Number of group commits applied
+        thread (threading.Thread): Thread applying the writes
+    """
+
+    def __init__(self, storage, window_ms=GROUP_COMMIT_WINDOW_MS, max_ops=GROUP_COMMIT_MAX_OPS):
+        """
+        Start the persistence thread.
+
+        Args:
+            storage (StorageBackend): Backend the writes are applied to
+            window_ms (float, optional): Milliseconds to wait for more
+                transactions before committing a group
+            max_ops (int, optional): Maximum transactions per group
+        """
+        self.storage = storage
+        self.window_ms = window_ms
+        self.max_ops = max_ops
+        self.queue = queue.Queue()
+        self.commits = 0
+        self.thread = threading.Thread(target=self.run, name="persistence", daemon=True)
+        self.thread.start()
+
+    def submit(self, method, *args):
+        """
+        Queue a storage write.
+
+        Args:
+            method (function): Storage method to call
+            *args: Arguments for the method
+
+        Returns:
+            Future: Completes with the method's result once applied
+        """
+        future = Future()
+        self.queue.put((method, args, future))
+        return future
+
+    def run(self):
+        """Apply queued writes until close is called."""
+        item = None
+        while True:
+            if item is None:
+                item = self.queue.get()
+            if item is STOP:
+                break
+            method, args, future = item
+            if method == self.storage.append_transactions:
+                item = self.commit_group(item)
+                continue
+            try:
+                future.set_result(method(*args))
+            except Exception as e:
+                print(f"Error persisting data: {e}")
+                future.set_exception(e)
+            item = None
+
+    def commit_group(self, first):
+        """
+        Collect transaction appends following a first one and commit them together.
+
+        Args:
+            first (tuple): Queued append_transactions write
+
+        Returns:
+            The queued item that ended the group and still has to be
+                processed, None if the group ended by time or size
+        """
+        group = [first]
+        entries = list(first[1][0])
+        deadline = time.monotonic() + self.window_ms / 1000
+        item = None
+        while len(entries) < self.max_ops:
+            try:
+                item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is STOP or item[0] != self.storage.append_transactions:
+                break
+            group.append(item)
+            entries.extend(item[1][0])
+            item = None
+
+        durable = any(len(args) > 1 and args[1] for _, args, _ in group)
+        try:
+            self.storage.append_transactions(entries, durable)
+            self.commits += 1
+            for _, _, future in group:
+                future.set_result(None)
+        except Exception as e:
+            print(f"Error persisting data: {e}")
+            for _, _, future in group:
+                future.set_exception(e)
+        return item
+
+    def flush(self):
+        """
+        Wait until every write queued so far has been applied.
+
+        On the persistence thread itself, such as from a write that loads
+        an account history, every earlier write has been applied already
+        and waiting for a later one would never end, so it returns at once.
+        """
+        if threading.current_thread() is self.thread:
+            return
+        self.submit(lambda: None).result()
+
+    def close(self):
+        """Apply all queued writes and stop the thread."""
+        self.queue.put(STOP)
+        self.thread.join()
\ No newline at end of file
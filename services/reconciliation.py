@@ -0,0 +1,125 @@
+"""
+Ledger reconciliation.
+
+Recomputes every account's running balance from its transaction amounts
+and reports each recorded balance that disagrees. Accounts open with a
+zero balance, so the running balance after a transaction is the signed sum
+of all amounts up to and including it. With NumPy installed the whole
+ledger is checked in one vectorized pass; otherwise a pure Python loop is
+used.
+"""
+from models.transaction_store import TYPE_SIGNS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def reconcile_ledger(accounts):
+    """
+    Verify the running balances of all accounts.
+
+    Args:
+        accounts (dict): Account number to BankAccount mapping
+
+    Returns:
+        list: Mismatches as dictionaries with the account number, the
+            transaction position (None for the account balance itself),
+            the expected and the recorded balance in cents
+    """
+    if np is None:
+        return reconcile_ledger_python(accounts)
+    return reconcile_ledger_numpy(accounts)
+
+def reconcile_ledger_numpy(accounts):
+    """
+    Verify the running balances of all accounts with NumPy.
+
+    All transaction columns are concatenated into one ledger, signed
+    amounts are summed with a single cumulative sum, and each account's
+    running balance is that sum minus the total before the account starts.
+
+    Args:
+        accounts (dict): Account number to BankAccount mapping
+
+    Returns:
+        list: Mismatches as described in reconcile_ledger
+    """
+    account_list = list(accounts.values())
+    if not account_list:
+        return []
+    stores = [account.transactions for account in account_list]
+    lengths = np.array([len(store) for store in stores], dtype=np.int64)
+    total = int(lengths.sum())
+
+    types = np.empty(total, dtype=np.int8)
+    amounts = np.empty(total, dtype=np.int64)
+    balances = np.empty(total, dtype=np.int64)
+    position = 0
+    for store in stores:
+        end = position + len(store)
+        types[position:end] = np.frombuffer(store.types, dtype=np.int8)
+        amounts[position:end] = np.frombuffer(store.amounts, dtype=np.int64)
+        balances[position:end] = np.frombuffer(store.balances, dtype=np.int64)
+        position = end
+
+    signed = amounts * np.array(TYPE_SIGNS, dtype=np.int64)[types]
+    running = np.cumsum(signed)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    before = np.concatenate(([0], running))[starts]
+    expected = running - np.repeat(before, lengths)
+
+    mismatches = []
+    owners = np.repeat(np.arange(len(account_list)), lengths)
+    for index in np.flatnonzero(expected != balances):
+        owner = owners[index]
+        mismatches.append({
+            'account_number': account_list[owner].account_number,
+            'position': int(index - starts[owner]),
+            'expected': int(expected[index]),
+            'recorded': int(balances[index])
+        })
+
+    final = np.where(lengths > 0, np.concatenate(([0], running))[ends] - before, 0)
+    recorded = np.array([account.balance for account in account_list], dtype=np.int64)
+    for owner in np.flatnonzero(final != recorded):
+        mismatches.append({
+            'account_number': account_list[owner].account_number,
+            'position': None,
+            'expected': int(final[owner]),
+            'recorded': int(recorded[owner])
+        })
+    return mismatches
+
+def reconcile_ledger_python(accounts):
+    """
+    Verify the running balances of all accounts with a Python loop.
+
+    Args:
+        accounts (dict): Account number to BankAccount mapping
+
+    Returns:
+        list: Mismatches as described in reconcile_ledger
+    """
+    mismatches = []
+    for account in accounts.values():
+        store = account.transactions
+        running = 0
+        for position in range(len(store)):
+            running += TYPE_SIGNS[store.types[position]] * store.amounts[position]
+            if running != store.balances[position]:
+                mismatches.append({
+                    'account_number': account.account_number,
+                    'position': position,
+                    'expected': running,
+                    'recorded': store.balances[position]
+                })
+        if running != account.balance:
+            mismatches.append({
+                'account_number': account.account_number,
+                'position': None,
+                'expected': running,
+                'recorded': account.balance
+            })
+    return mismatches
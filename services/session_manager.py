@@ -0,0 +1,206 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from utils.constants import (
+    SESSION_TTL, SESSION_IDLE_TIMEOUT, SESSION_MAX, SESSION_SWEEP_INTERVAL,
+    SESSION_TOKEN_BYTES
+)
+
+class Session:
+    """
+    An authenticated session.
+
+    Attributes:
+        token (str): Random token identifying the session
+        kind (str): 'account' or 'admin'
+        subject (str): Account number or admin username
+        expires (float): Monotonic time at which the session ends
+            regardless of activity
+        last_seen (float): Monotonic time of the last validation
+    """
+
+    def __init__(self, token, kind, subject, expires, last_seen):
+        self.token = token
+        self.kind = kind
+        self.subject = subject
+        self.expires = expires
+        self.last_seen = last_seen
+
+class SessionManager:
+    """
+    Issues, validates and revokes session tokens.
+
+    A client logs in once and then presents the token, which is checked
+    with a single dictionary lookup instead of verifying the password
+    again. Sessions end ttl seconds after they were issued or idle_timeout
+    seconds after they were last used. They are kept in least recently
+    used order, so at most max_sessions are held, the oldest unused one
+    being dropped first, and the idle sessions always sit at the front
+    where the sweeper thread removes them every sweep_interval seconds.
+    All sessions of an account or admin can be revoked at once.
+
+    Attributes:
+        ttl (float): Maximum session lifetime in seconds
+        idle_timeout (float): Seconds of inactivity that end a session
+        max_sessions (int): Maximum number of sessions held
+        sessions (OrderedDict): Token to Session, least recently used first
+        subjects (dict): (kind, subject) to the set of its session tokens
+        lock (threading.Lock): Guards the sessions
+        sweeper (threading.Thread): Thread removing idle sessions, None
+            when sweeping is disabled
+    """
+
+    def __init__(self, ttl=SESSION_TTL, idle_timeout=SESSION_IDLE_TIMEOUT,
+                 max_sessions=SESSION_MAX, sweep_interval=SESSION_SWEEP_INTERVAL):
+        """
+        Initialize the manager and start the sweeper thread.
+
+        Args:
+            ttl (float, optional): Maximum session lifetime in seconds
+            idle_timeout (float, optional): Seconds of inactivity that end
+                a session
+            max_sessions (int, optional): Maximum number of sessions held
+            sweep_interval (float, optional): Seconds between sweeps, 0 to
+                only expire sessions when they are validated
+        """
+        self.ttl = ttl
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self.sessions = OrderedDict()
+        self.subjects = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.sweeper = None
+        if sweep_interval:
+            self.sweeper = threading.Thread(target=self.run_sweeper, name="session-sweeper",
+                                            daemon=True)
+            self.sweeper.start()
+
+    def issue(self, kind, subject):
+        """
+        Start a session.
+
+        Args:
+            kind (str): 'account' or 'admin'
+            subject (str): Account number or admin username
+
+        Returns:
+            str: Session token
+        """
+        token = secrets.token_urlsafe(SESSION_TOKEN_BYTES)
+        now = time.monotonic()
+        with self.lock:
+            self.sessions[token] = Session(token, kind, subject, now + self.ttl, now)
+            self.subjects.setdefault((kind, subject), set()).add(token)
+            while len(self.sessions) > self.max_sessions:
+                self.remove(next(iter(self.sessions)))
+        return token
+
+    def validate(self, token, kind=None):
+        """
+        Look up a session and record its use.
+
+        Args:
+            token (str): Session token
+            kind (str, optional): Required session kind
+
+        Returns:
+            Session: Active session, None if the token is unknown, expired
+                or of another kind
+        """
+        now = time.monotonic()
+        with self.lock:
+            session = self.sessions.get(token)
+            if session is None:
+                return None
+            if session.expires <= now or session.last_seen + self.idle_timeout <= now:
+                self.remove(token)
+                return None
+            if kind is not None and session.kind != kind:
+                return None
+            session.last_seen = now
+            self.sessions.move_to_end(token)
+            return session
+
+    def revoke(self, token):
+        """
+        End a session.
+
+        Args:
+            token (str): Session token
+
+        Returns:
+            bool: True if the session existed
+        """
+        with self.lock:
+            return self.remove(token) is not None
+
+    def revoke_subject(self, kind, subject):
+        """
+        End every session of an account or admin.
+
+        Args:
+            kind (str): 'account' or 'admin'
+            subject (str): Account number or admin username
+
+        Returns:
+            int: Number of sessions ended
+        """
+        with self.lock:
+            tokens = list(self.subjects.get((kind, subject), ()))
+            for token in tokens:
+                self.remove(token)
+            return len(tokens)
+
+    def remove(self, token):
+        """
+        Drop a session. Must be called while holding the lock.
+
+        Args:
+            token (str): Session token
+
+        Returns:
+            Session: Removed session, None if it did not exist
+        """
+        session = self.sessions.pop(token, None)
+        if session is not None:
+            key = (session.kind, session.subject)
+            tokens = self.subjects[key]
+            tokens.discard(token)
+            if not tokens:
+                del self.subjects[key]
+        return session
+
+    def sweep(self):
+        """
+        Remove sessions that have been idle for longer than the idle timeout.
+
+        Returns:
+            int: Number of sessions removed
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        removed = 0
+        with self.lock:
+            while self.sessions:
+                token, session = next(iter(self.sessions.items()))
+                if session.last_seen > cutoff:
+                    break
+                self.remove(token)
+                removed += 1
+        return removed
+
+    def run_sweeper(self):
+        """Sweep idle sessions until close is called."""
+        while not self.stopped.wait(self.sweep_interval):
+            self.sweep()
+
+    def close(self):
+        """Stop the sweeper thread."""
+        self.stopped.set()
+        if self.sweeper is not None:
+            self.sweeper.join()
+
+    def __len__(self):
+        return len(self.sessions)
\ No newline at end of file
@@ -0,0 +1,426 @@
+"""
+Account statements and bank-wide extracts.
+
+Statements summarize each account over a period: the opening and closing
+balance and the total of each transaction type. Extracts list the
+transactions themselves. Both are produced by generators that read one
+account at a time, so writing them as CSV or JSON lines never holds more
+than one account's history in memory. Histories that are not loaded are
+read from storage for the export only, and are not kept.
+
+For large banks the accounts can be split into shards of consecutive
+account numbers, and each shard written to its own pair of files by a
+pool of worker processes, which also read the shard's stored histories.
+"""
+import calendar
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from models.transaction_store import (
+    TransactionStore, TRANSACTION_TYPES, TYPE_SIGNS, LINK_FIELDS,
+    epoch_to_date, parse_date_bound
+)
+from storage.base import StaleHistoryError
+from utils.constants import STATEMENT_SHARD_SIZE
+from utils.money import format_amount
+
+# Supported export file formats
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+# Columns of a statement row
+STATEMENT_FIELDS = (
+    'account_number', 'name', 'period_start', 'period_end', 'opening_balance',
+    'closing_balance', 'deposits', 'withdrawals', 'transfers_in', 'transfers_out',
+    'transaction_count'
+)
+
+# Statement column holding the total of each transaction type
+TOTAL_FIELDS = dict(zip(TRANSACTION_TYPES,
+                        ('deposits', 'withdrawals', 'transfers_in', 'transfers_out')))
+
+# Columns of a transaction row
+TRANSACTION_FIELDS = ('account_number', 'date', 'type', 'amount', 'balance') + LINK_FIELDS
+
+def month_bounds(month):
+    """
+    Get the first and last second of a calendar month.
+
+    Args:
+        month (str): Month as "YYYY-MM"
+
+    Returns:
+        tuple: First and last epoch second of the month
+
+    Raises:
+        ValueError: If the month is not in "YYYY-MM" form
+    """
+    try:
+        year, number = (int(part) for part in month.split('-'))
+        days = calendar.monthrange(year, number)[1]
+    except (ValueError, calendar.IllegalMonthError):
+        raise ValueError(f"Invalid month: {month}")
+    start = parse_date_bound(f"{year:04d}-{number:02d}-01")
+    return start, start + days * 86400 - 1
+
+def account_history(banking_system, account, load=True):
+    """
+    Get an account's history without keeping an unloaded one in memory.
+
+    The account is locked while its history is read, from memory or from
+    storage, as in BankingSystem's history reads.
+
+    Args:
+        banking_system (BankingSystem): System owning the account
+        account (BankAccount): Account to read
+        load (bool, optional): Read a history that is not loaded from
+            storage; otherwise None is returned for it
+
+    Returns:
+        TransactionStore: The account's history, or None
+    """
+    with account.lock:
+        if account.transactions_loaded():
+            return account.transactions
+        if not load:
+            return None
+        return TransactionStore(banking_system.load_transactions(account.account_number))
+
+def period_positions(store, start=None, end=None):
+    """
+    Find the positions of a store's transactions in a period.
+
+    Args:
+        store (TransactionStore): History to read
+        start (int, optional): First epoch second of the period
+        end (int, optional): Last epoch second of the period
+
+    Yields:
+        int: Positions in the period, oldest first
+    """
+    length = len(store)
+    if store.ordered:
+        low, high = store.span(start, end, length)
+        yield from range(low, high)
+        return
+    for position in range(length):
+        timestamp = store.timestamps[position]
+        if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+            yield position
+
+def summarize_period(store, start=None, end=None):
+    """
+    Compute the balances and totals of a store over a period.
+
+    Args:
+        store (TransactionStore): History to summarize
+        start (int, optional): First epoch second of the period
+        end (int, optional): Last epoch second of the period
+
+    Returns:
+        dict: Opening and closing balance, total per transaction type and
+            number of transactions, amounts in cents
+    """
+    totals = dict.fromkeys(TRANSACTION_TYPES, 0)
+    opening = closing = None
+    count = 0
+    for position in period_positions(store, start, end):
+        type_code = store.types[position]
+        amount = store.amounts[position]
+        if opening is None:
+            opening = store.balances[position] - TYPE_SIGNS[type_code] * amount
+        closing = store.balances[position]
+        totals[TRANSACTION_TYPES[type_code]] += amount
+        count += 1
+    if opening is None:
+        opening = closing = balance_before(store, start)
+    return {'opening': opening, 'closing': closing, 'totals': totals, 'count': count}
+
+def balance_before(store, start):
+    """
+    Get the balance of a store just before a moment.
+
+    Args:
+        store (TransactionStore): History to read
+        start (int, optional): Epoch second, None for the end of the history
+
+    Returns:
+        int: Balance in cents after the last earlier transaction, 0 if none
+    """
+    length = len(store)
+    if start is None:
+        return store.balances[length - 1] if length else 0
+    if store.ordered:
+        position = store.span(start, None, length)[0] - 1
+    else:
+        earlier = [p for p in range(length) if store.timestamps[p] < start]
+        position = max(earlier, key=lambda p: store.timestamps[p], default=-1)
+    return store.balances[position] if position >= 0 else 0
+
+def statement_row(account_number, name, store, start=None, end=None):
+    """
+    Build the statement of one account for a period.
+
+    Args:
+        account_number (str): Account number
+        name (str): Account holder's name
+        store (TransactionStore): The account's history
+        start (int, optional): First epoch second of the period
+        end (int, optional): Last epoch second of the period
+
+    Returns:
+        dict: Row with the STATEMENT_FIELDS, amounts as decimal strings
+    """
+    summary = summarize_period(store, start, end)
+    row = {
+        'account_number': account_number,
+        'name': name,
+        'period_start': epoch_to_date(start) if start is not None else '',
+        'period_end': epoch_to_date(end) if end is not None else '',
+        'opening_balance': format_amount(summary['opening']),
+        'closing_balance': format_amount(summary['closing'])
+    }
+    for tx_type, field in TOTAL_FIELDS.items():
+        row[field] = format_amount(summary['totals'][tx_type])
+    row['transaction_count'] = summary['count']
+    return row
+
+def transaction_rows(account_number, store, start=None, end=None):
+    """
+    Generate the transaction rows of one account for a period.
+
+    Args:
+        account_number (str): Account number
+        store (TransactionStore): The account's history
+        start (int, optional): First epoch second of the period
+        end (int, optional): Last epoch second of the period
+
+    Yields:
+        dict: Rows with the TRANSACTION_FIELDS, amounts as decimal strings
+    """
+    for position in period_positions(store, start, end):
+        transaction = store.get(position)
+        yield {
+            'account_number': account_number,
+            'date': transaction['date'],
+            'type': transaction['type'],
+            'amount': format_amount(transaction['amount']),
+            'balance': format_amount(transaction['balance']),
+            'transfer_id': transaction.get('transfer_id', ''),
+            'counterparty': transaction.get('counterparty', '')
+        }
+
+def iter_accounts(banking_system, load=True):
+    """
+    Generate the accounts with their histories, in account number order.
+
+    Args:
+        banking_system (BankingSystem): System to read
+        load (bool, optional): Read histories that are not loaded from
+            storage; otherwise None is yielded in their place
+
+    Yields:
+        tuple: Account number, holder's name and TransactionStore
+    """
+    accounts = banking_system.accounts
+    for account_number in sorted(list(accounts), key=lambda number: (len(number), number)):
+        account = accounts.get(account_number)
+        if account:
+            yield account_number, account.name, account_history(banking_system, account, load)
+
+def load_members(banking_system, members):
+    """
+    Read the stored histories of a shard in this process.
+
+    Args:
+        banking_system (BankingSystem): System to read
+        members (list): (account number, name, TransactionStore or None)
+            tuples
+
+    Returns:
+        list: (account number, name, TransactionStore) tuples
+    """
+    loaded = []
+    for number, name, store in members:
+        if store is None:
+            account = banking_system.accounts.get(number)
+            store = account_history(banking_system, account) if account else TransactionStore()
+        loaded.append((number, name, store))
+    return loaded
+
+def iter_statements(banking_system, start=None, end=None):
+    """
+    Generate the statements of all accounts for a period.
+
+    Args:
+        banking_system (BankingSystem): System to read
+        start (int, optional): First epoch second of the period
+        end (int, optional): Last epoch second of the period
+
+    Yields:
+        dict: Statement rows, in account number order
+    """
+    for account_number, name, store in iter_accounts(banking_system):
+        yield statement_row(account_number, name, store, start, end)
+
+def iter_transactions(banking_system, start=None, end=None):
+    """
+    Generate the transactions of all accounts for a period.
+
+    Args:
+        banking_system (BankingSystem): System to read
+        start (int, optional): First epoch second of the period
+        end (int, optional): Last epoch second of the period
+
+    Yields:
+        dict: Transaction rows, by account number and then oldest first
+    """
+    for account_number, _, store in iter_accounts(banking_system):
+        yield from transaction_rows(account_number, store, start, end)
+
+def write_rows(rows, file, file_format, fields):
+    """
+    Write rows to a file as they are generated.
+
+    Args:
+        rows (iterable): Row dictionaries
+        file (file): Text file opened with newline=''
+        file_format (str): 'csv' or 'jsonl'
+        fields (tuple): Column names, in order
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    count = 0
+    if file_format == 'csv':
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif file_format == 'jsonl':
+        for row in rows:
+            file.write(json.dumps(row, separators=(',', ':')) + '\n')
+            count += 1
+    else:
+        raise ValueError(f"Unknown export format: {file_format}")
+    return count
+
+def write_shard(directory, shard, file_format, start, end, accounts, reader=None):
+    """
+    Write the statements and transactions of one shard of accounts.
+
+    Runs in a worker process in parallel mode, so it only uses its
+    arguments. Histories that were not loaded are read with the reader
+    first, so the worker rather than the parent does their I/O.
+
+    Args:
+        directory (str): Output directory
+        shard (int): Shard number, used in the file names
+        file_format (str): 'csv' or 'jsonl'
+        start (int): First epoch second of the period, or None
+        end (int): Last epoch second of the period, or None
+        accounts (list): (account number, name, TransactionStore) tuples,
+            with None for a history to read with the reader
+        reader (optional): History reader from BankingSystem.history_reader
+
+    Returns:
+        tuple: Number of statements and of transactions written
+
+    Raises:
+        StaleHistoryError: If the histories were moved since the reader
+            was made
+    """
+    if reader:
+        try:
+            accounts = [
+                (number, name,
+                 store if store is not None else TransactionStore(reader.read(number)))
+                for number, name, store in accounts
+            ]
+        finally:
+            reader.close()
+    statements_path = os.path.join(directory, f"statements-{shard:04d}.{file_format}")
+    transactions_path = os.path.join(directory, f"transactions-{shard:04d}.{file_format}")
+    with open(statements_path, 'w', encoding='utf-8', newline='') as file:
+        statements = write_rows(
+            (statement_row(number, name, store, start, end) for number, name, store in accounts),
+            file, file_format, STATEMENT_FIELDS)
+    with open(transactions_path, 'w', encoding='utf-8', newline='') as file:
+        transactions = write_rows(
+            itertools.chain.from_iterable(
+                transaction_rows(number, store, start, end) for number, _, store in accounts),
+            file, file_format, TRANSACTION_FIELDS)
+    return statements, transactions
+
+def export_statements(banking_system, directory, file_format='csv', start=None, end=None,
+                      workers=1, shard_size=STATEMENT_SHARD_SIZE):
+    """
+    Write the statements and transactions of all accounts for a period.
+
+    Accounts are taken in account number order and split into shards of
+    shard_size accounts; shard n is written to statements-n and
+    transactions-n files. With several workers, shards are written by a
+    pool of processes. Loaded histories are sent to the worker in their
+    compact column form; the others are located with the storage backend's
+    history reader and read by the worker itself, so the storage reads run
+    in parallel too. A shard whose stored histories were moved by a
+    checkpoint meanwhile is written again here. At most two shards per
+    worker are in flight, so memory stays bounded by the shards being
+    written.
+
+    Args:
+        banking_system (BankingSystem): System to read
+        directory (str): Output directory, created if needed
+        file_format (str, optional): 'csv' or 'jsonl'
+        start (int, optional): First epoch second of the period
+        end (int, optional): Last epoch second of the period
+        workers (int, optional): Worker processes, 1 to write in this
+            process
+        shard_size (int, optional): Accounts per shard
+
+    Returns:
+        tuple: Number of statements and of transactions written
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {file_format}")
+    os.makedirs(directory, exist_ok=True)
+    accounts = iter_accounts(banking_system, load=workers <= 1)
+    shards = enumerate(iter(lambda: list(itertools.islice(accounts, shard_size)), []))
+
+    if workers <= 1:
+        written = [write_shard(directory, shard, file_format, start, end, members)
+                   for shard, members in shards]
+    else:
+        written = []
+
+        def collect(done):
+            for future in done:
+                shard, members = pending.pop(future)
+                try:
+                    written.append(future.result())
+                except StaleHistoryError:
+                    written.append(write_shard(directory, shard, file_format, start, end,
+                                               load_members(banking_system, members)))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+            for shard, members in shards:
+                if len(pending) >= 2 * workers:
+                    collect(wait(pending, return_when=FIRST_COMPLETED)[0])
+                unloaded = [number for number, _, store in members if store is None]
+                reader = banking_system.history_reader(unloaded) if unloaded else None
+                if unloaded and reader is None:
+                    members = load_members(banking_system, members)
+                future = executor.submit(
+                    write_shard, directory, shard, file_format, start, end, members, reader)
+                pending[future] = (shard, members)
+            collect(list(pending))
+    return sum(count for count, _ in written), sum(count for _, count in written)
\ No newline at end of file
@@ -0,0 +1,415 @@
+import bisect
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from models.admin_log import AdminLog
+from utils.constants import (
+    AUDIT_SEGMENT_MAX_BYTES, AUDIT_SEGMENT_MAX_AGE, AUDIT_INDEX_INTERVAL
+)
+
+# Format of the AdminLog 'timestamp' field
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+class AuditSegment:
+    """
+    One JSON lines file of the audit log and its sparse index.
+
+    The timestamp, byte offset and position of every index_interval-th
+    record are appended to a companion index file, so a time range query
+    can seek close to its start instead of reading the segment from the
+    beginning.
+
+    Attributes:
+        number (int): Position of the segment in the log
+        path (str): Path to the segment file
+        index_path (str): Path to the index file
+        index (list): (timestamp, byte offset, position) of indexed
+            records, oldest first
+        count (int): Number of records in the segment
+        size (int): Size of the segment file in bytes
+        last_timestamp (str): Timestamp of the newest record
+    """
+
+    def __init__(self, directory, number):
+        """
+        Open a segment, recovering its state from the files on disk.
+
+        Args:
+            directory (str): Directory holding the audit log
+            number (int): Position of the segment in the log
+        """
+        self.number = number
+        self.path = os.path.join(directory, f"{number:06d}.jsonl")
+        self.index_path = os.path.join(directory, f"{number:06d}.idx")
+        self.index = []
+        self.count = 0
+        self.size = 0
+        self.last_timestamp = None
+        self.recover()
+
+    def recover(self):
+        """
+        Rebuild the segment state from its index and the records after it.
+
+        Only the records after the last index entry are read. A trailing
+        incomplete line, left by a write interrupted by a crash, is cut off
+        so new records start on a clean line, and index entries pointing
+        past the last complete record are dropped.
+        """
+        entries = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entries.append(tuple(json.loads(line)))
+                    except ValueError:
+                        break
+        indexed = len(entries)
+
+        while True:
+            timestamp, offset, position = entries[-1] if entries else (None, 0, 0)
+            count, size, last_timestamp = self.scan(offset)
+            if count or not entries:
+                break
+            entries.pop()
+
+        self.index = entries
+        self.count = position + count
+        self.size = size
+        self.last_timestamp = last_timestamp
+        if os.path.exists(self.path) and os.path.getsize(self.path) > size:
+            with open(self.path, 'r+b') as file:
+                file.truncate(size)
+        if len(entries) < indexed:
+            with open(self.index_path, 'w', encoding='utf-8') as file:
+                file.writelines(json.dumps(list(entry)) + '\n' for entry in entries)
+
+    def scan(self, offset):
+        """
+        Read the complete records from a byte offset to the end of the file.
+
+        Args:
+            offset (int): Byte offset of a record
+
+        Returns:
+            tuple: Number of records, offset after the last complete record
+                and timestamp of the last complete record
+        """
+        count = 0
+        last_timestamp = None
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as file:
+                file.seek(offset)
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        last_timestamp = json.loads(line)['timestamp']
+                    except (ValueError, KeyError):
+                        break
+                    count += 1
+                    offset += len(line)
+        return count, offset, last_timestamp
+
+    def first_timestamp(self):
+        """
+        Get the timestamp of the oldest record.
+
+        Returns:
+            str: Timestamp, None if the segment is empty
+        """
+        return self.index[0][0] if self.index else None
+
+    def read_from(self, position):
+        """
+        Read the records from a position to the end of the segment.
+
+        Args:
+            position (int): Position of the first record in the segment
+
+        Yields:
+            dict: Records in chronological order
+        """
+        entry = bisect.bisect_right(self.index, position, key=lambda entry: entry[2]) - 1
+        offset, current = self.index[entry][1:] if entry >= 0 else (0, 0)
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            for line in file:
+                if offset >= self.size:
+                    break
+                offset += len(line)
+                if current >= position:
+                    yield json.loads(line)
+                current += 1
+
+    def read(self, start=None, end=None):
+        """
+        Read the records of a time range.
+
+        Args:
+            start (str, optional): Earliest timestamp to include
+            end (str, optional): Latest timestamp to include
+
+        Yields:
+            dict: Records in chronological order
+        """
+        offset = 0
+        if start is not None:
+            position = bisect.bisect_left(self.index, (start,)) - 1
+            if position >= 0:
+                offset = self.index[position][1]
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            for line in file:
+                if offset >= self.size:
+                    break
+                offset += len(line)
+                record = json.loads(line)
+                if end is not None and record['timestamp'] > end:
+                    break
+                if start is None or record['timestamp'] >= start:
+                    yield record
+
+class AuditLog:
+    """
+    Append-only store of administrative action logs.
+
+    Logs are written as JSON lines into numbered segment files, so
+    recording an action costs one appended line however long the history
+    is. A new segment is started once the current one exceeds max_bytes or
+    spans more than max_age seconds. Queries skip segments outside the
+    requested time range and use each segment's sparse index to seek to
+    the start of the range.
+
+    Logs are expected in chronological order, as AdminLog timestamps are
+    taken when the action happens. Appends and queries may come from
+    different threads and are serialized by a lock.
+
+    Attributes:
+        directory (str): Directory holding the segment files
+        max_bytes (int): Segment size that triggers rotation
+        max_age (int): Segment time span in seconds that triggers rotation
+        index_interval (int): Records between sparse index entries
+        segments (list): AuditSegment instances, oldest first
+        lock (threading.RLock): Serializes appends and queries
+    """
+
+    def __init__(self, directory, max_bytes=AUDIT_SEGMENT_MAX_BYTES,
+                 max_age=AUDIT_SEGMENT_MAX_AGE, index_interval=AUDIT_INDEX_INTERVAL):
+        """
+        Open the audit log in a directory.
+
+        Args:
+            directory (str): Directory holding the segment files
+            max_bytes (int, optional): Segment size that triggers rotation
+            max_age (int, optional): Segment time span in seconds that
+                triggers rotation
+            index_interval (int, optional): Records between index entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.index_interval = index_interval
+        self.file = None
+        self.index_file = None
+        self.lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        numbers = sorted(
+            int(name[:-len('.jsonl')]) for name in os.listdir(directory)
+            if name.endswith('.jsonl') and name[:-len('.jsonl')].isdigit()
+        )
+        self.segments = [AuditSegment(directory, number) for number in numbers]
+
+    def is_empty(self):
+        """
+        Check whether any logs have been recorded.
+
+        Returns:
+            bool: True if the log holds no records
+        """
+        return not any(segment.count for segment in self.segments)
+
+    def count(self):
+        """
+        Count the recorded logs.
+
+        Returns:
+            int: Number of logs
+        """
+        with self.lock:
+            return sum(segment.count for segment in self.segments)
+
+    def read_range(self, start, count):
+        """
+        Read consecutive log entries by position.
+
+        Whole segments before the range are skipped using their record
+        counts, and the sparse index is used to seek inside a segment.
+
+        Args:
+            start (int): Position of the first log, 0 being the oldest
+            count (int): Maximum number of logs
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        with self.lock:
+            self.flush()
+            results = []
+            for segment in self.segments:
+                if start >= segment.count:
+                    start -= segment.count
+                    continue
+                for record in segment.read_from(start):
+                    if len(results) == count:
+                        return results
+                    results.append(AdminLog.from_dict(record))
+                start = 0
+            return results
+
+    def append(self, log):
+        """
+        Append a log entry.
+
+        Args:
+            log (AdminLog): Log entry to append
+        """
+        self.append_many([log])
+
+    def append_many(self, logs):
+        """
+        Append several log entries and force them to stable storage.
+
+        Args:
+            logs (iterable): AdminLog entries in chronological order
+        """
+        with self.lock:
+            written = False
+            for log in logs:
+                data = log.to_dict()
+                segment = self.active_segment(data['timestamp'])
+                line = (json.dumps(data, separators=(',', ':')) + '\n').encode('utf-8')
+                self.file.write(line)
+                if segment.count % self.index_interval == 0:
+                    entry = (data['timestamp'], segment.size, segment.count)
+                    segment.index.append(entry)
+                    self.index_file.write(json.dumps(list(entry)) + '\n')
+                segment.size += len(line)
+                segment.count += 1
+                segment.last_timestamp = data['timestamp']
+                written = True
+            if written:
+                self.sync()
+
+    def active_segment(self, timestamp):
+        """
+        Get the segment to append to, rotating when it is full or too old.
+
+        Args:
+            timestamp (str): Timestamp of the record about to be written
+
+        Returns:
+            AuditSegment: Segment with its files open for appending
+        """
+        segment = self.segments[-1] if self.segments else None
+        if segment and segment.count and (
+                segment.size >= self.max_bytes
+                or seconds_between(segment.first_timestamp(), timestamp) > self.max_age):
+            self.close()
+            segment = None
+        if segment is None:
+            number = self.segments[-1].number + 1 if self.segments else 1
+            segment = AuditSegment(self.directory, number)
+            self.segments.append(segment)
+        if self.file is None:
+            self.file = open(segment.path, 'ab')
+            self.index_file = open(segment.index_path, 'a', encoding='utf-8')
+        return segment
+
+    def query(self, admin_username=None, action=None, start=None, end=None, limit=None):
+        """
+        Find log entries matching all given conditions.
+
+        Args:
+            admin_username (str, optional): Only logs of this admin
+            action (str, optional): Only logs of this action
+            start (str, optional): Earliest timestamp to include
+            end (str, optional): Latest timestamp to include
+            limit (int, optional): Return only the newest matching entries
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        with self.lock:
+            self.flush()
+            results = []
+            for segment in reversed(self.segments):
+                if not segment.count:
+                    continue
+                if end is not None and segment.first_timestamp() > end:
+                    continue
+                if start is not None and segment.last_timestamp < start:
+                    break
+                matches = [
+                    AdminLog.from_dict(record)
+                    for record in segment.read(start, end)
+                    if (admin_username is None or record['admin_username'] == admin_username)
+                    and (action is None or record['action'] == action)
+                ]
+                results[:0] = matches
+                if limit is not None and len(results) >= limit:
+                    return results[len(results) - limit:]
+            return results
+
+    def replace(self, logs):
+        """
+        Replace all log entries.
+
+        Args:
+            logs (iterable): AdminLog entries in chronological order
+        """
+        with self.lock:
+            self.close()
+            shutil.rmtree(self.directory)
+            os.makedirs(self.directory)
+            self.segments = []
+            self.append_many(logs)
+
+    def flush(self):
+        """Hand written records to the operating system."""
+        if self.file is not None:
+            self.file.flush()
+            self.index_file.flush()
+
+    def sync(self):
+        """Force written records to stable storage."""
+        if self.file is not None:
+            self.flush()
+            os.fsync(self.file.fileno())
+            os.fsync(self.index_file.fileno())
+
+    def close(self):
+        """Sync and close the active segment files."""
+        with self.lock:
+            if self.file is not None:
+                self.sync()
+                self.file.close()
+                self.index_file.close()
+                self.file = None
+                self.index_file = None
+
+def seconds_between(earlier, later):
+    """
+    Compute the number of seconds between two log timestamps.
+
+    Args:
+        earlier (str): Earlier timestamp
+        later (str): Later timestamp
+
+    Returns:
+        float: Seconds from earlier to later
+    """
+    return (datetime.strptime(later, TIMESTAMP_FORMAT)
+            - datetime.strptime(earlier, TIMESTAMP_FORMAT)).total_seconds()
\ No newline at end of file
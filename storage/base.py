@@ -0,0 +1,241 @@
+class StaleHistoryError(Exception):
+    """Raised by a history reader when the histories it locates were rewritten."""
+
+class StorageBackend:
+    """
+    Interface for persisting accounts, administrators and audit logs.
+
+    Services talk to a storage backend instead of reading and writing
+    files directly, so the same BankingSystem and AdminService can run on
+    whole-file JSON or on a database. Backends that can update single rows
+    should do so in save_account, delete_account, append_transactions and
+    append_log instead of rewriting the whole dataset.
+    """
+
+    def load_accounts(self):
+        """
+        Load all bank accounts.
+
+        Returns:
+            dict: Account number to BankAccount mapping
+        """
+        raise NotImplementedError
+
+    def save_accounts(self, accounts):
+        """
+        Persist a full snapshot of all accounts.
+
+        Args:
+            accounts (dict): Account number to BankAccount mapping
+        """
+        raise NotImplementedError
+
+    def save_account(self, account):
+        """
+        Insert or update the header of a single account.
+
+        Args:
+            account (BankAccount): Account to persist
+        """
+        raise NotImplementedError
+
+    def delete_account(self, account_number):
+        """
+        Delete an account together with its transaction history.
+
+        Args:
+            account_number (str): Account number to delete
+        """
+        raise NotImplementedError
+
+    def append_transactions(self, entries, durable=False):
+        """
+        Persist transactions that have been applied to accounts.
+
+        All entries are committed together.
+
+        Args:
+            entries (list): (BankAccount, transaction dict) pairs
+            durable (bool, optional): Force the commit to stable storage
+        """
+        raise NotImplementedError
+
+    def load_transactions(self, account_number):
+        """
+        Load the full transaction history of one account.
+
+        Args:
+            account_number (str): Account number to load
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        raise NotImplementedError
+
+    def count_transactions(self, account_number):
+        """
+        Count the transactions of one account.
+
+        Args:
+            account_number (str): Account number to count
+
+        Returns:
+            int: Number of transactions
+        """
+        raise NotImplementedError
+
+    def load_transaction_range(self, account_number, start, count):
+        """
+        Load consecutive transactions of one account by position.
+
+        Args:
+            account_number (str): Account number to load
+            start (int): Position of the first transaction
+            count (int): Maximum number of transactions
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        raise NotImplementedError
+
+    def load_transaction_page(self, account_number, cursor=None, limit=50):
+        """
+        Load a page of one account's transaction history, newest first.
+
+        Cursors are positions in the account history, so they are
+        interchangeable with BankAccount.get_transaction_page.
+
+        Args:
+            account_number (str): Account number to load
+            cursor (int, optional): Position returned by the previous page.
+                Defaults to the newest transaction
+            limit (int, optional): Maximum number of transactions
+
+        Returns:
+            tuple: List of transactions and the cursor of the next older
+                page, None when there are no older transactions
+        """
+        raise NotImplementedError
+
+    def history_reader(self, account_numbers):
+        """
+        Locate stored histories so another process can read them.
+
+        The reader is picklable and only touches storage in its read
+        method, which takes an account number and returns the same list as
+        load_transactions, raising StaleHistoryError if the histories were
+        moved since the reader was made. Backends that can only read
+        histories in this process return None.
+
+        Args:
+            account_numbers (list): Accounts whose histories will be read
+
+        Returns:
+            Reader of the histories, or None
+        """
+        return None
+
+    def load_metadata(self):
+        """
+        Load bookkeeping values stored alongside the account data.
+
+        Returns:
+            dict: Metadata values
+        """
+        raise NotImplementedError
+
+    def save_metadata(self, meta):
+        """
+        Update bookkeeping values stored alongside the account data.
+
+        Args:
+            meta (dict): Metadata values to set
+        """
+        raise NotImplementedError
+
+    def load_admins(self):
+        """
+        Load all administrator accounts.
+
+        Returns:
+            dict: Username to Admin mapping
+        """
+        raise NotImplementedError
+
+    def save_admins(self, admins):
+        """
+        Persist all administrator accounts.
+
+        Args:
+            admins (dict): Username to Admin mapping
+        """
+        raise NotImplementedError
+
+    def load_logs(self):
+        """
+        Load all administrative action logs.
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        raise NotImplementedError
+
+    def query_logs(self, admin_username=None, action=None, start=None, end=None,
+                   limit=None):
+        """
+        Find administrative action logs matching all given conditions.
+
+        Args:
+            admin_username (str, optional): Only logs of this admin
+            action (str, optional): Only logs of this action
+            start (str, optional): Earliest timestamp to include
+            end (str, optional): Latest timestamp to include
+            limit (int, optional): Return only the newest matching logs
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        raise NotImplementedError
+
+    def count_logs(self):
+        """
+        Count all administrative action logs.
+
+        Returns:
+            int: Number of logs
+        """
+        raise NotImplementedError
+
+    def load_log_range(self, start, count):
+        """
+        Load consecutive administrative action logs by position.
+
+        Args:
+            start (int): Position of the first log, 0 being the oldest
+            count (int): Maximum number of logs
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        raise NotImplementedError
+
+    def append_log(self, log):
+        """
+        Persist a single administrative action log.
+
+        Args:
+            log (AdminLog): Log entry to append
+        """
+        raise NotImplementedError
+
+    def save_logs(self, logs):
+        """
+        Replace all administrative action logs.
+
+        Args:
+            logs (list): AdminLog entries in chronological order
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Flush pending writes and release any open resources."""
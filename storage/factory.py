@@ -0,0 +1,23 @@
+from storage.json_storage import JsonStorage
+from storage.sqlite_storage import SqliteStorage
+from utils.constants import STORAGE_BACKEND
+
+def create_storage(backend=STORAGE_BACKEND):
+    """
+    Create the storage backend selected by name.
+
+    Args:
+        backend (str, optional): 'json' or 'sqlite'. Defaults to the
+            STORAGE_BACKEND setting
+
+    Returns:
+        StorageBackend: New storage backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == 'json':
+        return JsonStorage()
+    if backend == 'sqlite':
+        return SqliteStorage()
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,875 @@
+import json
+import os
+import threading
+from models.admin import Admin
+from models.admin_log import AdminLog
+from models.bank_account import BankAccount
+from models.transaction_store import transaction_from_dict, transaction_to_dict
+from storage.audit_log import AuditLog
+from storage.base import StorageBackend, StaleHistoryError
+from storage.journal import TransactionJournal
+from storage.json_stream import iter_json_object, read_json_value, write_json_object
+from utils.money import to_cents, from_cents
+from utils.constants import (
+    DATA_FILE, JOURNAL_FILE, ADMIN_FILE, ADMIN_LOG_FILE,
+    USE_JOURNAL, CHECKPOINT_INTERVAL, META_KEY, SNAPSHOT_SHARD_SIZE
+)
+
+# Journal record fields that are not part of the transaction itself
+JOURNAL_FIELDS = ('seq', 'op', 'account', 'position')
+
+# File in the snapshot directory holding metadata; written last by a checkpoint
+SNAPSHOT_META_FILE = 'meta.json'
+
+# Suffix of the file next to each shard locating the histories inside it
+SHARD_INDEX_SUFFIX = '.index.json'
+
+class JsonHistoryReader:
+    """
+    Reads account histories from shard files in another process.
+
+    Attributes:
+        spans (dict): Account number to (shard path, offset, length)
+        files (dict): Shard path to the (size, mtime_ns, inode) it had
+            when the spans were taken
+        unsaved (dict): Account number to transactions journaled since its
+            shard was written
+    """
+
+    def __init__(self, spans, files, unsaved):
+        """
+        Initialize the reader.
+
+        Args:
+            spans (dict): Account number to (shard path, offset, length)
+            files (dict): Shard path to its (size, mtime_ns, inode)
+            unsaved (dict): Account number to unsaved transactions
+        """
+        self.spans = spans
+        self.files = files
+        self.unsaved = unsaved
+
+    def read(self, account_number):
+        """
+        Read an account's history.
+
+        Args:
+            account_number (str): Account number to read
+
+        Returns:
+            list: Transactions, oldest first
+
+        Raises:
+            StaleHistoryError: If the shard was rewritten since the spans
+                were taken
+        """
+        transactions = []
+        span = self.spans.get(account_number)
+        if span:
+            path, offset, length = span
+            try:
+                file = open(path, 'rb')
+            except FileNotFoundError:
+                raise StaleHistoryError(f"Shard removed: {path}")
+            with file:
+                stat = os.fstat(file.fileno())
+                if (stat.st_size, stat.st_mtime_ns, stat.st_ino) != self.files[path]:
+                    raise StaleHistoryError(f"Shard rewritten: {path}")
+                file.seek(offset)
+                data = json.loads(file.read(length))
+                transactions = [transaction_from_dict(transaction)
+                                for transaction in data['transactions']]
+        return transactions + self.unsaved.get(account_number, [])
+
+    def close(self):
+        """Release the reader; shard files are only open while read."""
+
+class JsonStorage(StorageBackend):
+    """
+    Storage backend keeping each dataset in JSON files.
+
+    The account snapshot is split into shard files by account number range,
+    shard_size consecutive numbers per file, next to a metadata file. A
+    checkpoint only rewrites the shards holding accounts that changed since
+    they were last written (tracked by BankAccount.dirty) or that lost an
+    account, then writes the metadata file last. Account mutations are
+    appended to a write-ahead journal and folded into the snapshot every
+    checkpoint_interval records. Without a journal every mutation
+    checkpoints, which then costs one shard rather than the whole dataset.
+
+    Next to each shard an index file holds the headers of its accounts and
+    the byte offset and length of each account within the shard. Startup
+    reads only the indexes, and an account's history is read from its
+    shard the first time it is needed, as with SQLite. Journaled
+    transactions of histories that are still on disk are kept in memory
+    until their shard is written again. An index is only trusted while
+    the size, modification time and inode of its shard match the ones it
+    recorded; shards without a matching index are read in full and
+    indexed again by the next checkpoint.
+
+    A single-file snapshot written by earlier versions is loaded when no
+    sharded snapshot exists yet, and converted by the next checkpoint; the
+    old file is left in place.
+
+    The accounts dictionary is shared with the caller, which may already
+    have applied mutations that are still waiting to be journaled when a
+    checkpoint is taken. Transaction records therefore carry their
+    position in the account history, and replay skips records the
+    snapshot already contains. The same rule makes a checkpoint that was
+    interrupted after writing only some shards safe to replay.
+
+    Attributes:
+        data_file (str): Path to the single-file snapshot of earlier versions
+        snapshot_dir (str): Directory holding the snapshot shards
+        shard_size (int): Consecutive account numbers per shard
+        admin_file (str): Path to admin credentials file
+        log_file (str): Path to the admin logs file of earlier versions
+        audit_log (AuditLog): Append-only admin audit log
+        journal (TransactionJournal): Write-ahead journal, None if disabled
+        journal_seq (int): Sequence number of the last journaled record
+        checkpoint_interval (int): Journaled records between snapshots
+        accounts (dict): Accounts covered by the snapshot and journal
+        loaded (bool): Accounts have been loaded or saved; until then the
+            journal belongs to a snapshot this instance has not read, and
+            close leaves both untouched
+        positions (dict): Number of transactions journaled per account
+        histories (dict): Account number to (shard index, offset, length)
+            of the account in its shard file
+        unsaved (dict): Account number to transactions journaled since its
+            shard was written, for histories that are not loaded
+        meta (dict): Metadata stored in the snapshot
+        dirty_shards (set): Shards that lost an account since the last
+            checkpoint, or have no index
+        lock (threading.RLock): Serializes shard writes with history reads
+    """
+
+    def __init__(self, data_file=DATA_FILE, journal_file=JOURNAL_FILE,
+                 admin_file=ADMIN_FILE, log_file=ADMIN_LOG_FILE,
+                 use_journal=USE_JOURNAL, checkpoint_interval=CHECKPOINT_INTERVAL,
+                 log_dir=None, snapshot_dir=None, shard_size=SNAPSHOT_SHARD_SIZE):
+        """
+        Initialize the JSON storage backend.
+
+        Args:
+            data_file (str, optional): Path to the single-file snapshot of
+                earlier versions, loaded when no sharded snapshot exists
+            journal_file (str, optional): Path to the transaction journal
+            admin_file (str, optional): Path to admin credentials file
+            log_file (str, optional): Path to the admin logs file of
+                earlier versions, imported into an empty audit log
+            use_journal (bool, optional): Journal account mutations instead
+                of rewriting the snapshot on every operation
+            checkpoint_interval (int, optional): Journaled records between
+                full snapshot checkpoints
+            log_dir (str, optional): Directory of the admin audit log.
+                Defaults to log_file without its extension
+            snapshot_dir (str, optional): Directory of the sharded account
+                snapshot. Defaults to data_file without its extension
+            shard_size (int, optional): Consecutive account numbers per
+                shard of a new snapshot; an existing snapshot keeps its own
+        """
+        self.data_file = data_file
+        self.snapshot_dir = snapshot_dir or os.path.splitext(data_file)[0]
+        self.shard_size = shard_size
+        self.admin_file = admin_file
+        self.log_file = log_file
+        self.journal = TransactionJournal(journal_file) if use_journal else None
+        self.journal_seq = 0
+        self.checkpoint_interval = checkpoint_interval
+        self.uncheckpointed = 0
+        self.accounts = {}
+        self.loaded = False
+        self.positions = {}
+        self.histories = {}
+        self.unsaved = {}
+        self.meta = {}
+        self.dirty_shards = set()
+        self.lock = threading.RLock()
+        self.audit_log = AuditLog(log_dir or os.path.splitext(log_file)[0])
+        self.import_legacy_logs()
+
+    def import_legacy_logs(self):
+        """
+        Import the whole-file admin log of earlier versions.
+
+        The logs are copied into the audit log the first time it is opened
+        empty; the old file is left in place.
+        """
+        if self.audit_log.is_empty() and os.path.exists(self.log_file):
+            with open(self.log_file, 'r') as file:
+                data = json.load(file)
+            self.audit_log.append_many(AdminLog.from_dict(log_data) for log_data in data)
+
+    def load_accounts(self):
+        """
+        Load the account snapshot and replay the journal onto it.
+
+        Accounts of indexed shards are created from the index without
+        their histories. Other shards are streamed one account at a time,
+        so only a single account's raw data is held in memory alongside the
+        loaded accounts.
+
+        A non-empty journal is folded into a fresh checkpoint so the next
+        start begins from a clean state.
+
+        Returns:
+            dict: Account number to BankAccount mapping
+        """
+        meta_file = os.path.join(self.snapshot_dir, SNAPSHOT_META_FILE)
+        if os.path.exists(meta_file):
+            self.accounts = {}
+            self.positions = {}
+            with open(meta_file, 'r') as file:
+                self.meta = json.load(file)
+            self.journal_seq = self.meta.pop('journal_seq', 0)
+            self.shard_size = self.meta.pop('shard_size', self.shard_size)
+            for index in self.shard_indices():
+                if self.load_shard_index(index):
+                    continue
+                with open(self.shard_path(index), 'r') as file:
+                    for acc_num, acc_data in iter_json_object(file):
+                        account = BankAccount.from_dict(acc_data)
+                        account.dirty = False
+                        self.accounts[acc_num] = account
+                        self.positions[acc_num] = len(account.transactions)
+                self.dirty_shards.add(index)
+        elif os.path.exists(self.data_file):
+            self.accounts = {}
+            self.positions = {}
+            with open(self.data_file, 'r') as file:
+                for acc_num, acc_data in iter_json_object(file):
+                    if acc_num == META_KEY:
+                        self.meta = acc_data
+                        self.journal_seq = self.meta.pop('journal_seq', 0)
+                    else:
+                        account = BankAccount.from_dict(acc_data)
+                        self.accounts[acc_num] = account
+                        self.positions[acc_num] = len(account.transactions)
+
+        self.loaded = True
+        if self.journal and not self.journal.is_empty():
+            for record in self.journal.replay(self.journal_seq):
+                self.apply_journal_record(record)
+            self.save_accounts(self.accounts)
+        return self.accounts
+
+    def load_shard_index(self, index):
+        """
+        Create the accounts of a shard from its index, leaving their
+        histories on disk.
+
+        Args:
+            index (int): Shard index
+
+        Returns:
+            bool: False if the shard has no index matching its file, so it
+                has to be read in full
+        """
+        index_path = self.index_path(index)
+        if not os.path.exists(index_path):
+            return False
+        with open(index_path, 'r') as file:
+            data = json.load(file)
+        stat = os.stat(self.shard_path(index))
+        if data['stat'] != [stat.st_size, stat.st_mtime_ns, stat.st_ino]:
+            return False
+        for acc_num, header in data['accounts'].items():
+            account = BankAccount(acc_num, header['name'], header['password'],
+                                  to_cents(header['balance']),
+                                  transaction_loader=self.load_transactions)
+            account.dirty = False
+            self.accounts[acc_num] = account
+            self.histories[acc_num] = (index, header['offset'], header['length'])
+            self.positions[acc_num] = header['count']
+        return True
+
+    def shard_index(self, account_number):
+        """
+        Get the shard holding an account.
+
+        Args:
+            account_number (str): Account number
+
+        Returns:
+            int: Shard index; numbers that are not numeric go to shard 0
+        """
+        return int(account_number) // self.shard_size if account_number.isdigit() else 0
+
+    def shard_path(self, index):
+        """
+        Get the path of a shard file.
+
+        Args:
+            index (int): Shard index
+
+        Returns:
+            str: Path to the shard file
+        """
+        return os.path.join(self.snapshot_dir, f"{index:06d}.json")
+
+    def index_path(self, index):
+        """
+        Get the path of a shard's index file.
+
+        Args:
+            index (int): Shard index
+
+        Returns:
+            str: Path to the index file
+        """
+        return os.path.join(self.snapshot_dir, f"{index:06d}{SHARD_INDEX_SUFFIX}")
+
+    def shard_indices(self):
+        """
+        List the shards present on disk.
+
+        Returns:
+            list: Shard indices in ascending order
+        """
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        return sorted(
+            int(name[:-len('.json')]) for name in os.listdir(self.snapshot_dir)
+            if name.endswith('.json') and name[:-len('.json')].isdigit()
+        )
+
+    def apply_journal_record(self, record):
+        """
+        Re-apply a journaled mutation to the loaded accounts.
+
+        Args:
+            record (dict): Journal record as written by write_records
+        """
+        self.journal_seq = record['seq']
+        self.apply_mutation(record)
+
+    def apply_mutation(self, record):
+        """
+        Apply the mutation described by a journal record.
+
+        Args:
+            record (dict): Journal record, possibly a batch of records
+        """
+        op = record.get('op', 'transaction')
+        if op == 'batch':
+            for nested in record['records']:
+                self.apply_mutation(nested)
+        elif op == 'transaction':
+            account = self.accounts.get(record['account'])
+            position = record.get('position')
+            if account and (position is None
+                            or position >= self.positions.get(record['account'], 0)):
+                transaction = transaction_from_dict({
+                    key: value for key, value in record.items()
+                    if key not in JOURNAL_FIELDS
+                })
+                account.balance = transaction['balance']
+                account.add_transaction(transaction)
+                self.track_transaction(account, transaction)
+        elif op == 'account':
+            header = record['account']
+            account = self.accounts.get(header['account_number'])
+            if account:
+                account.name = header['name']
+                account.password = header['password']
+                account.dirty = True
+            else:
+                self.accounts[header['account_number']] = BankAccount(
+                    header['account_number'],
+                    header['name'],
+                    header['password'],
+                    to_cents(header['balance'])
+                )
+        elif op == 'delete':
+            self.forget_history(record['account'])
+            if self.accounts.pop(record['account'], None):
+                self.dirty_shards.add(self.shard_index(record['account']))
+        elif op == 'meta':
+            self.meta.update(record['meta'])
+
+    def write_records(self, records, durable=False):
+        """
+        Persist account mutations that have been applied in memory.
+
+        Args:
+            records (list): Journal records without sequence numbers
+            durable (bool, optional): Force the records to stable storage
+        """
+        if not self.journal:
+            self.save_accounts(self.accounts)
+            return
+
+        for record in records:
+            self.journal_seq += 1
+            record['seq'] = self.journal_seq
+        self.journal.append_many(records, durable)
+        self.uncheckpointed += len(records)
+        if self.uncheckpointed >= self.checkpoint_interval:
+            self.save_accounts(self.accounts)
+
+    def save_accounts(self, accounts):
+        """
+        Write a snapshot checkpoint.
+
+        Only shards holding a dirty account or one that lost an account are
+        rewritten; handing over a different accounts dictionary rewrites
+        every shard. Each account is marked clean before it is serialized,
+        and every transaction journaled afterwards marks it dirty again, so
+        a change another thread makes while the snapshot is written is
+        covered by the next checkpoint even if the snapshot missed it.
+        Shards are replaced atomically one at a time and the metadata file
+        is written last, after which the journal it supersedes is truncated.
+
+        Args:
+            accounts (dict): Account number to BankAccount mapping
+        """
+        full = accounts is not self.accounts
+        if full:
+            # Histories on disk belong to the accounts being replaced
+            self.histories = {}
+            self.unsaved = {}
+        self.accounts = accounts
+        self.loaded = True
+        items = list(accounts.items())
+        dirty = set(self.dirty_shards)
+        if full:
+            dirty.update(self.shard_indices())
+        dirty.update(
+            self.shard_index(acc_num) for acc_num, account in items
+            if full or account.dirty
+        )
+
+        shards = {index: [] for index in dirty}
+        for acc_num, account in items:
+            members = shards.get(self.shard_index(acc_num))
+            if members is not None:
+                members.append((acc_num, account))
+
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        for index, members in sorted(shards.items()):
+            self.write_shard(index, members)
+            self.dirty_shards.discard(index)
+        self.write_json(
+            os.path.join(self.snapshot_dir, SNAPSHOT_META_FILE),
+            dict(self.meta, journal_seq=self.journal_seq, shard_size=self.shard_size)
+        )
+
+        if self.journal:
+            self.journal.truncate()
+        self.uncheckpointed = 0
+
+    def write_shard(self, index, members):
+        """
+        Replace one shard file and its index, removing both once the shard
+        holds no accounts.
+
+        Histories that are not loaded are copied from the shard they are
+        stored in, together with their unsaved transactions, without going
+        through the accounts' loaders.
+
+        Args:
+            index (int): Shard index
+            members (list): (account number, BankAccount) pairs in the shard
+        """
+        path = self.shard_path(index)
+        index_path = self.index_path(index)
+        if not members:
+            for filename in (path, index_path):
+                if os.path.exists(filename):
+                    os.remove(filename)
+            return
+
+        headers = {}
+        spans = {}
+
+        def serialize(acc_num, account):
+            account.dirty = False
+            if account.transactions_loaded() or acc_num not in self.histories:
+                data = account.to_dict()
+            else:
+                data = account.to_dict(self.read_history(acc_num) + [
+                    transaction_to_dict(transaction)
+                    for transaction in self.unsaved.get(acc_num, ())
+                ])
+            headers[acc_num] = {'name': data['name'], 'password': data['password'],
+                                'balance': data['balance'],
+                                'count': len(data['transactions'])}
+            return data
+
+        with self.lock:
+            try:
+                self.replace_file(path, lambda file: write_json_object(
+                    file, ((acc_num, serialize(acc_num, account)) for acc_num, account in members),
+                    spans=spans))
+            except Exception:
+                for _, account in members:
+                    account.dirty = True
+                raise
+            for acc_num, (offset, length) in spans.items():
+                headers[acc_num].update(offset=offset, length=length)
+                self.histories[acc_num] = (index, offset, length)
+                self.positions.setdefault(acc_num, headers[acc_num]['count'])
+                self.unsaved.pop(acc_num, None)
+            stat = os.stat(path)
+            self.write_json(index_path, {
+                'stat': [stat.st_size, stat.st_mtime_ns, stat.st_ino],
+                'accounts': headers
+            })
+
+    def read_history(self, account_number):
+        """
+        Read an account's history from the shard it is stored in.
+
+        Args:
+            account_number (str): Account number to read
+
+        Returns:
+            list: Transactions in JSON storage form, oldest first; empty if
+                the history is not in a shard
+        """
+        with self.lock:
+            span = self.histories.get(account_number)
+            if span is None:
+                return []
+            index, offset, length = span
+            return read_json_value(self.shard_path(index), offset, length)['transactions']
+
+    def track_transaction(self, account, transaction):
+        """
+        Count a journaled transaction of an account.
+
+        The account is marked dirty, since its shard no longer holds
+        everything the journal does. A transaction of a history that is
+        still on disk is also kept until the account's shard is written
+        again.
+
+        Args:
+            account (BankAccount): Account the transaction belongs to
+            transaction (dict): Transaction with amounts in cents
+        """
+        with self.lock:
+            acc_num = account.account_number
+            account.dirty = True
+            self.positions[acc_num] = self.positions.get(acc_num, 0) + 1
+            if not account.transactions_loaded():
+                self.unsaved.setdefault(acc_num, []).append(transaction)
+
+    def forget_history(self, account_number):
+        """
+        Drop what is known about a removed account's stored history.
+
+        Args:
+            account_number (str): Removed account
+        """
+        with self.lock:
+            self.positions.pop(account_number, None)
+            self.histories.pop(account_number, None)
+            self.unsaved.pop(account_number, None)
+
+    def save_account(self, account):
+        """
+        Journal the header of a new or updated account.
+
+        Args:
+            account (BankAccount): Account to persist
+        """
+        account.dirty = True
+        self.positions.setdefault(account.account_number, 0)
+        self.write_records([{
+            'op': 'account',
+            'account': {
+                'account_number': account.account_number,
+                'name': account.name,
+                'password': account.password,
+                'balance': from_cents(account.balance)
+            }
+        }])
+
+    def delete_account(self, account_number):
+        """
+        Journal the removal of an account.
+
+        Args:
+            account_number (str): Account number to delete
+        """
+        self.forget_history(account_number)
+        self.dirty_shards.add(self.shard_index(account_number))
+        self.write_records([{'op': 'delete', 'account': account_number}])
+
+    def append_transactions(self, entries, durable=False):
+        """
+        Journal transactions that have been applied to accounts.
+
+        Several transactions are written as one batch record, which is a
+        single journal line and therefore replayed either completely or
+        not at all.
+
+        Args:
+            entries (list): (BankAccount, transaction dict) pairs
+            durable (bool, optional): Force an fsync after writing
+        """
+        records = []
+        for account, transaction in entries:
+            position = self.positions.get(account.account_number, 0)
+            self.track_transaction(account, transaction)
+            records.append(dict(
+                transaction_to_dict(transaction),
+                op='transaction',
+                account=account.account_number,
+                position=position
+            ))
+        if len(records) > 1:
+            records = [{'op': 'batch', 'records': records}]
+        self.write_records(records, durable)
+
+    def load_transactions(self, account_number):
+        """
+        Get an account's transaction history, from memory if it is loaded
+        and otherwise from its shard and the transactions journaled since.
+
+        Args:
+            account_number (str): Account number to load
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        account = self.accounts.get(account_number)
+        if not account:
+            return []
+        if account.transactions_loaded():
+            return account.transactions
+        with self.lock:
+            return ([transaction_from_dict(transaction)
+                     for transaction in self.read_history(account_number)]
+                    + self.unsaved.get(account_number, []))
+
+    def history_reader(self, account_numbers):
+        """
+        Locate the stored histories of accounts for another process.
+
+        Args:
+            account_numbers (list): Accounts whose histories will be read
+
+        Returns:
+            JsonHistoryReader: Reader of the shards and unsaved transactions
+        """
+        spans = {}
+        files = {}
+        unsaved = {}
+        with self.lock:
+            for acc_num in account_numbers:
+                if acc_num in self.histories:
+                    index, offset, length = self.histories[acc_num]
+                    path = self.shard_path(index)
+                    if path not in files:
+                        stat = os.stat(path)
+                        files[path] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+                    spans[acc_num] = (path, offset, length)
+                if acc_num in self.unsaved:
+                    unsaved[acc_num] = list(self.unsaved[acc_num])
+        return JsonHistoryReader(spans, files, unsaved)
+
+    def count_transactions(self, account_number):
+        """
+        Count the transactions of an account without loading its history.
+
+        Args:
+            account_number (str): Account number to count
+
+        Returns:
+            int: Number of transactions
+        """
+        account = self.accounts.get(account_number)
+        if not account:
+            return 0
+        if account.transactions_loaded():
+            return len(account.transactions)
+        return self.positions.get(account_number, 0)
+
+    def load_transaction_range(self, account_number, start, count):
+        """
+        Get consecutive transactions of an account.
+
+        Args:
+            account_number (str): Account number to load
+            start (int): Position of the first transaction
+            count (int): Maximum number of transactions
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        return self.load_transactions(account_number)[start:start + count]
+
+    def load_transaction_page(self, account_number, cursor=None, limit=50):
+        """
+        Get a page of an account's transaction history.
+
+        Args:
+            account_number (str): Account number to load
+            cursor (int, optional): Position returned by the previous page
+            limit (int, optional): Maximum number of transactions
+
+        Returns:
+            tuple: List of transactions, newest first, and the next cursor
+        """
+        account = self.accounts.get(account_number)
+        if not account:
+            return [], None
+        if account.transactions_loaded():
+            return account.get_transaction_page(cursor, limit)
+        transactions = self.load_transactions(account_number)
+        end = len(transactions) if cursor is None else cursor
+        start = max(0, end - limit)
+        return transactions[start:end][::-1], (start if start > 0 else None)
+
+    def load_metadata(self):
+        """
+        Get metadata stored in the snapshot and journal.
+
+        Returns:
+            dict: Metadata values
+        """
+        return dict(self.meta)
+
+    def save_metadata(self, meta):
+        """
+        Journal updated metadata values.
+
+        Args:
+            meta (dict): Metadata values to set
+        """
+        self.meta.update(meta)
+        self.write_records([{'op': 'meta', 'meta': meta}])
+
+    def load_admins(self):
+        """
+        Load admin credentials from the admin file.
+
+        Returns:
+            dict: Username to Admin mapping
+        """
+        if not os.path.exists(self.admin_file):
+            return {}
+        with open(self.admin_file, 'r') as file:
+            data = json.load(file)
+        return {
+            username: Admin.from_dict(admin_data)
+            for username, admin_data in data.items()
+        }
+
+    def save_admins(self, admins):
+        """
+        Save admin credentials to the admin file.
+
+        Args:
+            admins (dict): Username to Admin mapping
+        """
+        data = {
+            username: admin.to_dict()
+            for username, admin in admins.items()
+        }
+        self.write_json(self.admin_file, data)
+
+    def load_logs(self):
+        """
+        Load all admin logs from the audit log.
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        return self.audit_log.query()
+
+    def query_logs(self, admin_username=None, action=None, start=None, end=None,
+                   limit=None):
+        """
+        Find admin logs matching all given conditions.
+
+        Args:
+            admin_username (str, optional): Only logs of this admin
+            action (str, optional): Only logs of this action
+            start (str, optional): Earliest timestamp to include
+            end (str, optional): Latest timestamp to include
+            limit (int, optional): Return only the newest matching logs
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        return self.audit_log.query(admin_username, action, start, end, limit)
+
+    def count_logs(self):
+        """
+        Count all admin logs in the audit log.
+
+        Returns:
+            int: Number of logs
+        """
+        return self.audit_log.count()
+
+    def load_log_range(self, start, count):
+        """
+        Load consecutive admin logs by position.
+
+        Args:
+            start (int): Position of the first log, 0 being the oldest
+            count (int): Maximum number of logs
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        return self.audit_log.read_range(start, count)
+
+    def append_log(self, log):
+        """
+        Append an admin log to the audit log.
+
+        Args:
+            log (AdminLog): Log entry to append
+        """
+        self.audit_log.append(log)
+
+    def save_logs(self, logs):
+        """
+        Replace all admin logs in the audit log.
+
+        Args:
+            logs (list): AdminLog entries in chronological order
+        """
+        self.audit_log.replace(logs)
+
+    def write_json(self, filename, data):
+        """
+        Atomically replace a JSON file.
+
+        Args:
+            filename (str): Path to the file to replace
+            data: JSON-serializable document
+        """
+        self.replace_file(filename, lambda file: json.dump(data, file, indent=4))
+
+    def replace_file(self, filename, write):
+        """
+        Atomically replace a file with newly written content.
+
+        Args:
+            filename (str): Path to the file to replace
+            write (function): Called with the open temporary file
+        """
+        temp_filename = filename + '.tmp'
+        with open(temp_filename, 'w', newline='\n') as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_filename, filename)
+
+    def close(self):
+        """
+        Write a final checkpoint and release the journal and audit log.
+
+        Tools that only use the admin data never load the accounts, so
+        the journal is then left for the next start to replay.
+        """
+        if self.journal:
+            if self.loaded and not self.journal.is_empty():
+                self.save_accounts(self.accounts)
+            self.journal.close()
+        self.audit_log.close()
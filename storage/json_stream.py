@@ -0,0 +1,132 @@
+"""
+Incremental reading and writing of large top-level JSON objects.
+
+The account snapshot is one JSON object keyed by account number. Reading
+it with json.load holds the raw text, the parsed tree and the resulting
+objects in memory at the same time. These helpers instead walk the object
+one member at a time through a buffer that only ever holds the member
+being decoded, and write members one at a time in the same layout
+json.dump(..., indent=4) produces.
+"""
+import json
+import re
+from utils.constants import JSON_STREAM_CHUNK_SIZE
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def iter_json_object(file, chunk_size=JSON_STREAM_CHUNK_SIZE):
+    """
+    Read the members of a top-level JSON object one at a time.
+
+    Args:
+        file (file): Text file positioned at the start of the document
+        chunk_size (int, optional): Minimum number of characters per read
+
+    Yields:
+        tuple: Key and decoded value of each member, in file order
+
+    Raises:
+        json.JSONDecodeError: If the document is not a valid JSON object
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+
+    def fill():
+        # Reads grow with the buffer so a large member is not re-decoded
+        # once per chunk
+        nonlocal buffer, position
+        chunk = file.read(max(chunk_size, len(buffer) - position))
+        if not chunk:
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def peek():
+        nonlocal position
+        while True:
+            position = WHITESPACE.match(buffer, position).end()
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return ''
+
+    def decode():
+        nonlocal position
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            # A number ending the buffer may continue in the next chunk
+            if end == len(buffer) and fill():
+                continue
+            position = end
+            return value
+
+    def expect(expected):
+        nonlocal position
+        char = peek()
+        if char not in expected:
+            raise json.JSONDecodeError(f"Expecting one of {expected!r}", buffer, position)
+        position += 1
+        return char
+
+    expect('{')
+    if peek() == '}':
+        return
+    while True:
+        if peek() != '"':
+            raise json.JSONDecodeError("Expecting property name", buffer, position)
+        key = decode()
+        expect(':')
+        peek()
+        yield key, decode()
+        if expect(',}') == '}':
+            return
+
+def write_json_object(file, items, indent=4, spans=None):
+    """
+    Write a top-level JSON object one member at a time.
+
+    The output is ASCII, so in a file opened with newline='\n' the spans
+    counted in characters are byte offsets that read_json_value can seek to.
+
+    Args:
+        file (file): Text file to write to, positioned at its start
+        items (iterable): Key and JSON-serializable value pairs
+        indent (int, optional): Indentation, as for json.dump
+        spans (dict, optional): Filled with each key's (offset, length)
+            of its encoded value
+    """
+    newline = '\n' + ' ' * indent
+    separator = '{'
+    offset = 0
+    for key, value in items:
+        member = json.dumps(value, indent=indent).replace('\n', newline)
+        prefix = f"{separator}{newline}{json.dumps(key)}: "
+        file.write(prefix + member)
+        if spans is not None:
+            spans[key] = (offset + len(prefix), len(member))
+        offset += len(prefix) + len(member)
+        separator = ','
+    file.write('{}' if separator == '{' else '\n}')
+
+def read_json_value(filename, offset, length):
+    """
+    Decode one value of a JSON document without reading the rest.
+
+    Args:
+        filename (str): Path to the document
+        offset (int): Byte offset of the value
+        length (int): Length of the value in bytes
+
+    Returns:
+        The decoded value
+    """
+    with open(filename, 'rb') as file:
+        file.seek(offset)
+        return json.loads(file.read(length))
\ No newline at end of file
@@ -0,0 +1,23 @@
+def migrate_storage(source, target):
+    """
+    Copy all data from one storage backend into another.
+
+    Accounts (with their transactions), metadata, admin credentials and
+    admin logs are read from the source and written to the target as full
+    snapshots, so the target ends up with exactly the source contents.
+
+    Args:
+        source (StorageBackend): Backend to read from
+        target (StorageBackend): Backend to write to
+
+    Returns:
+        tuple: Number of migrated accounts and admin logs
+    """
+    accounts = source.load_accounts()
+    target.save_accounts(accounts)
+    target.save_metadata(source.load_metadata())
+    target.save_admins(source.load_admins())
+
+    logs = source.load_logs()
+    target.save_logs(logs)
+    return len(accounts), len(logs)
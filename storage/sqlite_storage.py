@@ -0,0 +1,667 @@
+import json
+import sqlite3
+import threading
+from models.admin import Admin
+from models.admin_log import AdminLog
+from models.bank_account import BankAccount
+from storage.base import StorageBackend
+from utils.constants import SQLITE_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    account_number TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    password TEXT NOT NULL,
+    balance INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_number TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    balance INTEGER NOT NULL,
+    transfer_id TEXT,
+    counterparty TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_account_seq
+    ON transactions (account_number, seq);
+CREATE INDEX IF NOT EXISTS idx_transactions_date
+    ON transactions (date);
+CREATE TABLE IF NOT EXISTS admins (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS admin_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    admin_username TEXT NOT NULL,
+    action TEXT NOT NULL,
+    details TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_admin_logs_timestamp
+    ON admin_logs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_admin_logs_admin
+    ON admin_logs (admin_username, timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Upgrades for databases created by earlier versions, keyed by the
+# transactions column they add
+ADD_TRANSACTION_SEQ = """
+ALTER TABLE transactions ADD COLUMN seq INTEGER NOT NULL DEFAULT 0;
+UPDATE transactions SET seq = ranked.seq FROM (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY account_number ORDER BY id) - 1 AS seq
+    FROM transactions
+) AS ranked WHERE transactions.id = ranked.id;
+DROP INDEX IF EXISTS idx_transactions_account;
+"""
+
+ADD_TRANSFER_LINKS = """
+ALTER TABLE transactions ADD COLUMN transfer_id TEXT;
+ALTER TABLE transactions ADD COLUMN counterparty TEXT;
+"""
+
+TRANSACTION_UPGRADES = (
+    ('seq', ADD_TRANSACTION_SEQ),
+    ('transfer_id', ADD_TRANSFER_LINKS),
+)
+
+# Upgrades for databases that stored money as REAL dollars, keyed by the
+# table they rebuild with INTEGER cents. Column types cannot be altered in
+# place, and a REAL column would turn the cents back into floats
+ACCOUNTS_TO_CENTS = """
+BEGIN;
+CREATE TABLE accounts_cents (
+    account_number TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    password TEXT NOT NULL,
+    balance INTEGER NOT NULL
+);
+INSERT INTO accounts_cents
+    SELECT account_number, name, password, CAST(ROUND(balance * 100) AS INTEGER)
+    FROM accounts;
+DROP TABLE accounts;
+ALTER TABLE accounts_cents RENAME TO accounts;
+COMMIT;
+"""
+
+TRANSACTIONS_TO_CENTS = """
+BEGIN;
+CREATE TABLE transactions_cents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_number TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    balance INTEGER NOT NULL,
+    transfer_id TEXT,
+    counterparty TEXT
+);
+INSERT INTO transactions_cents
+    SELECT id, account_number, seq, type, CAST(ROUND(amount * 100) AS INTEGER), date,
+           CAST(ROUND(balance * 100) AS INTEGER), transfer_id, counterparty
+    FROM transactions;
+DROP TABLE transactions;
+ALTER TABLE transactions_cents RENAME TO transactions;
+COMMIT;
+"""
+
+CENTS_UPGRADES = (
+    ('accounts', ACCOUNTS_TO_CENTS),
+    ('transactions', TRANSACTIONS_TO_CENTS),
+)
+
+TRANSACTION_COLUMNS = "type, amount, date, balance, transfer_id, counterparty"
+
+INSERT_TRANSACTION = (
+    f"INSERT INTO transactions (account_number, seq, {TRANSACTION_COLUMNS}) "
+    "VALUES (?, (SELECT COALESCE(MAX(seq) + 1, 0) FROM transactions "
+    "WHERE account_number = ?), ?, ?, ?, ?, ?, ?)"
+)
+
+def row_to_transaction(tx_type, amount, date, balance, transfer_id, counterparty):
+    """
+    Convert a transactions row to an in-memory transaction.
+
+    Args:
+        Column values in TRANSACTION_COLUMNS order
+
+    Returns:
+        dict: Transaction with amounts in cents
+    """
+    transaction = {
+        'type': tx_type,
+        'amount': amount,
+        'date': date,
+        'balance': balance
+    }
+    if transfer_id is not None:
+        transaction['transfer_id'] = transfer_id
+        transaction['counterparty'] = counterparty
+    return transaction
+
+def transaction_to_row(transaction):
+    """
+    Convert an in-memory transaction to transactions column values.
+
+    Args:
+        transaction (dict): Transaction with amounts in cents
+
+    Returns:
+        tuple: Values for TRANSACTION_COLUMNS
+    """
+    return (
+        transaction['type'],
+        transaction['amount'],
+        transaction['date'],
+        transaction['balance'],
+        transaction.get('transfer_id'),
+        transaction.get('counterparty')
+    )
+
+class SqliteHistoryReader:
+    """
+    Reads account histories from the database in another process.
+
+    The connection is opened on the first read, so the reader can be
+    pickled.
+
+    Attributes:
+        filename (str): Path to the SQLite database
+        connection (sqlite3.Connection): Connection once opened, or None
+    """
+
+    def __init__(self, filename):
+        """
+        Initialize the reader.
+
+        Args:
+            filename (str): Path to the SQLite database
+        """
+        self.filename = filename
+        self.connection = None
+
+    def read(self, account_number):
+        """
+        Read an account's history.
+
+        Args:
+            account_number (str): Account number to read
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.filename)
+        return [
+            row_to_transaction(*row)
+            for row in self.connection.execute(
+                f"SELECT {TRANSACTION_COLUMNS} FROM transactions "
+                "WHERE account_number = ? ORDER BY seq",
+                (account_number,)
+            )
+        ]
+
+    def close(self):
+        """Close the connection if it was opened."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+class SqliteStorage(StorageBackend):
+    """
+    Storage backend keeping all data in a single SQLite database.
+
+    The database runs in WAL mode so readers never block the writer, and
+    every mutation touches only the rows it changes. Accounts are loaded
+    without their transactions, which are fetched on demand. Balances and
+    amounts are stored as INTEGER cents, exactly as the models hold them.
+
+    Attributes:
+        filename (str): Path to the SQLite database
+        connection (sqlite3.Connection): Open database connection
+        lock (threading.RLock): Serializes use of the connection
+        accounts (dict): Accounts returned by the last load_accounts or
+            handed to the last save_accounts
+    """
+
+    def __init__(self, filename=SQLITE_FILE):
+        """
+        Open the database and create the schema if needed.
+
+        Args:
+            filename (str, optional): Path to the SQLite database
+        """
+        self.filename = filename
+        self.lock = threading.RLock()
+        self.accounts = None
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(transactions)")]
+        for column, upgrade in TRANSACTION_UPGRADES:
+            if columns and column not in columns:
+                self.connection.executescript(upgrade)
+        for table, upgrade in CENTS_UPGRADES:
+            types = {row[1]: row[2]
+                     for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            if types.get('balance') == 'REAL':
+                self.connection.executescript(upgrade)
+        self.connection.executescript(SCHEMA)
+
+    def load_accounts(self):
+        """
+        Load all account headers.
+
+        Transaction histories are not read here; each account loads its
+        own history from the database on first access.
+
+        Returns:
+            dict: Account number to BankAccount mapping
+        """
+        with self.lock:
+            self.accounts = {
+                account_number: BankAccount(
+                    account_number, name, password, balance,
+                    transaction_loader=self.load_transactions
+                )
+                for account_number, name, password, balance in self.connection.execute(
+                    "SELECT account_number, name, password, balance FROM accounts"
+                )
+            }
+            return self.accounts
+
+    def load_transactions(self, account_number):
+        """
+        Load the full transaction history of one account.
+
+        Args:
+            account_number (str): Account number to load
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        with self.lock:
+            return [
+                row_to_transaction(*row)
+                for row in self.connection.execute(
+                    f"SELECT {TRANSACTION_COLUMNS} FROM transactions "
+                    "WHERE account_number = ? ORDER BY seq",
+                    (account_number,)
+                )
+            ]
+
+    def history_reader(self, account_numbers):
+        """
+        Locate the stored histories of accounts for another process.
+
+        Args:
+            account_numbers (list): Accounts whose histories will be read
+
+        Returns:
+            SqliteHistoryReader: Reader with its own database connection
+        """
+        return SqliteHistoryReader(self.filename)
+
+    def count_transactions(self, account_number):
+        """
+        Count the transactions of one account.
+
+        Args:
+            account_number (str): Account number to count
+
+        Returns:
+            int: Number of transactions
+        """
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM transactions WHERE account_number = ?",
+                (account_number,)
+            ).fetchone()[0]
+
+    def load_transaction_range(self, account_number, start, count):
+        """
+        Load consecutive transactions of one account by position.
+
+        Args:
+            account_number (str): Account number to load
+            start (int): Position of the first transaction
+            count (int): Maximum number of transactions
+
+        Returns:
+            list: Transactions, oldest first
+        """
+        with self.lock:
+            return [
+                row_to_transaction(*row)
+                for row in self.connection.execute(
+                    f"SELECT {TRANSACTION_COLUMNS} FROM transactions "
+                    "WHERE account_number = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                    (account_number, start, start + count)
+                )
+            ]
+
+    def load_transaction_page(self, account_number, cursor=None, limit=50):
+        """
+        Load a page of one account's transaction history, newest first.
+
+        Args:
+            account_number (str): Account number to load
+            cursor (int, optional): Position returned by the previous page
+            limit (int, optional): Maximum number of transactions
+
+        Returns:
+            tuple: List of transactions, newest first, and the next cursor
+        """
+        with self.lock:
+            if cursor is None:
+                rows = self.connection.execute(
+                    f"SELECT seq, {TRANSACTION_COLUMNS} FROM transactions "
+                    "WHERE account_number = ? ORDER BY seq DESC LIMIT ?",
+                    (account_number, limit)
+                ).fetchall()
+            else:
+                rows = self.connection.execute(
+                    f"SELECT seq, {TRANSACTION_COLUMNS} FROM transactions "
+                    "WHERE account_number = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+                    (account_number, cursor, limit)
+                ).fetchall()
+            page = [row_to_transaction(*row[1:]) for row in rows]
+            next_cursor = rows[-1][0] if len(rows) == limit and rows[-1][0] > 0 else None
+            return page, next_cursor
+
+    def save_accounts(self, accounts):
+        """
+        Replace all accounts and transactions in one database transaction.
+
+        Handing back the dictionary returned by load_accounts keeps the
+        stored rows of histories that were never loaded, as every change
+        to them has been appended here; they are not read through the
+        accounts' loaders. Any other dictionary replaces every history.
+
+        Args:
+            accounts (dict): Account number to BankAccount mapping
+        """
+        with self.lock:
+            own = accounts is self.accounts
+            self.accounts = accounts
+            with self.connection:
+                self.connection.execute("DELETE FROM accounts")
+                self.connection.executemany(
+                    "INSERT INTO accounts VALUES (?, ?, ?, ?)",
+                    (
+                        (acc.account_number, acc.name, acc.password, acc.balance)
+                        for acc in accounts.values()
+                    )
+                )
+                if own:
+                    rewritten = [acc for acc in accounts.values() if acc.transactions_loaded()]
+                    self.connection.execute(
+                        "DELETE FROM transactions WHERE account_number NOT IN "
+                        "(SELECT account_number FROM accounts)"
+                    )
+                    self.connection.executemany(
+                        "DELETE FROM transactions WHERE account_number = ?",
+                        ((acc.account_number,) for acc in rewritten)
+                    )
+                else:
+                    rewritten = list(accounts.values())
+                    self.connection.execute("DELETE FROM transactions")
+                self.connection.executemany(
+                    f"INSERT INTO transactions (account_number, seq, {TRANSACTION_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (acc.account_number, seq) + transaction_to_row(tx)
+                        for acc in rewritten
+                        for seq, tx in enumerate(acc.transactions)
+                    )
+                )
+
+    def save_account(self, account):
+        """
+        Insert or update a single account header.
+
+        Args:
+            account (BankAccount): Account to persist
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO accounts VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (account_number) DO UPDATE SET "
+                    "name = excluded.name, password = excluded.password, "
+                    "balance = excluded.balance",
+                    (
+                        account.account_number, account.name,
+                        account.password, account.balance
+                    )
+                )
+
+    def delete_account(self, account_number):
+        """
+        Delete an account and its transactions.
+
+        Args:
+            account_number (str): Account number to delete
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM transactions WHERE account_number = ?", (account_number,)
+                )
+                self.connection.execute(
+                    "DELETE FROM accounts WHERE account_number = ?", (account_number,)
+                )
+
+    def append_transactions(self, entries, durable=False):
+        """
+        Insert transactions and update balances in one database transaction.
+
+        Args:
+            entries (list): (BankAccount, transaction dict) pairs
+            durable (bool, optional): Sync the write-ahead log on commit
+        """
+        with self.lock:
+            if durable:
+                self.connection.execute("PRAGMA synchronous=FULL")
+            try:
+                with self.connection:
+                    self.connection.executemany(
+                        INSERT_TRANSACTION,
+                        (
+                            (acc.account_number, acc.account_number)
+                            + transaction_to_row(tx)
+                            for acc, tx in entries
+                        )
+                    )
+                    self.connection.executemany(
+                        "UPDATE accounts SET balance = ? WHERE account_number = ?",
+                        ((tx['balance'], acc.account_number) for acc, tx in entries)
+                    )
+            finally:
+                if durable:
+                    self.connection.execute("PRAGMA synchronous=NORMAL")
+
+    def load_metadata(self):
+        """
+        Load metadata values.
+
+        Returns:
+            dict: Metadata values
+        """
+        with self.lock:
+            return {
+                key: json.loads(value)
+                for key, value in self.connection.execute("SELECT key, value FROM meta")
+            }
+
+    def save_metadata(self, meta):
+        """
+        Insert or update metadata values.
+
+        Args:
+            meta (dict): Metadata values to set
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                    ((key, json.dumps(value)) for key, value in meta.items())
+                )
+
+    def load_admins(self):
+        """
+        Load all administrator accounts.
+
+        Returns:
+            dict: Username to Admin mapping
+        """
+        with self.lock:
+            return {
+                username: Admin(username, password)
+                for username, password in self.connection.execute(
+                    "SELECT username, password FROM admins"
+                )
+            }
+
+    def save_admins(self, admins):
+        """
+        Replace all administrator accounts.
+
+        Args:
+            admins (dict): Username to Admin mapping
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM admins")
+                self.connection.executemany(
+                    "INSERT INTO admins VALUES (?, ?)",
+                    ((admin.username, admin.password) for admin in admins.values())
+                )
+
+    def load_logs(self):
+        """
+        Load all admin logs.
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        with self.lock:
+            return [
+                AdminLog(*row)
+                for row in self.connection.execute(
+                    "SELECT admin_username, action, details, timestamp "
+                    "FROM admin_logs ORDER BY id"
+                )
+            ]
+
+    def query_logs(self, admin_username=None, action=None, start=None, end=None,
+                   limit=None):
+        """
+        Find admin logs matching all given conditions.
+
+        Args:
+            admin_username (str, optional): Only logs of this admin
+            action (str, optional): Only logs of this action
+            start (str, optional): Earliest timestamp to include
+            end (str, optional): Latest timestamp to include
+            limit (int, optional): Return only the newest matching logs
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        conditions = []
+        params = []
+        for condition, value in (("admin_username = ?", admin_username),
+                                 ("action = ?", action),
+                                 ("timestamp >= ?", start),
+                                 ("timestamp <= ?", end)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        query = "SELECT admin_username, action, details, timestamp FROM admin_logs"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            rows = self.connection.execute(query, params).fetchall()
+        return [AdminLog(*row) for row in reversed(rows)]
+
+    def count_logs(self):
+        """
+        Count all admin logs.
+
+        Returns:
+            int: Number of logs
+        """
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM admin_logs").fetchone()[0]
+
+    def load_log_range(self, start, count):
+        """
+        Load consecutive admin logs by position.
+
+        Args:
+            start (int): Position of the first log, 0 being the oldest
+            count (int): Maximum number of logs
+
+        Returns:
+            list: AdminLog entries in chronological order
+        """
+        with self.lock:
+            return [
+                AdminLog(*row)
+                for row in self.connection.execute(
+                    "SELECT admin_username, action, details, timestamp "
+                    "FROM admin_logs ORDER BY id LIMIT ? OFFSET ?",
+                    (count, start)
+                )
+            ]
+
+    def append_log(self, log):
+        """
+        Insert a single admin log.
+
+        Args:
+            log (AdminLog): Log entry to append
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO admin_logs (admin_username, action, details, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    (log.admin_username, log.action, log.details, log.timestamp)
+                )
+
+    def save_logs(self, logs):
+        """
+        Replace all admin logs.
+
+        Args:
+            logs (list): AdminLog entries in chronological order
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM admin_logs")
+                self.connection.executemany(
+                    "INSERT INTO admin_logs (admin_username, action, details, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        (log.admin_username, log.action, log.details, log.timestamp)
+                        for log in logs
+                    )
+                )
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,43 @@
+import os
+import pytest
+from storage.json_storage import JsonStorage
+from storage.sqlite_storage import SqliteStorage
+
+BACKENDS = ('json', 'sqlite')
+
+@pytest.fixture
+def make_storage(tmp_path):
+    """
+    Create storage backends writing into the test's scratch directory.
+
+    Every call opens a new backend on the same files, as a restart does.
+
+    Returns:
+        function: Called with 'json' or 'sqlite', returns a new backend
+    """
+    def make(backend):
+        if backend == 'json':
+            return JsonStorage(
+                os.path.join(tmp_path, 'bank_data.json'),
+                os.path.join(tmp_path, 'bank_journal.jsonl'),
+                os.path.join(tmp_path, 'admin_data.json'),
+                os.path.join(tmp_path, 'admin_logs.json'),
+                checkpoint_interval=1000
+            )
+        return SqliteStorage(os.path.join(tmp_path, 'bank.db'))
+    return make
+
+def histories(accounts):
+    """
+    Capture balances and histories for comparison.
+
+    Args:
+        accounts (dict): Account number to BankAccount mapping
+
+    Returns:
+        dict: Account number to (balance, transaction list)
+    """
+    return {
+        acc_num: (account.balance, list(account.transactions))
+        for acc_num, account in accounts.items()
+    }
\ No newline at end of file
@@ -0,0 +1,48 @@
+from services.account_index import AccountIndex
+from services.banking_system import BankingSystem
+
+def test_searches_follow_the_accounts(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    names = ["Ada Lovelace", "adam Smith", "Grace Hopper", "Alan Turing", "Edsger Dijkstra"]
+    numbers = {name: bank.create_account(name, "secret") for name in names}
+    for cents, name in zip((500, 1500, 2500, 3500, 4500), names):
+        bank.deposit(numbers[name], cents)
+    index = bank.index
+
+    assert index.find_by_name_prefix("ADA") == [numbers["Ada Lovelace"], numbers["adam Smith"]]
+    assert index.find_by_name_prefix("a", start=1, limit=1) == [numbers["adam Smith"]]
+    assert index.count_name_prefix("a") == 3
+    assert index.search_names("ing") == [numbers["Alan Turing"]]
+    assert index.search_names("a", limit=2) == [numbers["Ada Lovelace"], numbers["adam Smith"]]
+
+    assert index.find_by_balance(1500, 3500) == [
+        numbers["adam Smith"], numbers["Grace Hopper"], numbers["Alan Turing"]]
+    assert index.count_balance_range(minimum=2500) == 3
+    assert index.top_balances(2) == [numbers["Edsger Dijkstra"], numbers["Alan Turing"]]
+
+    bank.withdraw(numbers["Edsger Dijkstra"], 4000)
+    bank.transfer(numbers["Ada Lovelace"], numbers["Grace Hopper"], 500)
+    assert index.top_balances(2) == [numbers["Alan Turing"], numbers["Grace Hopper"]]
+    assert index.find_by_balance(maximum=500) == [numbers["Ada Lovelace"],
+                                                  numbers["Edsger Dijkstra"]]
+
+    bank.remove_account(numbers["Alan Turing"])
+    assert index.search_names("turing") == []
+    assert index.top_balances(1) == [numbers["Grace Hopper"]]
+    assert len(index) == 4
+    bank.close()
+
+def test_rebuild_matches_incremental_updates(make_storage):
+    bank = BankingSystem(make_storage('sqlite'))
+    for i in range(30):
+        number = bank.create_account("holder %02d" % (i % 7), "secret")
+        bank.deposit(number, 100 * (i % 5 + 1))
+    rebuilt = AccountIndex(bank.accounts.values())
+
+    assert rebuilt.find_by_name_prefix("holder 0", limit=100) == \
+        bank.index.find_by_name_prefix("holder 0", limit=100)
+    assert rebuilt.search_names("der 03", limit=100) == \
+        bank.index.search_names("der 03", limit=100)
+    assert rebuilt.find_by_balance(limit=100, descending=True) == \
+        bank.index.find_by_balance(limit=100, descending=True)
+    bank.close()
\ No newline at end of file
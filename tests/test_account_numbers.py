@@ -0,0 +1,64 @@
+import threading
+import pytest
+from services.account_numbers import AccountNumberAllocator, luhn_check_digit
+from services.banking_system import BankingSystem
+from tests.conftest import BACKENDS
+from utils.passwords import hash_password
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_account_numbers_stay_unique_across_restarts(make_storage, backend):
+    issued = []
+    bank = BankingSystem(make_storage(backend))
+    issued += [bank.create_account(f"user{i}", "secret") for i in range(3)]
+    assert bank.remove_account(issued[-1])
+    bank.close()
+
+    bank = BankingSystem(make_storage(backend))
+    issued += [bank.create_account(f"user{i}", "secret") for i in range(3, 5)]
+    # Crash: the system is never closed
+
+    bank = BankingSystem(make_storage(backend))
+    issued += [bank.create_account(f"user{i}", "secret") for i in range(5, 7)]
+    bank.close()
+
+    assert len(set(issued)) == len(issued)
+
+def has_valid_check_digit(account_number):
+    return luhn_check_digit(account_number[:-1]) == account_number[-1]
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_concurrent_creation_issues_unique_checked_numbers(make_storage, backend):
+    bank = BankingSystem(make_storage(backend))
+    bank.account_numbers = AccountNumberAllocator(
+        bank.storage, bank.persist, bank.accounts, block_size=4, check_digit=True)
+    issued = [[] for _ in range(6)]
+    password_hash = hash_password("secret")
+
+    def create(index):
+        for i in range(25):
+            issued[index].append(
+                bank.create_account(f"user{index}-{i}", None, password_hash))
+    threads = [threading.Thread(target=create, args=(i,)) for i in range(len(issued))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    numbers = [number for numbers in issued for number in numbers]
+    assert len(set(numbers)) == len(numbers) == 150
+    assert set(numbers) == set(bank.accounts)
+    assert all(has_valid_check_digit(number) for number in numbers)
+    bank.close()
+
+def test_legacy_scan_skips_the_check_digit(make_storage):
+    # Data saved before the high-water mark existed
+    storage = make_storage('json')
+    existing = {'10009': None, '10017': None, '1005': None}
+
+    allocator = AccountNumberAllocator(storage, lambda method, *args: None, existing,
+                                       check_digit=True)
+    assert allocator.next_number == 1002
+    assert allocator.allocate(existing) == '10025'
+    allocator = AccountNumberAllocator(storage, lambda method, *args: None, {'1005': None})
+    assert allocator.next_number == 1006
+    storage.close()
\ No newline at end of file
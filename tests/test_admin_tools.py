@@ -0,0 +1,25 @@
+import create_admin
+from services.banking_system import BankingSystem
+
+def test_create_admin_keeps_journaled_deposits(make_storage, monkeypatch):
+    bank = BankingSystem(make_storage('json'))
+    number = bank.create_account("Ada", "secret")
+    bank.deposit(number, 500)
+    bank.close()
+    bank = BankingSystem(make_storage('json'))
+    bank.deposit(number, 300)
+    bank.deposit(number, 500)
+    # Crash: the deposits are only in the journal
+
+    answers = iter(["admin"])
+    monkeypatch.setattr(create_admin, 'create_storage', lambda: make_storage('json'))
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+    monkeypatch.setattr(create_admin, 'getpass', lambda prompt: "password")
+    create_admin.create_initial_admin()
+
+    reopened = BankingSystem(make_storage('json'))
+    assert reopened.accounts[number].balance == 1300
+    assert len(reopened.accounts[number].transactions) == 3
+    assert reopened.create_account("Grace", "secret") != number
+    assert reopened.storage.load_admins().keys() == {"admin"}
+    reopened.close()
\ No newline at end of file
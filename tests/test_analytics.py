@@ -0,0 +1,71 @@
+import pytest
+from models.bank_account import BankAccount
+from models.transaction_store import date_to_epoch
+from services.banking_system import BankingSystem
+
+pytest.importorskip('numpy')
+from services.analytics import LedgerAnalytics
+
+def account_with(number, transactions):
+    account = BankAccount(number, "holder " + number, "hash")
+    account.transactions = transactions
+    account.balance = transactions[-1]['balance'] if transactions else 0
+    return account
+
+def test_aggregates_over_known_transactions():
+    first = account_with('1001', [
+        {'type': 'deposit', 'amount': 1000, 'date': "2024-03-01 09:00:00", 'balance': 1000},
+        {'type': 'withdrawal', 'amount': 300, 'date': "2024-03-01 18:00:00", 'balance': 700},
+        {'type': 'transfer_out', 'amount': 200, 'date': "2024-03-03 10:00:00", 'balance': 500}
+    ])
+    second = account_with('1002', [
+        {'type': 'deposit', 'amount': 50, 'date': "2024-03-01 12:00:00", 'balance': 50},
+        {'type': 'transfer_in', 'amount': 200, 'date': "2024-03-03 10:00:00", 'balance': 250}
+    ])
+    analytics = LedgerAnalytics(capacity=2)
+    analytics.add_account(first, first.transactions)
+    analytics.add_account(second, second.transactions)
+    analytics.add_account(first, first.transactions)
+    analytics.record([(second, {'type': 'deposit', 'amount': 750,
+                                'date': "2024-03-04 08:00:00", 'balance': 1000})])
+
+    assert analytics.totals_by_type() == {
+        'deposit': {'count': 3, 'total': 1800},
+        'withdrawal': {'count': 1, 'total': 300},
+        'transfer_in': {'count': 1, 'total': 200},
+        'transfer_out': {'count': 1, 'total': 200}
+    }
+    assert analytics.totals_by_type(start=date_to_epoch("2024-03-02 00:00:00"),
+                                    end=date_to_epoch("2024-03-03 23:59:59"))['deposit'] == \
+        {'count': 0, 'total': 0}
+
+    periods = analytics.volume_by_period()
+    assert [period['start'] for period in periods] == [
+        "2024-03-01 00:00:00", "2024-03-03 00:00:00", "2024-03-04 00:00:00"]
+    assert periods[0]['deposit'] == {'count': 2, 'total': 1050}
+    assert periods[0]['withdrawal'] == {'count': 1, 'total': 300}
+    assert periods[1]['transfer_in'] == {'count': 1, 'total': 200}
+    assert periods[2]['deposit'] == {'count': 1, 'total': 750}
+
+    assert analytics.average_balance() == 750.0
+    analytics.remove_account('1002')
+    assert analytics.average_balance() == 500.0
+    assert analytics.totals_by_type()['deposit']['count'] == 3
+
+def test_bank_analytics_follow_new_transactions(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    first = bank.create_account("Ada", "secret")
+    second = bank.create_account("Grace", "secret")
+    bank.deposit(first, 5000)
+    analytics = bank.get_analytics()
+
+    bank.deposit(second, 1000)
+    bank.withdraw(first, 500)
+    bank.transfer(first, second, 1500)
+    totals = analytics.totals_by_type()
+    assert totals['deposit'] == {'count': 2, 'total': 6000}
+    assert totals['withdrawal'] == {'count': 1, 'total': 500}
+    assert totals['transfer_out'] == {'count': 1, 'total': 1500}
+    assert analytics.average_balance() == 2750.0
+    assert sum(period['deposit']['count'] for period in analytics.volume_by_period(60)) == 2
+    bank.close()
\ No newline at end of file
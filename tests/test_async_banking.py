@@ -0,0 +1,40 @@
+import asyncio
+from services.async_banking_system import AsyncBankingSystem
+from services.banking_system import BankingSystem
+from tests.conftest import histories
+
+def test_group_commit_resolves_each_operation(make_storage, monkeypatch):
+    bank = BankingSystem(make_storage('sqlite'))
+    broken = bank.create_account("broken", "secret")
+
+    def fail(transaction):
+        raise ValueError("history unavailable")
+    monkeypatch.setattr(bank.accounts[broken], 'add_transaction', fail)
+
+    async def main():
+        facade = AsyncBankingSystem(bank)
+        await facade.start()
+        first, second = await asyncio.gather(
+            facade.create_account("Ada", "secret"), facade.create_account("Grace", "secret"))
+        results = await asyncio.gather(
+            facade.deposit(first, 1000),
+            facade.deposit(broken, 500),
+            facade.deposit(second, 700),
+            facade.withdraw(first, 300),
+            facade.withdraw(second, 5000),
+        )
+        await facade.close()
+        return first, second, results, facade.commits, facade.operations
+
+    first, second, results, commits, operations = asyncio.run(main())
+    assert results == [True, False, True, True, False]
+    assert operations == 7 and commits < operations
+    assert bank.accounts[broken].balance == 0
+    assert bank.get_transaction_count(broken) == 0
+    expected = histories({number: bank.accounts[number] for number in (first, second)})
+    assert [balance for balance, _ in expected.values()] == [700, 700]
+    bank.close()
+
+    reopened = BankingSystem(make_storage('sqlite'))
+    assert histories({number: reopened.accounts[number] for number in (first, second)}) == expected
+    reopened.close()
\ No newline at end of file
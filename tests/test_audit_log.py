@@ -0,0 +1,43 @@
+import os
+from models.admin_log import AdminLog
+from storage.audit_log import AuditLog
+
+def make_logs(count):
+    return [
+        AdminLog(f"admin{i % 3}", "remove_user" if i % 4 == 0 else "view_users",
+                 f"entry {i}", f"2024-01-{1 + i // 24:02d} {i % 24:02d}:00:00")
+        for i in range(count)
+    ]
+
+def test_rotated_log_answers_queries_after_reopening(tmp_path):
+    directory = str(tmp_path / 'audit')
+    logs = make_logs(100)
+    audit_log = AuditLog(directory, max_bytes=1000, index_interval=4)
+    for log in logs[:60]:
+        audit_log.append(log)
+    audit_log.append_many(logs[60:])
+    assert len(audit_log.segments) > 3
+    audit_log.close()
+
+    # A crash left half a record at the end of the newest segment
+    newest = os.path.join(directory, f"{audit_log.segments[-1].number:06d}.jsonl")
+    with open(newest, 'ab') as file:
+        file.write(b'{"admin_username": "adm')
+
+    reopened = AuditLog(directory, max_bytes=1000, index_interval=4)
+    assert reopened.count() == 100
+    assert [log.details for log in reopened.read_range(37, 3)] == [
+        "entry 37", "entry 38", "entry 39"]
+
+    day_two = [log.details for log in logs
+               if "2024-01-02 05:00:00" <= log.timestamp <= "2024-01-03 02:00:00"]
+    assert [log.details for log in reopened.query(
+        start="2024-01-02 05:00:00", end="2024-01-03 02:00:00")] == day_two
+    removals = [log.details for log in logs
+                if log.admin_username == "admin1" and log.action == "remove_user"]
+    assert [log.details for log in reopened.query("admin1", "remove_user")] == removals
+    assert [log.details for log in reopened.query(limit=2)] == ["entry 98", "entry 99"]
+
+    reopened.append(AdminLog("admin0", "view_users", "entry 100", "2024-01-05 05:00:00"))
+    assert [log.details for log in reopened.read_range(99, 5)] == ["entry 99", "entry 100"]
+    reopened.close()
\ No newline at end of file
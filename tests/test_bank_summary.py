@@ -0,0 +1,72 @@
+import pytest
+from services.bank_summary import SUMMARY_CLEAN_KEY, SUMMARY_KEY
+from services.banking_system import BankingSystem
+from tests.conftest import BACKENDS
+
+def build_bank(bank):
+    first = bank.create_account("Ada", "secret")
+    second = bank.create_account("Grace", "secret")
+    third = bank.create_account("Alan", "secret")
+    bank.deposit(first, 5000)
+    bank.deposit(second, 2000)
+    bank.withdraw(first, 700)
+    bank.transfer(first, second, 1000)
+    bank.post_batch([(third, 'deposit', 300), (third, 'withdrawal', 100)])
+    bank.remove_account(third)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_summary_counters_survive_restarts(make_storage, backend):
+    bank = BankingSystem(make_storage(backend))
+    build_bank(bank)
+    report = bank.summary.report()
+    assert report['total_balance'] == 6300
+    assert report['account_count'] == 2
+    assert len(report['daily']) == 1
+    assert report['daily'][0]['deposit'] == 7300
+    assert report['daily'][0]['withdrawal'] == 800
+    bank.close()
+
+    # A clean shutdown saves the counters, which are restored as saved
+    storage = make_storage(backend)
+    storage.load_accounts()
+    meta = storage.load_metadata()
+    assert meta[SUMMARY_CLEAN_KEY]
+    saved = dict(meta[SUMMARY_KEY], admin_actions={'root': 3})
+    storage.save_metadata({SUMMARY_KEY: saved})
+    bank = BankingSystem(storage)
+    assert bank.summary.report() == dict(report, admin_actions={'root': 3})
+    bank.close()
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_stale_summary_is_recomputed(make_storage, backend):
+    bank = BankingSystem(make_storage(backend))
+    build_bank(bank)
+    report = bank.summary.report()
+    bank.close()
+
+    # Counters saved before an unclean shutdown are not trusted
+    storage = make_storage(backend)
+    storage.load_accounts()
+    saved = dict(storage.load_metadata()[SUMMARY_KEY], admin_actions={'root': 3})
+    storage.save_metadata({SUMMARY_KEY: saved, SUMMARY_CLEAN_KEY: False})
+    bank = BankingSystem(storage)
+    assert not bank.storage.load_metadata()[SUMMARY_CLEAN_KEY]
+    rebuilt = bank.summary.report()
+    # The removed account's flows went with its history
+    assert rebuilt['daily'][0]['deposit'] == 7000
+    assert rebuilt['daily'][0]['withdrawal'] == 700
+    assert dict(rebuilt, daily=report['daily']) == report
+    number = bank.create_account("Edsger", "secret")
+    bank.deposit(number, 100)
+    assert bank.summary.report()['total_balance'] == 6400
+    bank.close()
+
+    # Counters disagreeing with the accounts are recomputed as well
+    storage = make_storage(backend)
+    storage.load_accounts()
+    saved = dict(storage.load_metadata()[SUMMARY_KEY], total_balance=1)
+    storage.save_metadata({SUMMARY_KEY: saved})
+    bank = BankingSystem(storage)
+    assert bank.summary.report()['total_balance'] == 6400
+    assert bank.summary.report()['account_count'] == 3
+    bank.close()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import pytest
+from services.banking_system import BankingSystem
+from services.batch_posting import import_postings
+from tests.conftest import BACKENDS, histories
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_csv_postings_are_applied_in_one_commit(make_storage, backend, monkeypatch):
+    bank = BankingSystem(make_storage(backend))
+    ada, grace = (bank.create_account(name, "secret") for name in ("Ada", "Grace"))
+    commits = []
+    append_transactions = bank.storage.append_transactions
+    monkeypatch.setattr(bank.storage, 'append_transactions',
+                        lambda entries, durable=False: commits.append(len(entries))
+                        or append_transactions(entries, durable))
+    lines = [
+        "account_number,type,amount",
+        f"{ada},deposit,100.00",
+        f"{grace},Deposit,20.5",
+        f"{ada},withdrawal,30",
+        f"{grace},withdrawal,50.00",
+        f"{ada},refund,1.00",
+        f"{ada},deposit,1e2",
+        "missing,deposit,5.00",
+        f"{grace},deposit,-3",
+    ]
+    applied, rejections = import_postings(bank, lines, 'csv')
+
+    assert applied == 3
+    assert commits == [3]
+    assert [line for line, _ in rejections] == [5, 6, 7, 8, 9]
+    assert [reason for _, reason in rejections][:2] == [
+        "insufficient funds", "unknown posting type 'refund'"]
+    assert [bank.accounts[number].balance for number in (ada, grace)] == [7000, 2050]
+    expected = histories(bank.accounts)
+    bank.close()
+
+    reopened = BankingSystem(make_storage(backend))
+    assert histories(reopened.accounts) == expected
+    reopened.close()
+
+def test_jsonl_postings_report_malformed_lines(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    number = bank.create_account("Ada", "secret")
+    lines = [
+        f'{{"account_number": "{number}", "type": "deposit", "amount": "12.34"}}',
+        '',
+        '{"account_number": "1"',
+        f'{{"account_number": "{number}", "type": "withdrawal"}}',
+        f'{{"account_number": {number}, "type": "withdrawal", "amount": 2.34}}',
+    ]
+    applied, rejections = import_postings(bank, lines, 'jsonl')
+
+    assert applied == 2
+    assert [line for line, _ in rejections] == [3, 4]
+    assert all(reason.startswith("invalid posting") for _, reason in rejections)
+    assert bank.accounts[number].balance == 1000
+    bank.close()
\ No newline at end of file
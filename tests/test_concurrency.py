@@ -0,0 +1,42 @@
+import random
+import threading
+import pytest
+from services.banking_system import BankingSystem
+from services.reconciliation import reconcile_ledger
+from tests.conftest import BACKENDS, histories
+
+THREADS = 4
+OPERATIONS = 150
+
+@pytest.mark.parametrize('background', (False, True))
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_ledger_reconciles_after_concurrent_operations(make_storage, backend, background):
+    bank = BankingSystem(make_storage(backend), background)
+    numbers = [bank.create_account(f"user{i}", "secret") for i in range(3)]
+    successes = [0] * THREADS
+
+    def worker(index):
+        rng = random.Random(index)
+        for _ in range(OPERATIONS):
+            number = rng.choice(numbers)
+            amount = rng.randint(1, 5000)
+            if rng.random() < 0.5:
+                successes[index] += bank.deposit(number, amount)
+            else:
+                successes[index] += bank.withdraw(number, amount)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    assert reconcile_ledger(bank.accounts) == []
+    in_memory = histories(bank.accounts)
+    assert sum(len(history) for _, history in in_memory.values()) == sum(successes)
+    bank.close()
+
+    reopened = BankingSystem(make_storage(backend))
+    assert histories(reopened.accounts) == in_memory
+    assert reconcile_ledger(reopened.accounts) == []
+    reopened.close()
\ No newline at end of file
@@ -0,0 +1,65 @@
+import asyncio
+from api.bank_api import BankApi
+from api.http_server import HttpServer
+from benchmarks.http_load import build_request, read_response
+from services.admin_service import AdminService
+from services.banking_system import BankingSystem
+
+def run_client(bank, client):
+    """
+    Serve the bank's API on a free port while a client coroutine runs.
+
+    Args:
+        bank (BankingSystem): System to serve
+        client (function): Coroutine function called with a reader and
+            writer connected to the server
+
+    Returns:
+        The client's result
+    """
+    server = HttpServer(BankApi(bank, AdminService(bank)).handle, '127.0.0.1', 0)
+
+    async def main():
+        await server.start()
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        try:
+            return await client(reader, writer)
+        finally:
+            writer.close()
+            server.server.close()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.close()
+
+def test_pipelined_requests_are_answered_in_order(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    number = bank.create_account("Ada", "secret")
+    token = bank.open_session(number, "secret")
+    auth = f"Bearer {token}"
+    account = f"/accounts/{number}"
+    requests = [
+        ('POST', f"{account}/deposit", {'amount': "10.00"}),
+        ('GET', account, None),
+        ('GET', account, None),
+        ('POST', f"{account}/withdraw", {'amount': "3.25"}),
+        ('GET', account, None),
+        ('POST', f"{account}/withdraw", {'amount': "100"}),
+        ('GET', f"{account}/transactions?limit=%C2%B2", None),
+        ('POST', f"{account}/deposit", {'amount': "1e2"}),
+        ('GET', f"{account}/transactions?limit=5", None),
+    ]
+
+    async def client(reader, writer):
+        writer.write(b"".join(build_request(method, path, payload, auth)
+                              for method, path, payload in requests))
+        await writer.drain()
+        return [await read_response(reader) for _ in requests]
+
+    responses = run_client(bank, client)
+    assert [status for status, _ in responses] == [200, 200, 200, 200, 200, 409, 400, 400, 200]
+    assert [body['balance'] for _, body in responses[:5]] == [
+        "10.00", "10.00", "10.00", "6.75", "6.75"]
+    assert [tx['amount'] for tx in responses[-1][1]['transactions']] == ["3.25", "10.00"]
+    bank.close()
\ No newline at end of file
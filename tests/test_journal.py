@@ -0,0 +1,29 @@
+from services.banking_system import BankingSystem
+from services.reconciliation import reconcile_ledger
+
+def test_journal_replays_after_crash(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    first = bank.create_account("Ada", "secret")
+    second = bank.create_account("Grace", "secret")
+    bank.deposit(first, 10000)
+    bank.close()
+
+    # Histories of the reopened system stay on disk while these are journaled
+    bank = BankingSystem(make_storage('json'))
+    assert not bank.accounts[first].transactions_loaded()
+    bank.deposit(first, 2500)
+    bank.withdraw(first, 1000)
+    bank.deposit(second, 700)
+    third = bank.create_account("Linus", "secret")
+    bank.deposit(third, 300)
+    # Crash: the journal is never folded into a checkpoint
+    expected = {number: (bank.accounts[number].balance,
+                         bank.get_transaction_count(number))
+                for number in (first, second, third)}
+
+    reopened = BankingSystem(make_storage('json'))
+    assert {number: (account.balance, len(account.transactions))
+            for number, account in reopened.accounts.items()} == expected
+    assert [tx['amount'] for tx in reopened.accounts[first].transactions] == [10000, 2500, 1000]
+    assert reconcile_ledger(reopened.accounts) == []
+    reopened.close()
\ No newline at end of file
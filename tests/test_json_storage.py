@@ -0,0 +1,40 @@
+import os
+from services.banking_system import BankingSystem
+from tests.conftest import histories
+
+def test_shard_without_matching_index_is_read_in_full(make_storage, tmp_path):
+    bank = BankingSystem(make_storage('json'))
+    number = bank.create_account("Ada", "secret")
+    bank.deposit(number, 4200)
+    bank.close()
+    expected = histories(BankingSystem(make_storage('json')).accounts)
+
+    # As if a checkpoint stopped between replacing a shard and its index
+    shard = os.path.join(tmp_path, 'bank_data', f"{int(number) // 1000:06d}.json")
+    os.utime(shard, ns=(0, 0))
+    reopened = BankingSystem(make_storage('json'))
+    assert reopened.accounts[number].transactions_loaded()
+    assert histories(reopened.accounts) == expected
+    reopened.close()
+
+def test_history_is_read_from_its_shard_on_demand(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    number = bank.create_account("Ada", "secret")
+    for amount in (100, 200, 300):
+        bank.deposit(number, amount)
+    bank.close()
+
+    bank = BankingSystem(make_storage('json'))
+    account = bank.accounts[number]
+    assert not account.transactions_loaded()
+    assert bank.get_transaction_count(number) == 3
+    page, cursor = bank.get_transaction_page(number, limit=2)
+    assert [tx['amount'] for tx in page] == [300, 200]
+    assert [tx['amount'] for tx in bank.get_transaction_range(number, 0, cursor)] == [100]
+    assert not account.transactions_loaded()
+
+    # Deposits journaled meanwhile are part of the history once loaded
+    bank.deposit(number, 400)
+    assert [tx['amount'] for tx in account.transactions] == [100, 200, 300, 400]
+    assert account.balance == 1000
+    bank.close()
\ No newline at end of file
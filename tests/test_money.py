@@ -0,0 +1,49 @@
+import pytest
+from services.banking_system import BankingSystem
+from tests.conftest import BACKENDS, histories
+from utils.money import MAX_CENTS, parse_amount, require_cents
+
+@pytest.mark.parametrize('text', ['1e2', '1E2', '1.5e1', 'Infinity', 'NaN', '١٢',
+                                  '0', '-5', '1.005', '10000000000000.00'])
+def test_parse_amount_rejects_invalid_text(text):
+    with pytest.raises(ValueError):
+        parse_amount(text)
+
+def test_parse_amount_accepts_largest_amount():
+    assert parse_amount('12.5') == 1250
+    assert parse_amount('9999999999999.99') == MAX_CENTS
+
+def test_require_cents_rejects_out_of_range():
+    require_cents(MAX_CENTS)
+    with pytest.raises(ValueError):
+        require_cents(MAX_CENTS + 1)
+    with pytest.raises(TypeError):
+        require_cents(1.5)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_balance_overflow_changes_nothing(make_storage, backend):
+    bank = BankingSystem(make_storage(backend))
+    rich = bank.create_account("rich", "secret")
+    other = bank.create_account("other", "secret")
+    assert bank.deposit(rich, MAX_CENTS - 100)
+    assert bank.deposit(other, 500)
+    before = histories(bank.accounts)
+
+    with pytest.raises(ValueError):
+        bank.deposit(rich, 2 ** 63 - 1)
+    with pytest.raises(ValueError):
+        bank.deposit(rich, 101)
+    assert bank.post_batch([(rich, 'deposit', 101), (other, 'deposit', 1)]) == [
+        "balance out of range", None]
+    assert bank.transfer_batch([(other, rich, 101)]) == [False]
+    assert bank.index.top_balances(2) == [rich, other]
+    assert bank.index.count_balance_range(MAX_CENTS - 100, MAX_CENTS - 100) == 1
+
+    after = histories(bank.accounts)
+    assert after[rich] == before[rich]
+    assert after[other][0] == 501
+    bank.close()
+
+    bank = BankingSystem(make_storage(backend))
+    assert histories(bank.accounts)[rich] == before[rich]
+    bank.close()
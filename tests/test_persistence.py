@@ -0,0 +1,34 @@
+import threading
+import pytest
+from services.banking_system import BankingSystem
+from tests.conftest import BACKENDS, histories
+
+@pytest.mark.parametrize('commit_window_ms', (0, 5))
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_background_save_with_unloaded_histories(make_storage, backend, commit_window_ms):
+    bank = BankingSystem(make_storage(backend))
+    numbers = [bank.create_account(f"user{i}", "secret") for i in range(3)]
+    for number in numbers:
+        bank.deposit(number, 1000)
+    bank.close()
+
+    bank = BankingSystem(make_storage(backend), True, commit_window_ms=commit_window_ms)
+    assert not any(account.transactions_loaded() for account in bank.accounts.values())
+    bank.deposit(numbers[0], 250)
+
+    def save():
+        bank.save_data()
+        bank.flush()
+    saver = threading.Thread(target=save, daemon=True)
+    saver.start()
+    saver.join(timeout=10)
+    assert not saver.is_alive(), "save_data did not finish"
+
+    bank.deposit(numbers[1], 500)
+    expected = histories(bank.accounts)
+    bank.close()
+
+    reopened = BankingSystem(make_storage(backend))
+    assert histories(reopened.accounts) == expected
+    assert len(reopened.accounts[numbers[0]].transactions) == 2
+    reopened.close()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import time
+from services.banking_system import BankingSystem
+from services.session_manager import SessionManager
+
+def test_sessions_expire_when_idle_or_too_old(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    sessions = SessionManager(ttl=100, idle_timeout=30, sweep_interval=0)
+
+    token = sessions.issue('account', '1001')
+    assert sessions.validate(token, 'account').subject == '1001'
+    assert sessions.validate(token, 'admin') is None
+
+    # Each use keeps the session alive until its lifetime runs out
+    for _ in range(3):
+        now[0] += 25
+        assert sessions.validate(token) is not None
+    now[0] += 25
+    assert sessions.validate(token) is None
+    assert len(sessions) == 0
+
+    idle = sessions.issue('account', '1001')
+    active = sessions.issue('admin', 'root')
+    now[0] += 20
+    assert sessions.validate(active) is not None
+    now[0] += 10
+    assert sessions.sweep() == 1
+    assert sessions.validate(idle) is None
+    assert sessions.validate(active) is not None
+
+def test_revoke_and_session_limit():
+    sessions = SessionManager(max_sessions=3, sweep_interval=0)
+    first = sessions.issue('account', '1001')
+    second = sessions.issue('account', '1001')
+    other = sessions.issue('account', '1002')
+
+    assert sessions.revoke(other)
+    assert not sessions.revoke(other)
+    assert sessions.revoke_subject('account', '1001') == 2
+    assert sessions.validate(first) is None
+    assert sessions.validate(second) is None
+
+    tokens = [sessions.issue('admin', 'root') for _ in range(4)]
+    assert len(sessions) == 3
+    assert sessions.validate(tokens[0]) is None
+    assert all(sessions.validate(token) for token in tokens[1:])
+
+def test_bank_sessions_end_with_the_account(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    number = bank.create_account("Ada", "secret")
+    assert bank.open_session(number, "wrong") is None
+
+    token = bank.open_session(number, "secret")
+    assert bank.session_account(token) is bank.accounts[number]
+    bank.close_session(token)
+    assert bank.session_account(token) is None
+
+    token = bank.open_session(number, "secret")
+    bank.remove_account(number)
+    assert bank.session_account(token) is None
+    bank.close()
\ No newline at end of file
@@ -0,0 +1,25 @@
+from services.banking_system import BankingSystem
+from tests.conftest import histories
+
+def test_transaction_missed_by_a_snapshot_is_checkpointed(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    number = bank.create_account("Ada", "secret")
+    bank.deposit(number, 1000)
+    bank.save_data()
+
+    # A snapshot written on another thread serialized the account just
+    # before this deposit reached its history and marked the account clean
+    account = bank.accounts[number]
+    with account.lock:
+        account.balance += 500
+        transaction = {'type': 'deposit', 'amount': 500,
+                       'date': "2024-01-01 12:00:00", 'balance': account.balance}
+        account.add_transaction(transaction)
+        account.dirty = False
+        bank.record_transaction(account, transaction)
+    expected = histories(bank.accounts)
+    bank.close()
+
+    reopened = BankingSystem(make_storage('json'))
+    assert histories(reopened.accounts) == expected
+    reopened.close()
\ No newline at end of file
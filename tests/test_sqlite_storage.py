@@ -0,0 +1,62 @@
+import sqlite3
+from services.banking_system import BankingSystem
+from storage.sqlite_storage import SqliteStorage
+from utils.money import MAX_CENTS
+
+# Schema of databases that stored money as REAL dollars and predate the
+# transaction positions and transfer links
+DOLLAR_SCHEMA = """
+CREATE TABLE accounts (
+    account_number TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    password TEXT NOT NULL,
+    balance REAL NOT NULL
+);
+CREATE TABLE transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_number TEXT NOT NULL,
+    type TEXT NOT NULL,
+    amount REAL NOT NULL,
+    date TEXT NOT NULL,
+    balance REAL NOT NULL
+);
+"""
+
+def test_dollar_database_is_upgraded_to_cents(tmp_path):
+    filename = str(tmp_path / 'bank.db')
+    connection = sqlite3.connect(filename)
+    connection.executescript(DOLLAR_SCHEMA)
+    connection.execute("INSERT INTO accounts VALUES ('1000', 'Ada', 'x', 0.3)")
+    connection.executemany(
+        "INSERT INTO transactions (account_number, type, amount, date, balance) "
+        "VALUES ('1000', ?, ?, ?, ?)",
+        [('deposit', 0.1, "2024-01-01 12:00:00", 0.1),
+         ('deposit', 0.2, "2024-01-02 12:00:00", 0.3)]
+    )
+    connection.commit()
+    connection.close()
+
+    storage = SqliteStorage(filename)
+    account = storage.load_accounts()['1000']
+    assert account.balance == 30
+    assert [(tx['amount'], tx['balance']) for tx in account.transactions] == [(10, 10), (20, 30)]
+    for table in ('accounts', 'transactions'):
+        types = {row[1]: row[2] for row in storage.connection.execute(
+            f"PRAGMA table_info({table})")}
+        assert types['balance'] == 'INTEGER'
+    storage.close()
+
+def test_cents_are_stored_exactly(tmp_path):
+    filename = str(tmp_path / 'bank.db')
+    bank = BankingSystem(SqliteStorage(filename))
+    number = bank.create_account("Ada", "secret")
+    bank.deposit(number, MAX_CENTS - 1)
+    bank.withdraw(number, 1)
+    bank.close()
+
+    connection = sqlite3.connect(filename)
+    assert connection.execute("SELECT typeof(balance), balance FROM accounts").fetchone() == (
+        'integer', MAX_CENTS - 2)
+    assert connection.execute(
+        "SELECT DISTINCT typeof(amount) FROM transactions").fetchall() == [('integer',)]
+    connection.close()
\ No newline at end of file
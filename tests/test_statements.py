@@ -0,0 +1,60 @@
+import os
+import pytest
+from services.banking_system import BankingSystem
+from services.statements import export_statements, month_bounds
+from storage.json_storage import JsonHistoryReader
+from tests.conftest import BACKENDS
+
+def build_bank(make_storage, backend):
+    bank = BankingSystem(make_storage(backend))
+    numbers = [bank.create_account(f"user{i}", "secret") for i in range(5)]
+    for i, number in enumerate(numbers):
+        bank.deposit(number, 1000 * (i + 1))
+        bank.withdraw(number, 250)
+    bank.transfer(numbers[0], numbers[1], 100)
+    bank.close()
+    # Reopened, so the histories stay in storage until read
+    bank = BankingSystem(make_storage(backend))
+    bank.deposit(numbers[2], 5)
+    return bank, numbers
+
+def read_export(directory):
+    return {name: open(os.path.join(directory, name), encoding='utf-8').read()
+            for name in sorted(os.listdir(directory))}
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_parallel_export_matches_serial_export(make_storage, backend, tmp_path):
+    bank, numbers = build_bank(make_storage, backend)
+    bank.accounts[numbers[3]].transactions  # one history loaded in memory
+
+    assert export_statements(bank, tmp_path / 'serial', 'csv', shard_size=2) == (5, 13)
+    assert export_statements(bank, tmp_path / 'parallel', 'csv', workers=2,
+                             shard_size=2) == (5, 13)
+    serial = read_export(tmp_path / 'serial')
+    assert read_export(tmp_path / 'parallel') == serial
+    assert len(serial) == 6
+    assert not bank.accounts[numbers[0]].transactions_loaded()
+
+    statements = serial['statements-0000.csv'].splitlines()
+    assert statements[1].split(',')[:2] == [numbers[0], 'user0']
+    assert statements[1].split(',')[5:] == ['6.50', '10.00', '2.50', '0.00', '1.00', '3']
+    bank.close()
+
+def test_stale_shard_is_exported_by_the_parent(make_storage, tmp_path, monkeypatch):
+    bank, _ = build_bank(make_storage, 'json')
+    storage_reader = bank.storage.history_reader
+
+    def stale_reader(account_numbers):
+        reader = storage_reader(account_numbers)
+        # As if a checkpoint rewrote the shards after they were located
+        return JsonHistoryReader(reader.spans, dict.fromkeys(reader.files, (0, 0, 0)),
+                                 reader.unsaved)
+    monkeypatch.setattr(bank.storage, 'history_reader', stale_reader)
+
+    start, end = month_bounds("2000-01")
+    export_statements(bank, tmp_path / 'serial', 'jsonl', start, end)
+    assert export_statements(bank, tmp_path / 'parallel', 'jsonl', start, end,
+                             workers=2) == (5, 0)
+    assert read_export(tmp_path / 'parallel') == read_export(tmp_path / 'serial')
+    assert export_statements(bank, tmp_path / 'all', 'jsonl', workers=2) == (5, 13)
+    bank.close()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import threading
+import pytest
+from services.banking_system import BankingSystem
+from tests.conftest import BACKENDS
+
+def make_history(bank):
+    number = bank.create_account("Ada", "secret")
+    account = bank.accounts[number]
+    balance = 0
+    for day, (tx_type, amount) in enumerate([('deposit', 5000), ('withdrawal', 1200),
+                                             ('deposit', 300), ('withdrawal', 4000),
+                                             ('deposit', 800)], 1):
+        balance += amount if tx_type == 'deposit' else -amount
+        transaction = {'type': tx_type, 'amount': amount,
+                       'date': f"2024-03-{day:02d} 09:00:00", 'balance': balance}
+        with account.lock:
+            account.balance = balance
+            account.add_transaction(transaction)
+            bank.record_transaction(account, transaction)
+    return number
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_query_filters_stored_history(make_storage, backend):
+    bank = BankingSystem(make_storage(backend))
+    number = make_history(bank)
+    bank.close()
+
+    bank = BankingSystem(make_storage(backend))
+    query = bank.query_transactions
+    assert [tx['amount'] for tx in query(number, "2024-03-02", "2024-03-04")] == [4000, 300, 1200]
+    assert [tx['amount'] for tx in query(number, types=['deposit'], newest_first=False)] == [
+        5000, 300, 800]
+    assert [tx['amount'] for tx in query(number, min_amount=800, max_amount=4000)] == [
+        800, 4000, 1200]
+    assert [tx['date'] for tx in query(number, limit=2)] == [
+        "2024-03-05 09:00:00", "2024-03-04 09:00:00"]
+    assert query(number, "2024-04-01") == []
+    assert query("missing") == []
+    with pytest.raises(ValueError):
+        query(number, start="March")
+    bank.close()
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_reads_during_background_writes_see_whole_operations(make_storage, backend):
+    bank = BankingSystem(make_storage(backend))
+    number = bank.create_account("Ada", "secret")
+    bank.close()
+
+    bank = BankingSystem(make_storage(backend), True)
+    seen = []
+
+    def deposit():
+        for _ in range(200):
+            bank.deposit(number, 1)
+
+    def read():
+        for _ in range(200):
+            count = bank.get_transaction_count(number)
+            page, _ = bank.get_transaction_page(number, limit=1)
+            seen.append((count, page[0]['balance'] if page else 0))
+
+    threads = [threading.Thread(target=deposit), threading.Thread(target=read)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    assert not any(thread.is_alive() for thread in threads)
+    assert all(balance >= count for count, balance in seen)
+    assert bank.get_transaction_count(number) == 200
+    assert [tx['balance'] for tx in bank.query_transactions(number, limit=1)] == [200]
+    bank.close()
\ No newline at end of file
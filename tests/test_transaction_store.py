@@ -0,0 +1,25 @@
+import pytest
+from models.transaction_store import TransactionStore
+
+DEPOSIT = {'type': 'deposit', 'amount': 1000, 'date': "2024-01-01 12:00:00", 'balance': 1000}
+
+@pytest.mark.parametrize('change', [
+    {'type': 'refund'},
+    {'amount': 2 ** 63},
+    {'balance': -2 ** 63 - 1},
+    {'type': 'transfer_in', 'transfer_id': 'abc', 'counterparty': '1001', 'balance': 2 ** 64},
+])
+def test_rejected_transaction_leaves_columns_unchanged(change):
+    store = TransactionStore([DEPOSIT])
+    with pytest.raises(ValueError):
+        store.append(dict(DEPOSIT, **change))
+    assert [len(store.types), len(store.amounts), len(store.timestamps),
+            len(store.balances)] == [1, 1, 1, 1]
+    assert store.links == {}
+    assert list(store) == [DEPOSIT]
+
+def test_transfer_link_is_kept():
+    transfer = dict(DEPOSIT, type='transfer_in', transfer_id='abc', counterparty='1001')
+    store = TransactionStore([DEPOSIT, transfer])
+    assert store[1] == transfer
+    assert store.query(types=['transfer_in']) == [transfer]
\ No newline at end of file
@@ -0,0 +1,55 @@
+import threading
+import pytest
+from services.banking_system import BankingSystem
+from services.reconciliation import reconcile_ledger
+from tests.conftest import BACKENDS, histories
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_transfer_batch_links_both_entries(make_storage, backend):
+    bank = BankingSystem(make_storage(backend))
+    ada, grace, linus = (bank.create_account(name, "secret") for name in ("Ada", "Grace", "Linus"))
+    bank.deposit(ada, 1000)
+
+    assert bank.transfer_batch([
+        (ada, grace, 600),
+        (ada, linus, 600),
+        (grace, grace, 100),
+        (ada, "missing", 100),
+        (grace, linus, 0),
+        (grace, linus, 250),
+    ]) == [True, False, False, False, False, True]
+    assert [bank.accounts[number].balance for number in (ada, grace, linus)] == [400, 350, 250]
+
+    sent = bank.accounts[ada].transactions[-1]
+    received = bank.accounts[grace].transactions[0]
+    assert (sent['type'], sent['counterparty']) == ('transfer_out', grace)
+    assert (received['type'], received['counterparty']) == ('transfer_in', ada)
+    assert sent['transfer_id'] == received['transfer_id']
+    assert reconcile_ledger(bank.accounts) == []
+    expected = histories(bank.accounts)
+    bank.close()
+
+    reopened = BankingSystem(make_storage(backend))
+    assert histories(reopened.accounts) == expected
+    reopened.close()
+
+def test_opposing_transfers_do_not_deadlock(make_storage):
+    bank = BankingSystem(make_storage('json'))
+    numbers = [bank.create_account(f"user{i}", "secret") for i in range(4)]
+    for number in numbers:
+        bank.deposit(number, 10000)
+
+    def shuffle(offset):
+        for i in range(100):
+            source = numbers[(i + offset) % 4]
+            target = numbers[(i + offset + 1 + i % 3) % 4]
+            bank.transfer_batch([(source, target, 7), (target, source, 5)])
+    threads = [threading.Thread(target=shuffle, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    assert not any(thread.is_alive() for thread in threads)
+    assert sum(bank.accounts[number].balance for number in numbers) == 40000
+    assert reconcile_ledger(bank.accounts) == []
+    bank.close()
\ No newline at end of file
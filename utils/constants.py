@@ -1,11 +1,10 @@
-import os
-
 """
 Configuration constants for the banking system.
 
 This module defines constant values used throughout the application,
 particularly file paths for data storage.
 """
+import os
 
 # Base directory of the project
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -19,4 +18,167 @@ os.makedirs(DATA_DIR, exist_ok=True)
 # File paths for different data storage
 DATA_FILE = os.path.join(DATA_DIR, 'bank_data.json')
 ADMIN_FILE = os.path.join(DATA_DIR, 'admin_data.json')
-ADMIN_LOG_FILE = os.path.join(DATA_DIR, 'admin_logs.json')
\ No newline at end of file
+ADMIN_LOG_FILE = os.path.join(DATA_DIR, 'admin_logs.json')
+
+# Write-ahead journal of account transactions
+JOURNAL_FILE = os.path.join(DATA_DIR, 'bank_journal.jsonl')
+
+# Journal transactions instead of rewriting DATA_FILE on every operation
+USE_JOURNAL = True
+
+# Number of journal records written between fsync calls
+JOURNAL_FSYNC_BATCH = 32
+
+# Number of journaled transactions between full snapshot checkpoints
+CHECKPOINT_INTERVAL = 1000
+
+# Reserved key holding snapshot metadata inside DATA_FILE
+META_KEY = '__meta__'
+
+# Number of consecutive account numbers stored per account snapshot shard file
+SNAPSHOT_SHARD_SIZE = 1000
+
+
+# Storage backend used by the services: 'json' or 'sqlite'
+STORAGE_BACKEND = 'json'
+
+# SQLite database used by the 'sqlite' storage backend
+SQLITE_FILE = os.path.join(DATA_DIR, 'bank.db')
+
+
+# Number of transactions returned per history page
+TRANSACTION_PAGE_SIZE = 50
+
+
+# Apply storage writes on a background thread instead of the calling thread
+BACKGROUND_PERSISTENCE = False
+
+# Milliseconds the persistence thread waits for more transactions to fold into
+# one commit; above 0 deposits and withdrawals are acknowledged once committed
+GROUP_COMMIT_WINDOW_MS = 0
+
+# Maximum number of transactions folded into one group commit
+GROUP_COMMIT_MAX_OPS = 256
+
+# Force each commit to stable storage before acknowledging deposits and withdrawals
+DURABLE_ACK = False
+
+
+# Characters read at a time when streaming DATA_FILE
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+
+# First account number issued on a fresh system
+ACCOUNT_NUMBER_START = 1000
+
+# Account numbers reserved per metadata write; unused ones are skipped after a restart
+ACCOUNT_NUMBER_BLOCK = 1
+
+# Append a Luhn check digit to newly issued account numbers
+ACCOUNT_NUMBER_CHECK_DIGIT = False
+
+# Size in bytes after which the admin audit log starts a new segment
+AUDIT_SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+# Time span in seconds after which the admin audit log starts a new segment
+AUDIT_SEGMENT_MAX_AGE = 7 * 24 * 60 * 60
+
+# Number of audit log records between sparse index entries
+AUDIT_INDEX_INTERVAL = 64
+
+# Maximum number of queued operations the async writer applies in one group commit
+ASYNC_COMMIT_BATCH = 512
+
+# Threads serving logins and history reads of the async banking facade
+ASYNC_READ_THREADS = 4
+
+# Accounts per statement export shard, each shard written to its own files
+STATEMENT_SHARD_SIZE = 1000
+
+# Transactions the ledger analytics columns are first allocated for
+ANALYTICS_INITIAL_CAPACITY = 1 << 16
+
+# Default number of bins in transaction amount distributions
+ANALYTICS_HISTOGRAM_BINS = 20
+
+# Number of most recent days of deposit and withdrawal totals in the bank summary
+SUMMARY_DAYS = 30
+
+# scrypt cost parameters for password hashes; stored hashes with other
+# parameters are replaced on the next successful login
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Bytes of random salt per password hash
+PASSWORD_SALT_BYTES = 16
+
+# Seconds a verified login is remembered so repeated logins skip the hashing
+CREDENTIAL_CACHE_TTL = 300
+
+# Maximum number of verified logins remembered
+CREDENTIAL_CACHE_SIZE = 10000
+
+# Seconds a session lasts regardless of activity
+SESSION_TTL = 8 * 60 * 60
+
+# Seconds of inactivity after which a session ends
+SESSION_IDLE_TIMEOUT = 15 * 60
+
+# Maximum number of sessions held; the least recently used one is dropped first
+SESSION_MAX = 100000
+
+# Seconds between sweeps removing idle sessions
+SESSION_SWEEP_INTERVAL = 60
+
+# Random bytes per session token
+SESSION_TOKEN_BYTES = 32
+
+# Target number of items per bucket of a SortedList
+SORTED_LIST_LOAD = 1000
+
+# Number of accounts returned by default by account searches
+ACCOUNT_SEARCH_LIMIT = 100
+
+# Length of the name fragments indexed for substring search
+NAME_GRAM_SIZE = 3
+
+# Number of most recent admin logs returned by default by admin log queries
+ADMIN_LOG_PAGE_SIZE = 200
+
+# Number of rows fetched at a time by virtual treeviews
+TREE_FETCH_SIZE = 100
+
+# Worker threads running service calls for the user interface
+GUI_WORKER_THREADS = 4
+
+# Milliseconds between checks for finished user interface tasks
+TASK_POLL_INTERVAL = 20
+
+# Measure how late the Tk main loop runs scheduled callbacks and print a summary on exit
+FRAME_LATENCY_PROBE = False
+
+# Milliseconds between frame latency probe callbacks
+FRAME_PROBE_INTERVAL = 16
+
+# Number of most recent frame latency samples kept by the probe
+FRAME_PROBE_SAMPLES = 10000
+
+# Interface and port of the headless HTTP API server
+API_HOST = '127.0.0.1'
+API_PORT = 8080
+
+# Worker threads running API requests against the services
+API_WORKER_THREADS = 8
+
+# API requests queued or running on the worker threads at a time
+API_MAX_PENDING = 256
+
+# Seconds an idle API connection is kept open
+API_IDLE_TIMEOUT = 60
+
+# Pipelined API requests of one connection read ahead of their responses
+API_MAX_PIPELINE = 32
+
+# Maximum size in bytes of an API request header and body
+API_MAX_HEADER_SIZE = 64 * 1024
+API_MAX_BODY_SIZE = 1024 * 1024
\ No newline at end of file
@@ -0,0 +1,106 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from utils.constants import CREDENTIAL_CACHE_TTL, CREDENTIAL_CACHE_SIZE
+
+class CredentialCache:
+    """
+    Recently verified credentials, so repeated logins skip the key derivation.
+
+    Checking a password against its scrypt hash is deliberately slow. After
+    a successful check the cache keeps an HMAC of the password and its
+    stored hash under a key that only exists in this process, so the next
+    check with the same credentials costs one HMAC. Because the stored hash
+    is part of the digest, an entry stops matching as soon as the password
+    changes. Entries expire ttl seconds after they were added, and the
+    least recently used entry is evicted once max_entries are held.
+
+    Attributes:
+        ttl (float): Seconds an entry stays valid
+        max_entries (int): Maximum number of entries held
+        secret (bytes): Per-process HMAC key
+        entries (OrderedDict): Key to (digest, expiry time), least recently
+            used first
+        lock (threading.Lock): Guards the entries
+    """
+
+    def __init__(self, ttl=CREDENTIAL_CACHE_TTL, max_entries=CREDENTIAL_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl (float, optional): Seconds an entry stays valid
+            max_entries (int, optional): Maximum number of entries, 0
+                disables caching
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.secret = os.urandom(32)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def digest(self, password, stored):
+        """
+        Compute the cached form of a credential.
+
+        Args:
+            password (str): Password that was verified
+            stored (str): Stored hash it was verified against
+
+        Returns:
+            bytes: HMAC digest
+        """
+        message = password.encode('utf-8') + b'\0' + stored.encode('utf-8')
+        return hmac.new(self.secret, message, hashlib.sha256).digest()
+
+    def check(self, key, password, stored):
+        """
+        Check whether a credential was verified recently.
+
+        Args:
+            key (str): Account number or username
+            password (str): Password to check
+            stored (str): Current stored hash
+
+        Returns:
+            bool: True if the same password was verified against the same
+                stored hash within the TTL
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            if entry[1] <= time.monotonic():
+                del self.entries[key]
+                return False
+            self.entries.move_to_end(key)
+        return hmac.compare_digest(entry[0], self.digest(password, stored))
+
+    def remember(self, key, password, stored):
+        """
+        Record a successfully verified credential.
+
+        Args:
+            key (str): Account number or username
+            password (str): Verified password
+            stored (str): Stored hash it was verified against
+        """
+        entry = (self.digest(password, stored), time.monotonic() + self.ttl)
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """
+        Forget the credential of an account or admin.
+
+        Args:
+            key (str): Account number or username
+        """
+        with self.lock:
+            self.entries.pop(key, None)
\ No newline at end of file
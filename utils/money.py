@@ -0,0 +1,129 @@
+"""
+Exact money handling for the banking system.
+
+All balances and amounts are held as integer cents inside the models and
+services. Data files keep storing dollar amounts, so values are only
+converted at the storage and user interface boundaries.
+"""
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+CENT = Decimal('0.01')
+
+# Largest amount or balance in cents. Fifteen significant digits survive
+# the float dollars of the data files exactly and fit comfortably in the
+# signed 64-bit integers of the transaction histories and SQLite
+MAX_CENTS = 10 ** 15 - 1
+
+# Smallest amount or balance in cents
+MIN_CENTS = -MAX_CENTS
+
+# Amounts users may enter: plain decimal digits without an exponent
+AMOUNT_PATTERN = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)', re.ASCII)
+
+def to_cents(value):
+    """
+    Convert a stored dollar amount to integer cents.
+
+    Args:
+        value (float | int | str | Decimal): Dollar amount
+
+    Returns:
+        int: Amount in cents, rounded half up
+    """
+    cents = Decimal(str(value)) * 100
+    return int(cents.to_integral_value(rounding=ROUND_HALF_UP))
+
+def require_cents(amount):
+    """
+    Check that an amount or balance passed to a service is in integer cents.
+
+    Args:
+        amount: Amount to check
+
+    Raises:
+        TypeError: If the amount is not an integer
+        ValueError: If the amount is outside MIN_CENTS to MAX_CENTS
+    """
+    if not isinstance(amount, int) or isinstance(amount, bool):
+        raise TypeError(f"Amount must be an integer number of cents, got {amount!r}")
+    if not fits_cents(amount):
+        raise ValueError(f"Amount out of range: {amount} cents")
+
+def fits_cents(cents):
+    """
+    Check whether an amount or balance in cents can be stored.
+
+    Args:
+        cents (int): Amount in cents
+
+    Returns:
+        bool: True if the amount is within MIN_CENTS to MAX_CENTS
+    """
+    return MIN_CENTS <= cents <= MAX_CENTS
+
+def from_cents(cents):
+    """
+    Convert integer cents to a dollar amount for storage.
+
+    Args:
+        cents (int): Amount in cents
+
+    Returns:
+        float: Dollar amount that converts back to the same cents
+    """
+    return cents / 100
+
+def parse_amount(text, allow_zero=False):
+    """
+    Parse a positive dollar amount entered by a user.
+
+    Args:
+        text (str): Amount such as "12", "12.5" or "12.50"
+        allow_zero (bool, optional): Also accept zero
+
+    Returns:
+        int: Amount in cents
+
+    Raises:
+        ValueError: If the text is not a positive amount, or zero when
+            allowed, with at most two decimal places and at most MAX_CENTS
+    """
+    text = text.strip()
+    try:
+        amount = Decimal(text) if AMOUNT_PATTERN.fullmatch(text) else None
+        valid = (amount is not None and (amount > 0 or allow_zero and amount == 0)
+                 and amount == amount.quantize(CENT) and amount * 100 <= MAX_CENTS)
+    except InvalidOperation:
+        valid = False
+    if not valid:
+        raise ValueError(f"Invalid amount: {text}")
+    return int(amount * 100)
+
+def format_money(cents):
+    """
+    Format integer cents for display.
+
+    Args:
+        cents (int): Amount in cents
+
+    Returns:
+        str: Amount such as "$12.50" or "-$3.05"
+    """
+    sign = "-" if cents < 0 else ""
+    dollars, rest = divmod(abs(cents), 100)
+    return f"{sign}${dollars}.{rest:02d}"
+
+def format_amount(cents):
+    """
+    Format integer cents as an exact decimal string for data exchange.
+
+    Args:
+        cents (int): Amount in cents
+
+    Returns:
+        str: Amount such as "12.50" or "-3.05"
+    """
+    sign = "-" if cents < 0 else ""
+    dollars, rest = divmod(abs(cents), 100)
+    return f"{sign}{dollars}.{rest:02d}"
\ No newline at end of file
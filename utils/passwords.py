@@ -0,0 +1,107 @@
+"""
+Salted password hashing for account and admin credentials.
+
+Passwords are stored as 'scrypt$n$r$p$salt$key' strings, with salt and
+derived key in hex. Records written by earlier versions hold the plaintext
+password; they still verify, and needs_rehash reports them so callers can
+replace them with a hash on the next successful login.
+"""
+import hashlib
+import hmac
+import os
+from utils.constants import SCRYPT_N, SCRYPT_R, SCRYPT_P, PASSWORD_SALT_BYTES
+
+PREFIX = 'scrypt'
+
+# Hash of a random password, used so unknown users take as long to reject
+# as known ones
+_dummy_hash = None
+
+def derive_key(password, salt, n, r, p):
+    """
+    Derive the scrypt key of a password.
+
+    Args:
+        password (str): Password to hash
+        salt (bytes): Random salt
+        n (int): CPU and memory cost
+        r (int): Block size
+        p (int): Parallelization
+
+    Returns:
+        bytes: Derived key
+    """
+    return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024)
+
+def hash_password(password):
+    """
+    Hash a password with a new random salt.
+
+    Args:
+        password (str): Password to hash
+
+    Returns:
+        str: Hash string to store instead of the password
+    """
+    salt = os.urandom(PASSWORD_SALT_BYTES)
+    key = derive_key(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${key.hex()}"
+
+def parse_hash(stored):
+    """
+    Split a stored hash into its parts.
+
+    Args:
+        stored (str): Stored password value
+
+    Returns:
+        tuple: n, r, p, salt and key, None if the value is not a hash
+    """
+    parts = stored.split('$')
+    if len(parts) != 6 or parts[0] != PREFIX:
+        return None
+    try:
+        return (int(parts[1]), int(parts[2]), int(parts[3]),
+                bytes.fromhex(parts[4]), bytes.fromhex(parts[5]))
+    except ValueError:
+        return None
+
+def verify_password(password, stored):
+    """
+    Check a password against its stored value in constant time.
+
+    Args:
+        password (str): Password to check
+        stored (str): Stored hash or legacy plaintext password. None checks
+            against a dummy hash and always fails, so a missing user costs
+            the same time as a wrong password
+
+    Returns:
+        bool: True if the password matches
+    """
+    global _dummy_hash
+    if stored is None:
+        if _dummy_hash is None:
+            _dummy_hash = hash_password(os.urandom(16).hex())
+        verify_password(password, _dummy_hash)
+        return False
+    params = parse_hash(stored)
+    if params is None:
+        return hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+    n, r, p, salt, key = params
+    return hmac.compare_digest(derive_key(password, salt, n, r, p), key)
+
+def needs_rehash(stored):
+    """
+    Check whether a stored password should be replaced by a new hash.
+
+    Args:
+        stored (str): Stored hash or legacy plaintext password
+
+    Returns:
+        bool: True for plaintext passwords and hashes made with other
+            cost parameters
+    """
+    params = parse_hash(stored)
+    return params is None or params[:3] != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
\ No newline at end of file
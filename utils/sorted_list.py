@@ -0,0 +1,193 @@
+from bisect import bisect_left, insort
+from utils.constants import SORTED_LIST_LOAD
+
+class SortedList:
+    """
+    Sorted sequence with fast insertion and removal.
+
+    Items are kept in a list of sorted buckets of at most twice load items,
+    plus the largest item of each bucket. Locating an item is a binary
+    search over the bucket maxima followed by one inside a bucket, and
+    inserting or removing only shifts the items of one bucket, so updates
+    stay in the microseconds with millions of items where a single sorted
+    list would move megabytes of pointers each time.
+
+    Not thread-safe; callers serialize access.
+
+    Attributes:
+        load (int): Target bucket size
+        buckets (list): Sorted lists of items, in order
+        maxes (list): Largest item of each bucket
+        size (int): Number of items
+    """
+
+    def __init__(self, items=(), load=SORTED_LIST_LOAD):
+        """
+        Initialize the list.
+
+        Args:
+            items (iterable, optional): Initial items, in any order
+            load (int, optional): Target bucket size
+        """
+        self.load = load
+        self.buckets = []
+        self.maxes = []
+        self.size = 0
+        self.update(items)
+
+    def update(self, items):
+        """
+        Add many items at once by sorting them with the existing ones.
+
+        Args:
+            items (iterable): Items to add, in any order
+        """
+        values = sorted([*self, *items])
+        self.buckets = [values[i:i + self.load] for i in range(0, len(values), self.load)]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+        self.size = len(values)
+
+    def add(self, value):
+        """
+        Insert an item at its sorted position.
+
+        Args:
+            value: Item to insert
+        """
+        if not self.buckets:
+            self.buckets.append([value])
+            self.maxes.append(value)
+            self.size = 1
+            return
+        position = bisect_left(self.maxes, value)
+        if position == len(self.maxes):
+            position -= 1
+            self.buckets[position].append(value)
+            self.maxes[position] = value
+        else:
+            insort(self.buckets[position], value)
+        self.size += 1
+
+        bucket = self.buckets[position]
+        if len(bucket) > 2 * self.load:
+            self.buckets.insert(position + 1, bucket[self.load:])
+            del bucket[self.load:]
+            self.maxes.insert(position, bucket[-1])
+
+    def remove(self, value):
+        """
+        Remove an item.
+
+        Args:
+            value: Item to remove
+
+        Raises:
+            ValueError: If the item is not in the list
+        """
+        position = bisect_left(self.maxes, value)
+        if position < len(self.maxes):
+            bucket = self.buckets[position]
+            index = bisect_left(bucket, value)
+            if bucket[index] == value:
+                del bucket[index]
+                self.size -= 1
+                if bucket:
+                    self.maxes[position] = bucket[-1]
+                else:
+                    del self.buckets[position]
+                    del self.maxes[position]
+                return
+        raise ValueError(f"{value!r} not in list")
+
+    def locate(self, value):
+        """
+        Find where the first item not less than a value is stored.
+
+        Args:
+            value: Value to look for
+
+        Returns:
+            tuple: Bucket position and index inside the bucket, the bucket
+                position being len(buckets) if all items are smaller
+        """
+        position = bisect_left(self.maxes, value)
+        if position == len(self.maxes):
+            return position, 0
+        return position, bisect_left(self.buckets[position], value)
+
+    def rank(self, value):
+        """
+        Count the items less than a value.
+
+        Args:
+            value: Value to compare with
+
+        Returns:
+            int: Number of smaller items
+        """
+        position, index = self.locate(value)
+        return sum(len(bucket) for bucket in self.buckets[:position]) + index
+
+    def count_range(self, minimum=None, stop=None):
+        """
+        Count the items in a half-open range.
+
+        Args:
+            minimum (optional): Smallest item to count, None for no bound
+            stop (optional): Items from this value on are not counted,
+                None for no bound
+
+        Returns:
+            int: Number of items in the range
+        """
+        low = self.rank(minimum) if minimum is not None else 0
+        high = self.rank(stop) if stop is not None else self.size
+        return max(high - low, 0)
+
+    def irange(self, minimum=None, stop=None, reverse=False):
+        """
+        Iterate over the items in a half-open range.
+
+        Args:
+            minimum (optional): Smallest item to yield, None for no bound
+            stop (optional): Items from this value on are not yielded,
+                None for no bound
+            reverse (bool, optional): Yield the largest items first
+
+        Yields:
+            Items of the range in sorted order, or reversed
+        """
+        first = self.locate(minimum) if minimum is not None else (0, 0)
+        end = self.locate(stop) if stop is not None else (len(self.buckets), 0)
+        if first >= end:
+            return
+        if not reverse:
+            position, index = first
+            while (position, index) < end:
+                bucket = self.buckets[position]
+                last = end[1] if position == end[0] else len(bucket)
+                yield from bucket[index:last]
+                position, index = position + 1, 0
+        else:
+            position, index = end
+            if index == 0:
+                position, index = position - 1, len(self.buckets[position - 1])
+            while (position, index) > first:
+                bucket = self.buckets[position]
+                low = first[1] if position == first[0] else 0
+                yield from reversed(bucket[low:index])
+                if position == 0:
+                    break
+                position, index = position - 1, len(self.buckets[position - 1])
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, value):
+        position, index = self.locate(value)
+        return (position < len(self.buckets) and index < len(self.buckets[position])
+                and self.buckets[position][index] == value)
+
+    def __iter__(self):
+        for bucket in self.buckets:
+            yield from bucket
\ No newline at end of file